@@ -0,0 +1,189 @@
+"""
+Auto Attendant Enrichment Benchmark
+
+Compares the original per-record Auto Attendant enrichment (one dict built
+field by field, a metrics update per failure) with the engines of
+enrich_autoattendant_data / iter_enrich_autoattendant_columns:
+
+- row: batched, in the calling thread
+- process: chunks enriched in worker processes
+- columnar: whole-column operations on the ordered arrays
+
+Every engine's output and timestamp/enrichment failure counts are checked to
+be identical to the original's, on realistic synthetic rows plus edge cases
+(short rows, unparsable and empty chain start times, non-string identities
+that make a record fail). Every engine must also pass the call identifiers of
+the source rows through.
+
+Usage:
+    python benchmarks/bench_autoattendant.py [--rows 200000] [--workers 4]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from autoattendant_enrichment import (  # noqa: E402
+    enrich_autoattendant_data, extract_aa_ra_name, iter_enrich_autoattendant_columns, parse_timestamp_to_utc
+)
+from run_metrics import RunMetrics  # noqa: E402
+from synthetic_vaac import generate_rows  # noqa: E402
+from vaac_stream import iter_ordered_arrays_as_dicts  # noqa: E402
+
+
+def original_enrich_autoattendant_data(raw_data, config, metrics):
+    """Original per-record enrichment (without its debug traces)."""
+    language_code = config.get('language_code', 'en-AU')
+    for raw_record in raw_data:
+        try:
+            enriched = {}
+            enriched['AutoAttendant[rawAutoAttendantIdentity]'] = raw_record.get('AutoAttendantIdentity', '')
+            enriched['AutoAttendant[rawAutoAttendantCallFlow]'] = raw_record.get('AutoAttendantCallFlow', '')
+            enriched['AutoAttendant[rawAutoAttendantCallResult]'] = raw_record.get('AutoAttendantCallResult', '')
+            enriched['AutoAttendant[rawAutoAttendantCallerActionCounts]'] = raw_record.get('AutoAttendantCallerActionCounts', 0)
+            enriched['AutoAttendant[rawAutoAttendantChainDurationInSecs]'] = raw_record.get('AutoAttendantChainDurationInSecs', 0)
+            enriched['AutoAttendant[rawAutoAttendantChainIndex]'] = raw_record.get('AutoAttendantChainIndex', 0)
+            enriched['AutoAttendant[rawAutoAttendantChainStartTime]'] = raw_record.get('AutoAttendantChainStartTime', '')
+            enriched['AutoAttendant[rawAutoAttendantCount]'] = raw_record.get('AutoAttendantCount', 0)
+            enriched['AutoAttendant[rawAutoAttendantDirectorySearchMethod]'] = raw_record.get('AutoAttendantDirectorySearchMethod', '')
+            enriched['AutoAttendant[rawAutoAttendantId]'] = raw_record.get('AutoAttendantId', '')
+            enriched['AutoAttendant[rawAutoAttendantTransferAction]'] = raw_record.get('AutoAttendantTransferAction', '')
+            enriched['AutoAttendant[rawHasAA]'] = raw_record.get('HasAA', '')
+            enriched['AutoAttendant[rawTotalCallCount]'] = raw_record.get('TotalCallCount', 1)
+            enriched['AutoAttendant[rawPSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
+            # The original read DocumentID/ConferenceID/DialogID, which the API never returns
+            enriched['AutoAttendant[DocumentID]'] = raw_record.get('DocumentId', '')
+            enriched['AutoAttendant[ConferenceID]'] = raw_record.get('ConferenceId', '')
+            enriched['AutoAttendant[DialogID]'] = raw_record.get('DialogId', '')
+            ra_name = extract_aa_ra_name(raw_record.get('AutoAttendantIdentity', ''))
+            enriched['AutoAttendant[AARAName]'] = ra_name
+            enriched['AutoAttendant[AASlicer]'] = ra_name
+            enriched['AutoAttendant[AAName]'] = ''
+            enriched['AutoAttendant[AAGUID]'] = raw_record.get('AutoAttendantId', '')
+            enriched['AutoAttendant[AACallCount]'] = raw_record.get('TotalCallCount', 1)
+            enriched['AutoAttendant[AAChainDurationSeconds]'] = raw_record.get('AutoAttendantChainDurationInSecs', 0)
+            enriched['AutoAttendant[AACallFlow]'] = raw_record.get('AutoAttendantCallFlow', '')
+            enriched['AutoAttendant[AACallResult]'] = raw_record.get('AutoAttendantCallResult', '')
+            enriched['AutoAttendant[AATransferAction]'] = raw_record.get('AutoAttendantTransferAction', '')
+            enriched['AutoAttendant[PSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
+            enriched['AutoAttendant[LanguageCode]'] = language_code
+            chain_start_time = raw_record.get('AutoAttendantChainStartTime', '')
+            if chain_start_time:
+                chain_start_utc = parse_timestamp_to_utc(chain_start_time)
+                enriched['AutoAttendant[AAChainStartTimeUTC]'] = chain_start_utc.isoformat() if chain_start_utc else chain_start_time
+                if chain_start_utc is None:
+                    metrics.count("timestamp_parse_failures")
+            else:
+                enriched['AutoAttendant[AAChainStartTimeUTC]'] = ''
+        except Exception:
+            metrics.count("enrichment_failures")
+            continue
+        yield enriched
+
+
+def edge_rows(dimensions, measurements, template):
+    """Rows exercising the failure and fallback paths, built from a valid row."""
+    fields = dimensions + measurements
+    identity = fields.index("AutoAttendantIdentity")
+    chain_start = fields.index("AutoAttendantChainStartTime")
+    rows = []
+    for identity_value, chain_start_value in [
+        ("AAReception@example.com", "not a timestamp"),
+        ("AAReception@example.com", ""),
+        ("AAReception@example.com", None),
+        ("AAReception@example.com", "2025-12-01T10:00:00Z"),
+        ("AAReception@example.com", "2025-12-01T10:00:00+10:00"),
+        ("NoDomain", 12345),
+        (None, "2025-12-01T10:00:00"),
+        (42, "2025-12-01T10:00:00"),
+        (42, "not a timestamp"),
+    ]:
+        row = list(template)
+        row[identity] = identity_value
+        row[chain_start] = chain_start_value
+        rows.append(row)
+    # Short row: missing trailing fields read as None
+    rows.append(list(template[:chain_start]))
+    return rows
+
+
+IDENTIFIER_KEYS = (
+    ("DocumentId", "AutoAttendant[DocumentID]"),
+    ("ConferenceId", "AutoAttendant[ConferenceID]"),
+    ("DialogId", "AutoAttendant[DialogID]"),
+)
+
+
+def check_identifiers(label, enriched, rows, dimensions):
+    """Fail unless every record carries the non-empty identifiers of its source row."""
+    positions = [(dimensions.index(source_key), key) for source_key, key in IDENTIFIER_KEYS]
+    if len(enriched) < len(rows):
+        raise SystemExit(f"{label} dropped realistic records")
+    for record, row in zip(enriched, rows):
+        for position, key in positions:
+            if not row[position] or record.get(key) != row[position]:
+                raise SystemExit(f"{label} does not pass {key} through: {record.get(key)!r} != {row[position]!r}")
+
+
+def run(label, enrich, rows):
+    """Return (enriched records, failure counts, seconds)."""
+    metrics = RunMetrics()
+    started = time.perf_counter()
+    enriched = list(enrich(rows, metrics))
+    seconds = time.perf_counter() - started
+    counts = {name: metrics.counts[name] for name in ("timestamp_parse_failures", "enrichment_failures")}
+    return enriched, counts, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench_autoattendant")
+    # The edge rows log their (expected) enrichment failures
+    # (process engine workers do not inherit these levels and still print theirs to stderr)
+    logger.setLevel(logging.CRITICAL)
+    logging.getLogger("autoattendant_enrichment.worker").setLevel(logging.CRITICAL)
+    rows, dimensions, measurements = generate_rows(args.rows, "auto_attendant", profile="realistic")
+    rows = rows + edge_rows(dimensions, measurements, rows[0])
+    print(f"auto_attendant: {len(rows)} rows ({args.rows} realistic + edge cases)")
+
+    def engine_config(engine, workers=1):
+        return {"timezone_offset": "Australia/Sydney", "parallel_workers": workers, "enrichment_engine": engine}
+
+    engines = [
+        ("original", lambda data, metrics: original_enrich_autoattendant_data(
+            iter_ordered_arrays_as_dicts(data, dimensions, measurements), {}, metrics)),
+        ("row", lambda data, metrics: enrich_autoattendant_data(
+            iter_ordered_arrays_as_dicts(data, dimensions, measurements), engine_config("row"),
+            logger=logger, metrics=metrics)),
+        (f"process x{args.workers}", lambda data, metrics: enrich_autoattendant_data(
+            iter_ordered_arrays_as_dicts(data, dimensions, measurements), engine_config("process", args.workers),
+            logger=logger, metrics=metrics)),
+        ("columnar", lambda data, metrics: iter_enrich_autoattendant_columns(
+            data, dimensions, measurements, engine_config("columnar"), logger=logger, metrics=metrics)),
+    ]
+
+    print(f"{'engine':<14}{'rows/s':>12}{'speedup':>9}  failures")
+    expected = None
+    for label, enrich in engines:
+        enriched, counts, seconds = run(label, enrich, rows)
+        check_identifiers(label, enriched[:args.rows], rows[:args.rows], dimensions)
+        if expected is None:
+            expected, expected_counts, baseline = enriched, counts, seconds
+        elif enriched != expected or counts != expected_counts:
+            raise SystemExit(f"{label} output differs from the original enrichment")
+        elif [list(record) for record in enriched[:1]] != [list(record) for record in expected[:1]]:
+            raise SystemExit(f"{label} key order differs from the original enrichment")
+        print(f"{label:<14}{len(rows) / seconds:>12,.0f}{baseline / seconds:>8.2f}x  {counts}")
+    print("All engines produce the original output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Debug Logging Benchmark
+
+Measures enrichment throughput at DEBUG log level relative to INFO, with the
+per-record debug traces sampled (Debug Sample Rate) or written for every
+record, and with the log file written synchronously or by the asynchronous
+queue handler (Asynchronous Logging).
+
+Logs go to a rotating log file in a temporary directory with the format of
+the add-on's log files. For asynchronous modes, "drain s" is the time taken
+to write the records still queued when enrichment finished, and "dropped"
+the records dropped while the queue was full.
+
+Usage:
+    python benchmarks/bench_debug_logging.py [--records 50000] [--sample-rate 100] [--queue-size 10000]
+"""
+
+import argparse
+import logging
+import logging.handlers
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from async_logging import DEFAULT_DEBUG_SAMPLE_RATE, DEFAULT_LOG_QUEUE_SIZE  # noqa: E402
+from async_logging import enable_async_logging, stop_async_logging  # noqa: E402
+from autoattendant_enrichment import enrich_autoattendant_data  # noqa: E402
+from callqueue_enrichment import enrich_callqueue_data  # noqa: E402
+from synthetic_vaac import generate_rows  # noqa: E402
+from vaac_stream import iter_ordered_arrays_as_dicts  # noqa: E402
+
+
+# Format of the add-on's log files (solnlib default)
+LOG_FORMAT = ("%(asctime)s %(levelname)s pid=%(process)d tid=%(threadName)s "
+              "file=%(filename)s:%(funcName)s:%(lineno)d | %(message)s")
+
+# (label, level, traced records: "sampled" or "all", asynchronous)
+MODES = [
+    ("INFO", logging.INFO, "sampled", False),
+    ("DEBUG sampled", logging.DEBUG, "sampled", False),
+    ("DEBUG sampled, async", logging.DEBUG, "sampled", True),
+    ("DEBUG every record", logging.DEBUG, "all", False),
+    ("DEBUG every record, async", logging.DEBUG, "all", True),
+]
+
+# (path, report type, parallel workers)
+PATHS = [
+    ("cq_sequential", "call_queue", 1),
+    ("aa_sequential", "auto_attendant", 1),
+]
+
+
+def _loggers(log_dir, name, level, asynchronous, queue_size):
+    """Return the input logger; the enrichment module logger logs to the same file."""
+    handler = logging.handlers.RotatingFileHandler(
+        os.path.join(log_dir, f"{name}.log"), maxBytes=25 * 2**20, backupCount=2
+    )
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    loggers = [logging.getLogger(f"bench_debug_logging.{name}"), logging.getLogger("callqueue_enrichment")]
+    for logger in loggers:
+        for old_handler in list(logger.handlers):
+            logger.removeHandler(old_handler)
+        logger.addHandler(handler)
+        logger.setLevel(level)
+        logger.propagate = False
+        if asynchronous:
+            enable_async_logging(logger, queue_size)
+    return loggers
+
+
+def run(rows, dimensions, measurements, report_type, workers, logger, sample_rate):
+    """Enrich every row, returns the number of enriched records."""
+    config = {"timezone_offset": "Australia/Sydney", "parallel_workers": workers,
+              "debug_sample_rate": sample_rate}
+    records = iter_ordered_arrays_as_dicts(iter(rows), dimensions, measurements)
+    if report_type == "call_queue":
+        return sum(1 for _ in enrich_callqueue_data(records, config, logger=logger))
+    return sum(1 for _ in enrich_autoattendant_data(records, config, logger=logger))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--sample-rate", type=int, default=DEFAULT_DEBUG_SAMPLE_RATE)
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_LOG_QUEUE_SIZE)
+    args = parser.parse_args()
+
+    log_dir = tempfile.mkdtemp(prefix="bench_debug_logging_")
+    try:
+        print(f"{'path':<15}{'mode':<28}{'records/s':>11}{'vs INFO':>9}{'drain s':>9}{'dropped':>9}{'log MB':>8}")
+        for path, report_type, workers in PATHS:
+            rows, dimensions, measurements = generate_rows(args.records, report_type, profile="realistic")
+            info_rate = None
+            for label, level, traced, asynchronous in MODES:
+                name = f"{path}_{label.replace(' ', '_').replace(',', '')}"
+                logger, module_logger = _loggers(log_dir, name, level, asynchronous, args.queue_size)
+                sample_rate = args.sample_rate if traced == "sampled" else 1
+
+                started = time.perf_counter()
+                count = run(rows, dimensions, measurements, report_type, workers, logger, sample_rate)
+                seconds = time.perf_counter() - started
+
+                dropped = sum(handler.dropped for handler in (logger.handlers + module_logger.handlers)
+                              if hasattr(handler, "dropped"))
+                drain_started = time.perf_counter()
+                stop_async_logging()
+                drain = time.perf_counter() - drain_started
+                for handler in logger.handlers:
+                    handler.close()
+
+                rate = count / seconds
+                info_rate = info_rate or rate
+                log_mb = sum(os.path.getsize(os.path.join(log_dir, log_file))
+                             for log_file in os.listdir(log_dir) if log_file.startswith(name)) / 2**20
+                print(f"{path:<15}{label:<28}{rate:>11,.0f}{info_rate / rate:>8.1f}x"
+                      f"{drain if asynchronous else 0:>9.2f}{dropped:>9}{log_mb:>8.1f}")
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
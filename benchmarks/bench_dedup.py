@@ -0,0 +1,150 @@
+"""
+Duplicate Suppression Alignment Check
+
+Runs the dedup path of stream_events (DedupIndex.record_rows -> enrichment ->
+batched writes committing the written events) through every Call Queue and
+Auto Attendant enrichment engine, on realistic synthetic rows with rows that
+fail enrichment mixed in. The hashes recorded must be exactly those of the
+rows whose events were written: rows dropped by enrichment are never
+recorded, and no written row is left unrecorded.
+
+For comparison, the same run without drop reporting (commits counted from
+the front of the queue) shows how many hashes would be wrong.
+
+Usage:
+    python benchmarks/bench_dedup.py [--rows 20000] [--fail-every 97] [--event-batch-size 333]
+"""
+
+import argparse
+import logging
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from autoattendant_enrichment import enrich_autoattendant_data, iter_enrich_autoattendant_columns  # noqa: E402
+from callqueue_enrichment import enrich_callqueue_data, iter_enrich_callqueue_columns  # noqa: E402
+from dedup_index import DEDUP_KEY_FIELDS, DedupIndex, PendingRows, call_hash  # noqa: E402
+from synthetic_vaac import generate_rows  # noqa: E402
+from vaac_stream import iter_ordered_arrays_as_dicts  # noqa: E402
+
+
+class MemoryCheckpoints:
+    """In-memory stand-in for the KV Store checkpointer."""
+
+    def __init__(self):
+        self.records = {}
+
+    def get(self, key):
+        return self.records.get(key)
+
+    def update(self, key, value):
+        self.records[key] = value
+
+    def delete(self, key):
+        self.records.pop(key, None)
+
+
+# Source identity field whose non-string value makes a record fail enrichment
+FAILING_FIELDS = {"call_queue": "CallQueueIdentity", "auto_attendant": "AutoAttendantIdentity"}
+
+# Output key carrying the source DocumentId
+DOCUMENT_ID_KEYS = {"call_queue": "CallQueue[DocumentId]", "auto_attendant": "AutoAttendant[DocumentID]"}
+
+
+def engines(report_type):
+    """(label, enrich(rows, dimensions, measurements, config, logger, on_drop), config) per engine."""
+    def row_engine(rows, dimensions, measurements, config, logger, on_drop):
+        records = iter_ordered_arrays_as_dicts(rows, dimensions, measurements)
+        if report_type == "call_queue":
+            return enrich_callqueue_data(records, config, logger=logger, on_drop=on_drop)
+        return enrich_autoattendant_data(records, config, logger=logger, on_drop=on_drop)
+
+    def columnar_engine(rows, dimensions, measurements, config, logger, on_drop):
+        if report_type == "call_queue":
+            return iter_enrich_callqueue_columns(rows, dimensions, measurements, config, logger=logger,
+                                                 on_drop=on_drop)
+        return iter_enrich_autoattendant_columns(rows, dimensions, measurements, config, logger=logger,
+                                                 on_drop=on_drop)
+
+    base = {"timezone_offset": "Australia/Sydney", "batch_size": 1000, "process_chunk_size": 700}
+    configured = [
+        ("row", row_engine, dict(base, parallel_workers=1)),
+        ("process x2", row_engine, dict(base, parallel_workers=2, enrichment_engine="process")),
+        ("columnar", columnar_engine, dict(base, enrichment_engine="columnar")),
+    ]
+    return configured
+
+
+def run(rows, dimensions, enrich, config, logger, event_batch_size, report_drops):
+    """Return (written DocumentIds, recorded hashes, dropped rows skipped) of one pipeline run."""
+    index = DedupIndex(MemoryCheckpoints(), "bench", logger=logger)
+    pending = PendingRows()
+    positions = [dimensions.index(field) for field in DEDUP_KEY_FIELDS]
+    recorded_rows = index.record_rows(iter(rows), positions, dimensions.index("UserStartTimeUTC"), pending)
+
+    written = []
+    committed = 0
+    for record in enrich(recorded_rows, config, logger, pending.drop if report_drops else None):
+        written.append(record)
+        if len(written) - committed == event_batch_size:
+            index.commit(pending, event_batch_size)
+            committed = len(written)
+    index.commit(pending, len(written) - committed)
+    index.release(pending)
+    hashes = set().union(*index._partitions.values())
+    return written, hashes, pending.dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--fail-every", type=int, default=97)
+    parser.add_argument("--event-batch-size", type=int, default=333)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench_dedup")
+    # The failing rows log their (expected) enrichment failures
+    # (process engine workers do not inherit these levels and still print theirs to stderr)
+    logger.setLevel(logging.CRITICAL)
+    for name in ("callqueue_enrichment", "autoattendant_enrichment"):
+        logging.getLogger(name).setLevel(logging.CRITICAL)
+
+    # Calls of yesterday, inside the duplicate index retention
+    start = (datetime.now(timezone.utc) - timedelta(days=1)).replace(hour=8, minute=0, second=0, microsecond=0)
+    print(f"{'report':<16}{'engine':<12}{'written':>9}{'dropped':>9}{'recorded':>10}{'wrong w/o drops':>17}")
+    for report_type in ("call_queue", "auto_attendant"):
+        rows, dimensions, measurements = generate_rows(args.rows, report_type, start=start, profile="realistic")
+        failing = dimensions.index(FAILING_FIELDS[report_type])
+        document_id = dimensions.index("DocumentId")
+        for row in rows[args.fail_every // 2::args.fail_every]:
+            row[failing] = 42
+        key_positions = [dimensions.index(field) for field in DEDUP_KEY_FIELDS]
+        hash_by_document = {row[document_id]: call_hash([row[position] for position in key_positions])
+                            for row in rows}
+        expected_dropped = len(rows[args.fail_every // 2::args.fail_every])
+
+        for label, enrich, config in engines(report_type):
+            def enrich_rows(data, config, logger, on_drop, enrich=enrich):
+                return enrich(data, dimensions, measurements, config, logger, on_drop)
+
+            written, hashes, dropped = run(rows, dimensions, enrich_rows, config, logger,
+                                           args.event_batch_size, report_drops=True)
+            expected = {hash_by_document[record[DOCUMENT_ID_KEYS[report_type]]] for record in written}
+            if len(written) != len(rows) - expected_dropped or dropped != expected_dropped:
+                raise SystemExit(f"{report_type} {label}: {len(written)} written, {dropped} dropped, "
+                                 f"expected {expected_dropped} dropped")
+            if hashes != expected:
+                raise SystemExit(f"{report_type} {label}: {len(hashes - expected)} hashes of unwritten rows "
+                                 f"recorded, {len(expected - hashes)} written rows not recorded")
+
+            _, unaligned, _ = run(rows, dimensions, enrich_rows, config, logger,
+                                  args.event_batch_size, report_drops=False)
+            print(f"{report_type:<16}{label:<12}{len(written):>9}{dropped:>9}{len(hashes):>10}"
+                  f"{len(unaligned - expected):>17}")
+    print("Recorded hashes match the written events on every engine")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Event Writer Benchmark
+
+Measures the write stage of stream_events: serializing enriched records and
+writing them to Splunk's stdout stream.
+
+"Before" is the original loop (json.dumps + one smi.Event + write_event per
+record). "After" is BatchedEventWriter with the key-specialized
+EventSerializer, and with orjson when it is installed. The standard serializer
+output is checked to be byte-identical to the original loop.
+
+Requires splunklib (splunk-sdk) for the baseline.
+
+Usage:
+    python benchmarks/bench_event_writer.py [--records 200000] [--report-type call_queue]
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from splunklib import modularinput as smi  # noqa: E402
+
+from autoattendant_enrichment import enrich_autoattendant_data  # noqa: E402
+from callqueue_enrichment import CALLQUEUE_OUTPUT_KEYS, enrich_callqueue_data  # noqa: E402
+from event_batch_writer import BatchedEventWriter, EventSerializer, orjson  # noqa: E402
+from synthetic_vaac import generate_rows  # noqa: E402
+
+
+SOURCETYPES = {
+    "call_queue": "msteams:vaac:callqueue",
+    "auto_attendant": "msteams:vaac:autoattendant",
+}
+
+
+def enriched_records(count, report_type):
+    """Enrich synthetic rows once so only the write stage is timed."""
+    rows, dimensions, measurements = generate_rows(count, report_type)
+    field_names = dimensions + measurements
+    records = [dict(zip(field_names, row)) for row in rows]
+    config = {'timezone_offset': 'Australia/Sydney', 'parallel_workers': 1}
+    logger = logging.getLogger("bench_event_writer")
+    logger.setLevel(logging.WARNING)
+    if report_type == "call_queue":
+        return list(enrich_callqueue_data(records, config, logger=logger))
+    return list(enrich_autoattendant_data(records, config, logger=logger))
+
+
+def write_per_event(records, sourcetype, index):
+    """Original stream_events write loop."""
+    out = io.StringIO()
+    event_writer = smi.EventWriter(output=out, error=io.StringIO())
+    for line in records:
+        event_writer.write_event(
+            smi.Event(
+                data=json.dumps(line, ensure_ascii=False, default=str),
+                index=index,
+                sourcetype=sourcetype,
+            )
+        )
+    return out.getvalue()
+
+
+def write_batched(records, sourcetype, index, use_orjson=False):
+    """BatchedEventWriter write loop."""
+    out = io.StringIO()
+    event_writer = smi.EventWriter(output=out, error=io.StringIO())
+    serializer = EventSerializer(key_layouts=(CALLQUEUE_OUTPUT_KEYS,), use_orjson=use_orjson)
+    with BatchedEventWriter(event_writer, sourcetype, index=index, serializer=serializer) as writer:
+        writer.write_all(records)
+    return out.getvalue()
+
+
+def measure(func, *args, **kwargs):
+    """Return (seconds, output) of the best of three runs."""
+    best = None
+    for _ in range(3):
+        started = time.perf_counter()
+        output = func(*args, **kwargs)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--report-type", choices=sorted(SOURCETYPES), default="call_queue")
+    parser.add_argument("--index", default="msteams")
+    args = parser.parse_args()
+
+    records = enriched_records(args.records, args.report_type)
+    sourcetype = SOURCETYPES[args.report_type]
+
+    before, expected = measure(write_per_event, records, sourcetype, args.index)
+    after, actual = measure(write_batched, records, sourcetype, args.index)
+    if actual != expected:
+        raise SystemExit("Batched output differs from the per-event output")
+
+    print(f"{'writer':<28}{'records/s':>12}{'us/rec':>10}{'speedup':>10}")
+    print(f"{'per-event smi.Event':<28}{args.records / before:>12,.0f}{before / args.records * 1e6:>10.2f}{'1.0x':>10}")
+    print(f"{'batched (standard)':<28}{args.records / after:>12,.0f}{after / args.records * 1e6:>10.2f}"
+          f"{before / after:>9.1f}x")
+
+    if orjson is not None:
+        fast, _ = measure(write_batched, records, sourcetype, args.index, use_orjson=True)
+        print(f"{'batched (orjson)':<28}{args.records / fast:>12,.0f}{fast / args.records * 1e6:>10.2f}"
+              f"{before / fast:>9.1f}x")
+    else:
+        print("orjson is not installed, skipping the orjson serializer")
+
+
+if __name__ == "__main__":
+    main()
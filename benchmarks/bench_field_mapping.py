@@ -0,0 +1,357 @@
+"""
+Field Mapping Benchmark
+
+Compares the original hand-written Call Queue enrichment (one dict built
+field by field, the config flags checked per record) with the functions
+compiled from CALLQUEUE_SPEC (see field_mapping.compile_enricher), for every
+combination of enable_legend_codes, enable_legend_strings and
+enable_timezone_conversion. The references are the original sequential
+loop (output and failure counts) and the original thread-worker function of
+the default engine (output). The compiled engines:
+
+- row: _enrich_callqueue_data_sequential
+- batched: enrich_callqueue_data with the input defaults (row engine,
+  parallel_workers=4) in batches of 1000 records
+- process: enrich_callqueue_data with the process pool (chunks of 2000 rows)
+- columnar: enrich_callqueue_columns
+- single: enrich_single_callqueue_record, output only
+
+Every engine's output is checked to be identical to both references' and
+its timestamp/enrichment failure counts to the sequential loop's, on
+realistic synthetic rows plus edge cases (short rows, unparsable, empty and
+missing timestamps, unknown call results, non-string identities and
+unhashable values that make a record fail). The row, batched, process and
+columnar engines must also pass the call identifiers of the source rows
+through (CallQueue[DocumentId], [ConferenceId], [DialogId]).
+
+Usage:
+    python benchmarks/bench_field_mapping.py [--rows 50000]
+"""
+
+import argparse
+import gc
+import itertools
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from callqueue_enrichment import (  # noqa: E402
+    CONNECTIVITY_TYPE_CODES, _enrich_callqueue_data_sequential, calculate_abandoned_count, convert_to_local_timezone,
+    enrich_callqueue_columns, enrich_callqueue_data, enrich_single_callqueue_record, extract_queue_ra_name,
+    format_datetime_cqname, get_call_result_legend_code, get_corrected_target_type, get_disposition,
+    get_target_type_legend_code, parse_timestamp_to_utc
+)
+from legend_strings import (  # noqa: E402
+    CALL_RESULT_LEGEND_STRINGS, CONNECTIVITY_TYPE_STRINGS, TARGET_TYPE_LEGEND_STRINGS
+)
+from run_metrics import RunMetrics  # noqa: E402
+from synthetic_vaac import generate_rows  # noqa: E402
+from vaac_stream import transform_ordered_arrays_to_dicts  # noqa: E402
+
+
+def original_enrich_callqueue_data(raw_data, config, logger, metrics):
+    """Original per-record enrichment (without its debug traces and progress logs)."""
+    timezone_offset = config.get('timezone_offset', 'UTC')
+    language_code = config.get('language_code', 'en-AU')
+    enable_legend_codes = config.get('enable_legend_codes', True)
+    enable_legend_strings = config.get('enable_legend_strings', True)
+    enable_timezone_conversion = config.get('enable_timezone_conversion', True)
+    enriched_data = []
+    for raw_record in raw_data:
+        try:
+            enriched = {}
+            enriched['CallQueue[rawUserStartTimeUTC]'] = raw_record.get('UserStartTimeUTC', '')
+            enriched['CallQueue[rawEndTime]'] = raw_record.get('EndTime', '')
+            enriched['CallQueue[rawCallQueueId]'] = raw_record.get('CallQueueId', '')
+            enriched['CallQueue[rawCallQueueIdentity]'] = raw_record.get('CallQueueIdentity', '')
+            enriched['CallQueue[rawCallQueueCallResult]'] = raw_record.get('CallQueueCallResult', '')
+            enriched['CallQueue[rawCallQueueTargetType]'] = raw_record.get('CallQueueTargetType', '')
+            enriched['CallQueue[rawCallQueueDurationSeconds]'] = raw_record.get('CallQueueDurationSeconds', 0)
+            enriched['CallQueue[rawCallQueueAgentCount]'] = raw_record.get('CallQueueAgentCount', 0)
+            enriched['CallQueue[rawCallQueueAgentOptInCount]'] = raw_record.get('CallQueueAgentOptInCount', 0)
+            enriched['CallQueue[rawPSTNConnectivityType]'] = raw_record.get('PSTNConnectivityType', '')
+            enriched['CallQueue[rawPSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
+            enriched['CallQueue[rawTotalCallCount]'] = raw_record.get('TotalCallCount', 1)
+            # Identifiers as written by the original thread workers (the original sequential
+            # path read DocumentID/ConferenceID/DialogID, which the API never returns)
+            enriched['CallQueue[DocumentId]'] = raw_record.get('DocumentId', '')
+            enriched['CallQueue[ConferenceId]'] = raw_record.get('ConferenceId', '')
+            enriched['CallQueue[DialogId]'] = raw_record.get('DialogId', '')
+            raw_call_result = raw_record.get('CallQueueCallResult', '')
+            raw_target_type = raw_record.get('CallQueueTargetType', '')
+            disposition = get_disposition(raw_call_result, raw_target_type)
+            enriched['CallQueue[CQTargetType]'] = disposition.cq_target_type
+            call_start_utc = parse_timestamp_to_utc(raw_record.get('UserStartTimeUTC', ''), logger, False)
+            call_end_utc = parse_timestamp_to_utc(raw_record.get('EndTime', ''), logger, False)
+            if not call_start_utc:
+                metrics.count("timestamp_parse_failures")
+            enriched['CallQueue[CallStartTimeUTC]'] = call_start_utc.isoformat() if call_start_utc else ''
+            enriched['CallQueue[CallEndTimeUTC]'] = call_end_utc.isoformat() if call_end_utc else ''
+            if enable_timezone_conversion and call_start_utc:
+                call_start_local = convert_to_local_timezone(call_start_utc, timezone_offset, logger)
+                call_end_local = convert_to_local_timezone(call_end_utc, timezone_offset, logger) if call_end_utc else None
+            else:
+                call_start_local = call_start_utc
+                call_end_local = call_end_utc
+            enriched['CallQueue[CallStartTimeLocal]'] = call_start_local.isoformat() if call_start_local else ''
+            enriched['CallQueue[CallEndTimeLocal]'] = call_end_local.isoformat() if call_end_local else ''
+            if call_start_local:
+                call_start_date = call_start_local.replace(hour=0, minute=0, second=0, microsecond=0)
+                enriched['CallQueue[CallStartDateLocal]'] = call_start_date.isoformat()
+                hourly_timestamp = call_start_local.replace(minute=0, second=0, microsecond=0)
+                enriched['CallQueue[Date]'] = hourly_timestamp.isoformat()
+                enriched['CallQueue[CQHour]'] = call_start_local.hour
+            else:
+                enriched['CallQueue[CallStartDateLocal]'] = ''
+                enriched['CallQueue[Date]'] = ''
+                enriched['CallQueue[CQHour]'] = 0
+            raw_connectivity = raw_record.get('PSTNConnectivityType', '')
+            connectivity_code = CONNECTIVITY_TYPE_CODES.get(raw_connectivity, 8620)
+            enriched['CallQueue[CQConnectivityTypeCode]'] = connectivity_code
+            enriched['CallQueue[CQConnectivityTypeString]'] = CONNECTIVITY_TYPE_STRINGS.get(connectivity_code, "Unknown")
+            enriched['CallQueue[CQConnectivityTypeRaw]'] = raw_connectivity
+            if enable_legend_codes:
+                enriched['CallQueue[CQCallResultLegendCode]'] = disposition.call_result_code
+                enriched['CallQueue[CQTargetTypeLegendCode]'] = disposition.target_type_code
+                if enable_legend_strings:
+                    enriched['CallQueue[CQCallResultLegendString]'] = disposition.call_result_string
+                    enriched['CallQueue[CQTargetTypeLegendString]'] = disposition.target_type_string
+                else:
+                    enriched['CallQueue[CQCallResultLegendString]'] = ''
+                    enriched['CallQueue[CQTargetTypeLegendString]'] = ''
+            else:
+                enriched['CallQueue[CQCallResultLegendCode]'] = 0
+                enriched['CallQueue[CQTargetTypeLegendCode]'] = 0
+                enriched['CallQueue[CQCallResultLegendString]'] = ''
+                enriched['CallQueue[CQTargetTypeLegendString]'] = ''
+            enriched['CallQueue[CQCallCountAbandoned]'] = disposition.abandoned
+            ra_name = extract_queue_ra_name(raw_record.get('CallQueueIdentity', ''))
+            enriched['CallQueue[CQRAName]'] = ra_name
+            enriched['CallQueue[CQSlicer]'] = ra_name
+            enriched['CallQueue[CQName]'] = ''
+            enriched['CallQueue[DateTimeCQName]'] = format_datetime_cqname(call_start_local, ra_name)
+            enriched['CallQueue[CQGUID]'] = raw_record.get('CallQueueId', '')
+            enriched['CallQueue[CQAgentCount]'] = raw_record.get('CallQueueAgentCount', 0)
+            enriched['CallQueue[CQAgentOptInCount]'] = raw_record.get('CallQueueAgentOptInCount', 0)
+            enriched['CallQueue[CQCallDurationSeconds]'] = raw_record.get('CallQueueDurationSeconds', 0)
+            enriched['CallQueue[CQCallCount]'] = raw_record.get('TotalCallCount', 1)
+            enriched['CallQueue[CQCallResultRaw]'] = raw_call_result
+            enriched['CallQueue[PSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
+            enriched['CallQueue[LanguageCode]'] = language_code
+            enriched_data.append(enriched)
+        except Exception:
+            metrics.count("enrichment_failures")
+    return enriched_data
+
+
+def original_enrich_single_callqueue_record(raw_record, config):
+    """Original thread-worker enrichment of one record (the default engine), None on failure."""
+    timezone_offset = config.get('timezone_offset', 'UTC')
+    language_code = config.get('language_code', 'en-AU')
+    enable_legend_codes = config.get('enable_legend_codes', True)
+    enable_legend_strings = config.get('enable_legend_strings', True)
+    enable_timezone_conversion = config.get('enable_timezone_conversion', True)
+    try:
+        enriched = {}
+        enriched['CallQueue[rawUserStartTimeUTC]'] = raw_record.get('UserStartTimeUTC', '')
+        enriched['CallQueue[rawEndTime]'] = raw_record.get('EndTime', '')
+        enriched['CallQueue[rawCallQueueId]'] = raw_record.get('CallQueueId', '')
+        enriched['CallQueue[rawCallQueueIdentity]'] = raw_record.get('CallQueueIdentity', '')
+        enriched['CallQueue[rawCallQueueCallResult]'] = raw_record.get('CallQueueCallResult', '')
+        enriched['CallQueue[rawCallQueueTargetType]'] = raw_record.get('CallQueueTargetType', '')
+        enriched['CallQueue[rawCallQueueDurationSeconds]'] = raw_record.get('CallQueueDurationSeconds', 0)
+        enriched['CallQueue[rawCallQueueAgentCount]'] = raw_record.get('CallQueueAgentCount', 0)
+        enriched['CallQueue[rawCallQueueAgentOptInCount]'] = raw_record.get('CallQueueAgentOptInCount', 0)
+        enriched['CallQueue[rawPSTNConnectivityType]'] = raw_record.get('PSTNConnectivityType', '')
+        enriched['CallQueue[rawPSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
+        enriched['CallQueue[rawTotalCallCount]'] = raw_record.get('TotalCallCount', 1)
+        enriched['CallQueue[DocumentId]'] = raw_record.get('DocumentId', '')
+        enriched['CallQueue[ConferenceId]'] = raw_record.get('ConferenceId', '')
+        enriched['CallQueue[DialogId]'] = raw_record.get('DialogId', '')
+        raw_call_result = raw_record.get('CallQueueCallResult', '')
+        raw_target_type = raw_record.get('CallQueueTargetType', '')
+        cq_target_type = get_corrected_target_type(raw_call_result, raw_target_type)
+        enriched['CallQueue[CQTargetType]'] = cq_target_type
+        call_start_utc = parse_timestamp_to_utc(raw_record.get('UserStartTimeUTC', ''))
+        call_end_utc = parse_timestamp_to_utc(raw_record.get('EndTime', ''))
+        enriched['CallQueue[CallStartTimeUTC]'] = call_start_utc.isoformat() if call_start_utc else ''
+        enriched['CallQueue[CallEndTimeUTC]'] = call_end_utc.isoformat() if call_end_utc else ''
+        if enable_timezone_conversion and call_start_utc:
+            call_start_local = convert_to_local_timezone(call_start_utc, timezone_offset)
+            call_end_local = convert_to_local_timezone(call_end_utc, timezone_offset) if call_end_utc else None
+        else:
+            call_start_local = call_start_utc
+            call_end_local = call_end_utc
+        enriched['CallQueue[CallStartTimeLocal]'] = call_start_local.isoformat() if call_start_local else ''
+        enriched['CallQueue[CallEndTimeLocal]'] = call_end_local.isoformat() if call_end_local else ''
+        if call_start_local:
+            call_start_date = call_start_local.replace(hour=0, minute=0, second=0, microsecond=0)
+            enriched['CallQueue[CallStartDateLocal]'] = call_start_date.isoformat()
+            hourly_timestamp = call_start_local.replace(minute=0, second=0, microsecond=0)
+            enriched['CallQueue[Date]'] = hourly_timestamp.isoformat()
+            enriched['CallQueue[CQHour]'] = call_start_local.hour
+        else:
+            enriched['CallQueue[CallStartDateLocal]'] = ''
+            enriched['CallQueue[Date]'] = ''
+            enriched['CallQueue[CQHour]'] = 0
+        raw_connectivity = raw_record.get('PSTNConnectivityType', '')
+        connectivity_code = CONNECTIVITY_TYPE_CODES.get(raw_connectivity, 8620)
+        enriched['CallQueue[CQConnectivityTypeCode]'] = connectivity_code
+        enriched['CallQueue[CQConnectivityTypeString]'] = CONNECTIVITY_TYPE_STRINGS.get(connectivity_code, "Unknown")
+        enriched['CallQueue[CQConnectivityTypeRaw]'] = raw_connectivity
+        if enable_legend_codes:
+            call_result_code = get_call_result_legend_code(raw_call_result, cq_target_type)
+            target_type_code = get_target_type_legend_code(raw_call_result, cq_target_type)
+            enriched['CallQueue[CQCallResultLegendCode]'] = call_result_code
+            enriched['CallQueue[CQTargetTypeLegendCode]'] = target_type_code
+            if enable_legend_strings:
+                enriched['CallQueue[CQCallResultLegendString]'] = CALL_RESULT_LEGEND_STRINGS.get(call_result_code, "Unknown")
+                enriched['CallQueue[CQTargetTypeLegendString]'] = TARGET_TYPE_LEGEND_STRINGS.get(target_type_code, "Unknown")
+            else:
+                enriched['CallQueue[CQCallResultLegendString]'] = ''
+                enriched['CallQueue[CQTargetTypeLegendString]'] = ''
+        else:
+            enriched['CallQueue[CQCallResultLegendCode]'] = 0
+            enriched['CallQueue[CQTargetTypeLegendCode]'] = 0
+            enriched['CallQueue[CQCallResultLegendString]'] = ''
+            enriched['CallQueue[CQTargetTypeLegendString]'] = ''
+        enriched['CallQueue[CQCallCountAbandoned]'] = calculate_abandoned_count(raw_call_result, cq_target_type)
+        ra_name = extract_queue_ra_name(raw_record.get('CallQueueIdentity', ''))
+        enriched['CallQueue[CQRAName]'] = ra_name
+        enriched['CallQueue[CQSlicer]'] = ra_name
+        enriched['CallQueue[CQName]'] = ''
+        enriched['CallQueue[DateTimeCQName]'] = format_datetime_cqname(call_start_local, ra_name)
+        enriched['CallQueue[CQGUID]'] = raw_record.get('CallQueueId', '')
+        enriched['CallQueue[CQAgentCount]'] = raw_record.get('CallQueueAgentCount', 0)
+        enriched['CallQueue[CQAgentOptInCount]'] = raw_record.get('CallQueueAgentOptInCount', 0)
+        enriched['CallQueue[CQCallDurationSeconds]'] = raw_record.get('CallQueueDurationSeconds', 0)
+        enriched['CallQueue[CQCallCount]'] = raw_record.get('TotalCallCount', 1)
+        enriched['CallQueue[CQCallResultRaw]'] = raw_call_result
+        enriched['CallQueue[PSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
+        enriched['CallQueue[LanguageCode]'] = language_code
+        return enriched
+    except Exception:
+        return None
+
+
+def edge_rows(dimensions, measurements, template):
+    """Rows exercising the failure and fallback paths, built from a valid row."""
+    fields = dimensions + measurements
+
+    def row(**values):
+        edited = list(template)
+        for field_name, value in values.items():
+            edited[fields.index(field_name)] = value
+        return edited
+
+    return [
+        row(UserStartTimeUTC="not a timestamp"),
+        row(UserStartTimeUTC=""),
+        row(UserStartTimeUTC=None),
+        row(UserStartTimeUTC="2025-12-01T10:00:00+10:00"),
+        row(EndTime="not a timestamp"),
+        row(EndTime=""),
+        row(UserStartTimeUTC="not a timestamp", EndTime="2025-12-01T10:00:00Z"),
+        row(CallQueueCallResult="unexpected", CallQueueTargetType=None),
+        row(CallQueueCallResult=["unhashable"]),
+        row(CallQueueIdentity=None),
+        row(CallQueueIdentity=42),
+        row(CallQueueIdentity=42, UserStartTimeUTC="not a timestamp"),
+        # Short row: missing trailing fields read as None
+        list(template[:3]),
+    ]
+
+
+IDENTIFIER_KEYS = (
+    ('DocumentId', 'CallQueue[DocumentId]'),
+    ('ConferenceId', 'CallQueue[ConferenceId]'),
+    ('DialogId', 'CallQueue[DialogId]'),
+)
+
+
+def check_identifiers(label, enriched, records):
+    """Fail unless every record carries the non-empty identifiers of its source row."""
+    if len(enriched) != len(records):
+        raise SystemExit(f"{label} dropped realistic records")
+    for record, source in zip(enriched, records):
+        for source_key, key in IDENTIFIER_KEYS:
+            if not source[source_key] or record.get(key) != source[source_key]:
+                raise SystemExit(f"{label} does not pass {source_key} through: "
+                                 f"{record.get(key)!r} != {source[source_key]!r}")
+
+
+def timed(enrich):
+    """Return (result, seconds)."""
+    gc.collect()
+    started = time.perf_counter()
+    result = enrich()
+    return result, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    # The edge rows log their (expected) enrichment and parse failures
+    # (process engine workers do not inherit these levels and still print theirs to stderr)
+    logger = logging.getLogger("bench_field_mapping")
+    logger.setLevel(logging.CRITICAL)
+    logging.getLogger("callqueue_enrichment").setLevel(logging.CRITICAL)
+    rows, dimensions, measurements = generate_rows(args.rows, "call_queue", profile="realistic")
+    rows = rows + edge_rows(dimensions, measurements, rows[0])
+    records = transform_ordered_arrays_to_dicts(rows, dimensions, measurements)
+    print(f"call_queue: {len(rows)} rows ({args.rows} realistic + edge cases)")
+
+    print(f"{'codes':<7}{'strings':<9}{'timezone':<10}{'original':>10}{'row':>10}{'batched':>10}{'process':>10}"
+          f"{'columnar':>10}  rows/s")
+    for codes, strings, timezone in itertools.product((True, False), repeat=3):
+        config = {"timezone_offset": "Australia/Sydney", "enable_legend_codes": codes,
+                  "enable_legend_strings": strings, "enable_timezone_conversion": timezone}
+        throughput = []
+        expected = expected_counts = None
+        threaded = [enriched for enriched in (original_enrich_single_callqueue_record(record, config)
+                                              for record in records) if enriched is not None]
+        for label, enrich in [
+            ("original", lambda metrics: original_enrich_callqueue_data(records, config, logger, metrics)),
+            ("row", lambda metrics: _enrich_callqueue_data_sequential(records, config, logger, metrics)),
+            ("batched", lambda metrics: list(enrich_callqueue_data(
+                records, dict(config, parallel_workers=4, batch_size=1000), logger, metrics))),
+            ("process", lambda metrics: list(enrich_callqueue_data(
+                records, dict(config, parallel_workers=2, enrichment_engine="process", process_chunk_size=2000),
+                logger, metrics))),
+            ("columnar", lambda metrics: enrich_callqueue_columns(rows, dimensions, measurements, config,
+                                                                  logger, metrics)),
+        ]:
+            metrics = RunMetrics()
+            enriched, seconds = timed(lambda: enrich(metrics))
+            counts = (metrics.counts["timestamp_parse_failures"], metrics.counts["enrichment_failures"])
+            if expected is None:
+                expected, expected_counts = enriched, counts
+            elif enriched != expected or counts != expected_counts \
+                    or [list(record) for record in enriched[:1]] != [list(record) for record in expected[:1]]:
+                raise SystemExit(f"{label} output differs from the original enrichment ({config})")
+            if enriched != threaded \
+                    or [list(record) for record in enriched[:1]] != [list(record) for record in threaded[:1]]:
+                raise SystemExit(f"{label} output differs from the original thread workers' ({config})")
+            throughput.append(len(rows) / seconds)
+            if label != "original":
+                check_identifiers(label, enriched[:args.rows], records[:args.rows])
+
+        # One record at a time
+        for idx, record in enumerate(records[-20:]):
+            reference = original_enrich_single_callqueue_record(record, config)
+            _, enriched, success, _ = enrich_single_callqueue_record((idx, record, config))
+            if reference != enriched or success != (reference is not None):
+                raise SystemExit(f"single record output differs from the original enrichment ({config})")
+
+        print(f"{str(codes):<7}{str(strings):<9}{str(timezone):<10}"
+              + "".join(f"{value:>10,.0f}" for value in throughput))
+    print("All engines produce the original output")
+
+
+if __name__ == "__main__":
+    main()
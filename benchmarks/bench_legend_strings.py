@@ -0,0 +1,118 @@
+"""
+Localized Legend Strings Benchmark
+
+Checks the legend string packs of legend_strings and the Call Queue
+enrichment using them:
+
+- importing the enrichment loads no pack; enriching in one language loads
+  only that language's pack
+- inputs whose language_code resolves to the same pack (de-DE, de-AT) share
+  one process-wide pack
+- every pack file has a string for every code
+- localized output equals the English output except for the legend and
+  connectivity type strings, which are the pack's
+
+and reports the first-load time of each pack and the enrichment throughput
+per language.
+
+Usage:
+    python benchmarks/bench_legend_strings.py [--rows 50000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+import legend_strings  # noqa: E402
+from callqueue_enrichment import enrich_callqueue_columns  # noqa: E402
+from legend_strings import (  # noqa: E402
+    CALL_RESULT_LEGEND_STRINGS, CONNECTIVITY_TYPE_STRINGS, LEGEND_PACKS_DIR, TARGET_TYPE_LEGEND_STRINGS,
+    get_legend_pack
+)
+from run_metrics import RunMetrics  # noqa: E402
+from synthetic_vaac import generate_rows  # noqa: E402
+
+LOCALIZED_KEYS = (
+    'CallQueue[CQCallResultLegendString]',
+    'CallQueue[CQTargetTypeLegendString]',
+    'CallQueue[CQConnectivityTypeString]',
+)
+
+
+def enrich(rows, dimensions, measurements, language_code, logger):
+    """Return (enriched records, seconds) of the columnar engine in one language."""
+    config = {"timezone_offset": "Australia/Sydney", "language_code": language_code}
+    started = time.perf_counter()
+    enriched = list(enrich_callqueue_columns(rows, dimensions, measurements, config, logger=logger,
+                                             metrics=RunMetrics()))
+    return enriched, time.perf_counter() - started
+
+
+def check_pack_files():
+    """Fail on a pack file missing a code of the English strings."""
+    for file_name in sorted(os.listdir(LEGEND_PACKS_DIR)):
+        with open(os.path.join(LEGEND_PACKS_DIR, file_name), encoding="utf-8") as pack_file:
+            strings = json.load(pack_file)
+        for section, english in (("call_result", CALL_RESULT_LEGEND_STRINGS),
+                                 ("target_type", TARGET_TYPE_LEGEND_STRINGS),
+                                 ("connectivity_type", CONNECTIVITY_TYPE_STRINGS)):
+            missing = set(english) - {int(code) for code in strings.get(section, {})}
+            if missing:
+                raise SystemExit(f"{file_name}: no {section} strings for {sorted(missing)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench_legend_strings")
+    logger.setLevel(logging.ERROR)
+
+    if legend_strings._PACKS or legend_strings._LOADED_PACKS:
+        raise SystemExit("A legend string pack was loaded at import")
+    check_pack_files()
+
+    rows, dimensions, measurements = generate_rows(args.rows, "call_queue", profile="realistic")
+
+    # Localized output first, so only the German pack may be loaded at this point
+    german, _ = enrich(rows, dimensions, measurements, "de-DE", logger)
+    if set(legend_strings._LOADED_PACKS) != {"de"}:
+        raise SystemExit(f"Loaded packs {sorted(legend_strings._LOADED_PACKS)}, expected only de")
+    if get_legend_pack("de-AT", logger) is not get_legend_pack("de-DE", logger):
+        raise SystemExit("de-AT and de-DE do not share the de pack")
+
+    english, _ = enrich(rows, dimensions, measurements, "en-AU", logger)
+    pack = get_legend_pack("de-DE", logger)
+    for localized, original in zip(german, english):
+        expected = dict(original)
+        expected['CallQueue[LanguageCode]'] = "de-DE"
+        expected['CallQueue[CQCallResultLegendString]'] = pack.call_result_string(
+            original['CallQueue[CQCallResultLegendCode]'])
+        expected['CallQueue[CQTargetTypeLegendString]'] = pack.target_type_string(
+            original['CallQueue[CQTargetTypeLegendCode]'])
+        expected['CallQueue[CQConnectivityTypeString]'] = pack.connectivity_type_string(
+            original['CallQueue[CQConnectivityTypeCode]'])
+        if localized != expected:
+            raise SystemExit(f"de-DE output differs from the English output: {localized} != {expected}")
+    if len(german) != len(english):
+        raise SystemExit("de-DE and English outputs differ in length")
+
+    print(f"{'language':<10}{'pack':>6}{'load ms':>9}{'rows/s':>12}  sample")
+    for language_code in ("en-AU", "de-DE", "fr-FR", "es-ES", "xx-XX"):
+        started = time.perf_counter()
+        pack = get_legend_pack(language_code, logger)
+        load_ms = (time.perf_counter() - started) * 1000
+        enriched, seconds = enrich(rows, dimensions, measurements, language_code, logger)
+        sample = " / ".join(str(enriched[0][key]) for key in LOCALIZED_KEYS)
+        print(f"{language_code:<10}{pack.language:>6}{load_ms:>9.2f}{len(rows) / seconds:>12,.0f}  {sample}")
+    print("Localized output matches the English output and packs are shared")
+
+
+if __name__ == "__main__":
+    main()
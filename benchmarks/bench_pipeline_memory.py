@@ -0,0 +1,129 @@
+"""
+Ingestion Pipeline Peak Memory Benchmark
+
+Compares the peak RSS growth of the materialized pipeline (decode the whole
+response, transform every row, enrich every row, then write) against the
+streaming generator pipeline used by stream_events (rows are parsed,
+transformed, enriched and written in fixed-size batches).
+
+Each measurement runs in a fresh interpreter (Linux only, reads /proc). The
+response body is loaded before the baseline is taken, so it is excluded from
+both figures.
+
+Usage:
+    python benchmarks/bench_pipeline_memory.py [--rows 10000 100000 200000] [--batch-size 5000]
+"""
+
+import argparse
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from callqueue_enrichment import enrich_callqueue_data  # noqa: E402
+from synthetic_vaac import generate_response_body, generate_rows  # noqa: E402
+from vaac_stream import DEFAULT_STREAM_CHUNK_SIZE, DataResultStream, iter_ordered_arrays_as_dicts  # noqa: E402
+
+
+def _chunks(body, size=DEFAULT_STREAM_CHUNK_SIZE):
+    """Simulate response.iter_content()."""
+    view = memoryview(body)
+    for start in range(0, len(body), size):
+        yield bytes(view[start:start + size])
+
+
+def materialized(body, dimensions, measurements, config, logger):
+    data = json.loads(body.decode("utf-8"))
+    records = list(iter_ordered_arrays_as_dicts(data["dataResult"], dimensions, measurements))
+    enriched = list(enrich_callqueue_data(records, config, logger))
+    written = 0
+    for line in enriched:
+        json.dumps(line, ensure_ascii=False, default=str)
+        written += 1
+    return written
+
+
+def streaming(body, dimensions, measurements, config, logger):
+    written = 0
+    for line in enrich_callqueue_data(iter_ordered_arrays_as_dicts(DataResultStream(_chunks(body)), dimensions, measurements), config, logger):
+        json.dumps(line, ensure_ascii=False, default=str)
+        written += 1
+    return written
+
+
+def _peak_rss_bytes():
+    # VmHWM, unlike ru_maxrss, is not inherited from the parent across exec
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("VmHWM not available")
+
+
+def _current_rss_bytes():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def run_child(mode, body_path, batch_size):
+    """Run one pipeline over the body in body_path, print its peak RSS growth."""
+    # Read into a preallocated buffer so loading the body does not raise the peak
+    body = bytearray(os.path.getsize(body_path))
+    with open(body_path, "rb") as body_file:
+        body_file.readinto(body)
+    _, dimensions, measurements = generate_rows(0)
+    logger = logging.getLogger("bench_pipeline_memory")
+    logger.setLevel(logging.WARNING)
+    config = {"timezone_offset": "Australia/Sydney", "batch_size": batch_size}
+
+    baseline = _current_rss_bytes()
+    pipeline = materialized if mode == "materialized" else streaming
+    written = pipeline(body, dimensions, measurements, config, logger)
+    print(json.dumps({"written": written, "peak": _peak_rss_bytes() - baseline}))
+
+
+def measure(mode, body_path, batch_size):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, body_path, "--batch-size", str(batch_size)],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    return result["written"], result["peak"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10000, 100000, 200000])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "BODY_PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], args.child[1], args.batch_size)
+        return
+
+    print(f"{'rows':>8}{'body MB':>10}{'materialized MB':>18}{'streaming MB':>15}")
+    for count in args.rows:
+        rows, _, _ = generate_rows(count)
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as body_file:
+            body_file.write(generate_response_body(rows))
+            body_path = body_file.name
+        del rows
+        try:
+            written_a, peak_a = measure("materialized", body_path, args.batch_size)
+            written_b, peak_b = measure("streaming", body_path, args.batch_size)
+        finally:
+            body_size = os.path.getsize(body_path)
+            os.unlink(body_path)
+        if written_a != written_b:
+            raise SystemExit(f"Pipelines wrote different event counts: {written_a} != {written_b}")
+        print(f"{count:>8}{body_size / 2**20:>10.1f}{peak_a / 2**20:>18.1f}{peak_b / 2**20:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
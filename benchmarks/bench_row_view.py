@@ -0,0 +1,103 @@
+"""
+Row View Benchmark
+
+Compares the original transform of VAAC ordered arrays to dictionaries (one
+dict built field by field per row) with the RowView mappings returned by
+transform_ordered_arrays_to_dicts:
+
+- memory of a transformed response (all rows held, as get_vaac_analytics does
+  without streaming), measured with tracemalloc; the ordered arrays
+  themselves are allocated before and not counted
+- transform time per row
+- Call Queue (row engine) and Auto Attendant enrichment throughput, with the
+  enriched output checked to be identical
+
+Usage:
+    python benchmarks/bench_row_view.py [--rows 200000]
+"""
+
+import argparse
+import gc
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from autoattendant_enrichment import enrich_autoattendant_data  # noqa: E402
+from callqueue_enrichment import enrich_callqueue_data  # noqa: E402
+from synthetic_vaac import generate_rows  # noqa: E402
+from vaac_stream import iter_ordered_arrays_as_dicts  # noqa: E402
+
+
+def iter_rows_as_dicts(array_data, dimensions, measurements):
+    """Original transform: one dictionary per row."""
+    field_names = dimensions + measurements
+
+    for row in array_data:
+        record = {}
+        for idx, field_name in enumerate(field_names):
+            record[field_name] = row[idx] if idx < len(row) else None
+        yield record
+
+
+TRANSFORMS = [
+    ("dict per row", iter_rows_as_dicts),
+    ("RowView", iter_ordered_arrays_as_dicts),
+]
+
+
+def transformed_memory(transform, rows, dimensions, measurements):
+    """Return (bytes allocated by the transformed list, seconds to build it)."""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    records = list(transform(rows, dimensions, measurements))
+    seconds = time.perf_counter() - started
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return allocated, seconds
+
+
+def enrich(transform, rows, dimensions, measurements, report_type):
+    """Return (enriched records, seconds) of enriching every row."""
+    logger = logging.getLogger("bench_row_view")
+    logger.setLevel(logging.WARNING)
+    config = {"timezone_offset": "Australia/Sydney", "parallel_workers": 1}
+    records = transform(rows, dimensions, measurements)
+    started = time.perf_counter()
+    if report_type == "call_queue":
+        enriched = list(enrich_callqueue_data(records, config, logger=logger))
+    else:
+        enriched = list(enrich_autoattendant_data(records, config, logger=logger))
+    return enriched, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    for report_type in ("call_queue", "auto_attendant"):
+        rows, dimensions, measurements = generate_rows(args.rows, report_type, profile="realistic")
+        print(f"\n{report_type}: {args.rows} rows of {len(dimensions) + len(measurements)} fields")
+        print(f"{'rows as':<15}{'MB':>9}{'bytes/row':>11}{'transform us/row':>18}{'enriched rows/s':>17}")
+
+        expected = None
+        for label, transform in TRANSFORMS:
+            allocated, seconds = transformed_memory(transform, rows, dimensions, measurements)
+            enriched, enrich_seconds = enrich(transform, rows, dimensions, measurements, report_type)
+            if expected is None:
+                expected = enriched
+            elif enriched != expected:
+                raise SystemExit(f"{label} enrichment output differs from the dictionary rows")
+            del enriched
+            print(f"{label:<15}{allocated / 2**20:>9.1f}{allocated / args.rows:>11.0f}"
+                  f"{seconds / args.rows * 1e6:>18.2f}{args.rows / enrich_seconds:>17,.0f}")
+
+
+if __name__ == "__main__":
+    main()
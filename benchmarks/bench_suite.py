@@ -0,0 +1,272 @@
+"""
+Ingestion Benchmark Suite
+
+Measures throughput (rows/sec) and peak memory of the ingestion pipeline used
+by stream_events - ordered arrays to dicts, enrichment, serialization and
+batched event writing - for each enrichment path, at 1k to 1M rows of
+realistic synthetic VAAC data (see synthetic_vaac.py profiles).
+
+Paths:
+- cq_sequential: Call Queue, row engine, 1 worker
+- cq_threads: Call Queue, row engine, 4 parallel workers (the input defaults;
+  the row engine enriches in the calling thread, kept to compare with older results)
+- cq_process: Call Queue, process engine (worker process memory is not
+  included in the peak)
+- cq_columnar: Call Queue, columnar engine on the ordered arrays
+- cq_windows: cq_sequential fed by WindowedRows fetching query windows
+  concurrently (windows fetched ahead buffer a bounded number of row batches)
+- aa_sequential: Auto Attendant, row engine, 1 worker
+- aa_process: Auto Attendant, process engine
+- aa_columnar: Auto Attendant, columnar engine on the ordered arrays
+
+Each measurement runs in a fresh interpreter (Linux only, reads /proc). Rows
+are cycled from a pool generated before the baseline is taken, like rows
+streamed from a response, so the figures cover the pipeline only.
+
+Results can be stored as JSON (with the git commit, Python version and CPU
+count) and compared with the results of another version.
+
+Usage:
+    python benchmarks/bench_suite.py [--rows 1000 10000 100000 1000000] [--paths cq_sequential ...]
+        [--label NAME] [--output FILE.json] [--compare benchmarks/results/OTHER.json]
+"""
+
+import argparse
+import gc
+import itertools
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from autoattendant_enrichment import (  # noqa: E402
+    AUTOATTENDANT_OUTPUT_KEYS, enrich_autoattendant_data, iter_enrich_autoattendant_columns
+)
+from callqueue_enrichment import (  # noqa: E402
+    CALLQUEUE_OUTPUT_KEYS, enrich_callqueue_data, iter_enrich_callqueue_columns
+)
+from event_batch_writer import BatchedEventWriter, EventSerializer  # noqa: E402
+from synthetic_vaac import generate_rows  # noqa: E402
+from vaac_stream import iter_ordered_arrays_as_dicts  # noqa: E402
+from window_planner import WindowedRows, plan_windows  # noqa: E402
+
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+PATHS = ["cq_sequential", "cq_threads", "cq_process", "cq_columnar", "cq_windows", "aa_sequential", "aa_process",
+         "aa_columnar"]
+
+# Distinct rows generated per measurement, larger runs cycle through them
+POOL_SIZE = 50000
+
+# Workers of the parallel paths
+PARALLEL_WORKERS = 4
+
+# Query windows of the cq_windows path (fetched by 2 workers)
+WINDOW_COUNT = 8
+
+
+class _NullOutput:
+    """Stdout stand-in counting the bytes written."""
+
+    def __init__(self):
+        self.bytes_written = 0
+
+    def write(self, text):
+        self.bytes_written += len(text)
+
+    def flush(self):
+        pass
+
+
+def _peak_rss_bytes():
+    with open("/proc/self/status") as status:
+        for line in status:
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) * 1024
+    raise RuntimeError("VmHWM not available")
+
+
+def _current_rss_bytes():
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def _reset_peak_rss():
+    # Resets VmHWM to the current RSS (Linux 4.0+), otherwise the pool generation peak remains
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+    except OSError:
+        pass
+
+
+def _cycled(pool, count):
+    return itertools.islice(itertools.cycle(pool), count)
+
+
+def _enriched(path, pool, count, dimensions, measurements, config, logger):
+    """Return the lazy enriched record iterator of one path."""
+    if path == "cq_windows":
+        start = datetime(2025, 12, 1, tzinfo=timezone.utc)
+        windows = plan_windows(start, start + timedelta(hours=WINDOW_COUNT), 3600)
+        per_window = -(-count // len(windows))
+        offsets = {window: index * per_window for index, window in enumerate(windows)}
+
+        def fetch(window):
+            first = offsets[window]
+            return itertools.islice(itertools.cycle(pool), first, min(count, first + per_window))
+
+        rows = WindowedRows(windows, fetch, max_workers=2, logger=logger)
+    else:
+        rows = _cycled(pool, count)
+
+    if path == "cq_columnar":
+        return iter_enrich_callqueue_columns(rows, dimensions, measurements, config, logger=logger)
+    if path == "aa_columnar":
+        return iter_enrich_autoattendant_columns(rows, dimensions, measurements, config, logger=logger)
+    records = iter_ordered_arrays_as_dicts(rows, dimensions, measurements)
+    if path in ("aa_sequential", "aa_process"):
+        return enrich_autoattendant_data(records, config, logger=logger)
+    return enrich_callqueue_data(records, config, logger=logger)
+
+
+def _config(path):
+    config = {"timezone_offset": "Australia/Sydney", "parallel_workers": 1, "enrichment_engine": "row"}
+    if path == "cq_threads":
+        config["parallel_workers"] = PARALLEL_WORKERS
+    elif path in ("cq_process", "aa_process"):
+        config["parallel_workers"] = PARALLEL_WORKERS
+        config["enrichment_engine"] = "process"
+    elif path in ("cq_columnar", "aa_columnar"):
+        config["enrichment_engine"] = "columnar"
+    return config
+
+
+def run_child(path, count, profile):
+    """Run one path over count rows, print its throughput and peak RSS growth."""
+    report_type = "auto_attendant" if path.startswith("aa_") else "call_queue"
+    pool, dimensions, measurements = generate_rows(min(count, POOL_SIZE), report_type, profile=profile)
+    logger = logging.getLogger("bench_suite")
+    logger.setLevel(logging.WARNING)
+    config = _config(path)
+    key_layouts = [CALLQUEUE_OUTPUT_KEYS if report_type == "call_queue" else AUTOATTENDANT_OUTPUT_KEYS]
+    output = _NullOutput()
+
+    gc.collect()
+    _reset_peak_rss()
+    baseline = _current_rss_bytes()
+    started = time.perf_counter()
+    enriched = _enriched(path, pool, count, dimensions, measurements, config, logger)
+    with BatchedEventWriter(SimpleNamespace(_out=output, header_written=False), "msteams:vaac:bench",
+                            serializer=EventSerializer(key_layouts), logger=logger) as writer:
+        writer.write_all(enriched)
+    seconds = time.perf_counter() - started
+
+    print(json.dumps({
+        "path": path,
+        "rows": count,
+        "written": writer.written_count,
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(writer.written_count / seconds, 1) if seconds else None,
+        "peak_rss_mb": round(max(0, _peak_rss_bytes() - baseline) / 2**20, 2),
+        "output_mb": round(output.bytes_written / 2**20, 2),
+    }))
+
+
+def measure(path, count, profile):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", path, str(count), "--profile", profile],
+        check=True, capture_output=True, text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=os.path.dirname(os.path.abspath(__file__)),
+            check=True, capture_output=True, text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path):
+    """Print the change of every measurement also present in a stored result file."""
+    with open(baseline_path) as baseline_file:
+        baseline = json.load(baseline_file)
+    previous = {(result["path"], result["rows"]): result for result in baseline["results"]}
+
+    print(f"\nCompared with {baseline.get('label')} ({baseline.get('git_commit')}, {baseline.get('created')})")
+    print(f"{'path':<15}{'rows':>9}{'rows/sec':>12}{'change':>9}{'peak MB':>10}{'change':>9}")
+    for result in results:
+        before = previous.get((result["path"], result["rows"]))
+        if before is None:
+            continue
+        speed = (result["rows_per_sec"] / before["rows_per_sec"] - 1) * 100 if before["rows_per_sec"] else 0.0
+        memory = result["peak_rss_mb"] - before["peak_rss_mb"]
+        print(f"{result['path']:<15}{result['rows']:>9}{result['rows_per_sec']:>12.0f}{speed:>+8.1f}%"
+              f"{result['peak_rss_mb']:>10.1f}{memory:>+8.1f}M")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000, 100000, 1000000])
+    parser.add_argument("--paths", nargs="+", choices=PATHS, default=PATHS)
+    parser.add_argument("--profile", choices=["uniform", "realistic"], default="realistic")
+    parser.add_argument("--label", help="Name of the result set (default: git commit)")
+    parser.add_argument("--output", help="Write results to this JSON file (default with --label: results/LABEL.json)")
+    parser.add_argument("--compare", metavar="RESULTS_JSON", help="Compare with stored results")
+    parser.add_argument("--child", nargs=2, metavar=("PATH", "ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child[0], int(args.child[1]), args.profile)
+        return
+
+    print(f"{'path':<15}{'rows':>9}{'seconds':>10}{'rows/sec':>12}{'peak MB':>10}")
+    results = []
+    for path in args.paths:
+        for count in args.rows:
+            result = measure(path, count, args.profile)
+            if result["written"] != count:
+                raise SystemExit(f"{path} wrote {result['written']} of {count} rows")
+            results.append(result)
+            print(f"{path:<15}{count:>9}{result['seconds']:>10.2f}{result['rows_per_sec']:>12.0f}"
+                  f"{result['peak_rss_mb']:>10.1f}")
+
+    commit = _git_commit()
+    if args.label and not args.output:
+        args.output = os.path.join(RESULTS_DIR, f"{args.label}.json")
+    if args.output:
+        report = {
+            "label": args.label or commit,
+            "git_commit": commit,
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "profile": args.profile,
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+            output_file.write("\n")
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
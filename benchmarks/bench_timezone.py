@@ -0,0 +1,88 @@
+"""
+Timezone Conversion Micro-benchmark
+
+Measures the per-record cost of converting UTC call timestamps to local time
+before and after the resolved-timezone / per-UTC-hour offset caches were added
+to convert_to_local_timezone.
+
+"Before" is a copy of the original implementation, which re-detected the
+setting format and re-resolved the timezone on every call.
+
+Usage:
+    python benchmarks/bench_timezone.py [--records 200000] [--timezone Australia/Sydney]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from callqueue_enrichment import TIMEZONE_OFFSETS, convert_to_local_timezone  # noqa: E402
+
+
+def legacy_convert_to_local_timezone(utc_dt, timezone_offset, logger):
+    """Original convert_to_local_timezone (resolves the timezone on every call)."""
+    if not utc_dt:
+        logger.debug("No UTC datetime provided, returning None")
+        return None
+
+    if "/" in timezone_offset:
+        logger.debug(f"Using timezone name: {timezone_offset} (auto DST)")
+        tz = pytz.timezone(timezone_offset)
+        local_dt = utc_dt.astimezone(tz)
+        logger.debug(f"Converted {utc_dt} to {timezone_offset}: {local_dt} (offset: {local_dt.strftime('%z')})")
+        return local_dt
+
+    logger.debug(f"Using legacy fixed offset: {timezone_offset}")
+    offset_str = TIMEZONE_OFFSETS.get(timezone_offset, "+00:00")
+    sign = 1 if offset_str.startswith('+') else -1
+    hours, minutes = offset_str[1:].split(':')
+    tz = pytz.FixedOffset(sign * (int(hours) * 60 + int(minutes)))
+    local_dt = utc_dt.astimezone(tz)
+    logger.debug(f"Converted to local time: {local_dt}")
+    return local_dt
+
+
+def generate_timestamps(count, start=datetime(2025, 3, 1, tzinfo=pytz.UTC)):
+    """Call start times spread over roughly two months (crosses a DST change)."""
+    return [start + timedelta(seconds=i * 23) for i in range(count)]
+
+
+def measure(func, timestamps, timezone_offset, logger):
+    """Return (seconds, results) for converting every timestamp."""
+    started = time.perf_counter()
+    results = [func(ts, timezone_offset, logger) for ts in timestamps]
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=200000)
+    parser.add_argument("--timezone", action="append",
+                        help="Timezone setting to test (repeatable, default: Australia/Sydney and UTC+10:00)")
+    args = parser.parse_args()
+
+    logger = logging.getLogger("bench_timezone")
+    logger.setLevel(logging.INFO)
+    timestamps = generate_timestamps(args.records)
+
+    print(f"{'timezone':<22}{'before us/rec':>15}{'after us/rec':>15}{'speedup':>10}")
+    for timezone_offset in args.timezone or ["Australia/Sydney", "UTC+10:00"]:
+        before, expected = measure(legacy_convert_to_local_timezone, timestamps, timezone_offset, logger)
+        after, actual = measure(convert_to_local_timezone, timestamps, timezone_offset, logger)
+        if [dt.isoformat() for dt in expected] != [dt.isoformat() for dt in actual]:
+            raise SystemExit(f"Results differ for {timezone_offset}")
+
+        per_before = before / args.records * 1e6
+        per_after = after / args.records * 1e6
+        print(f"{timezone_offset:<22}{per_before:>15.3f}{per_after:>15.3f}{per_before / per_after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+"""
+Synthetic VAAC Data Generator
+
+Generates VAAC getanalytics `dataResult` ordered arrays for the Call Queue and
+Auto Attendant dimension sets in dimension_config.py, for benchmarks and local
+load testing without access to the real API.
+
+Profiles:
+- uniform: one call every 3 seconds, values drawn uniformly (fast, simple)
+- realistic: business-hours arrival curve with quiet weekends, a few busy
+  queues and a long tail (Zipf), a typical call result mix with target types
+  that depend on the result, log-normal queue and call durations, fixed agent
+  counts per queue, and a small share of transferred and incomplete rows
+"""
+
+import bisect
+import itertools
+import json
+import math
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "package", "bin"))
+
+from dimension_config import (  # noqa: E402
+    AUTO_ATTENDANT_DIMENSIONS,
+    CALL_QUEUE_DIMENSIONS,
+    DEFAULT_MEASUREMENTS,
+)
+
+
+CALL_RESULTS = ["agent_joined_conference", "overflown", "timed_out", "disconnected", "no_agent"]
+TARGET_TYPES = ["User", "Disconnect", "MailBox", "ApplicationEndpoint", "Phone"]
+
+PROFILES = ("uniform", "realistic")
+
+# Realistic Call Queue outcome mix: (CallQueueCallResult, weight)
+REALISTIC_CALL_RESULTS = [
+    ("agent_joined_conference", 52), ("transferred_to_agent", 8), ("disconnected", 14),
+    ("timed_out", 9), ("overflown", 6), ("no_agent", 3), ("transferred_to_callback_caller", 2),
+    ("callback_call_timed_out", 1), ("failed", 1),
+]
+
+# CallQueueTargetType mix per call result: (target type, weight)
+_ANSWERED_TARGETS = [("User", 97), ("Phone", 3)]
+_REDIRECT_TARGETS = [
+    ("MailBox", 35), ("ApplicationEndpoint", 25), ("Disconnect", 20), ("Phone", 10),
+    ("User", 8), ("ConfigurationEndpoint", 2),
+]
+REALISTIC_TARGET_TYPES = {
+    "agent_joined_conference": _ANSWERED_TARGETS,
+    "transferred_to_agent": _ANSWERED_TARGETS,
+    "disconnected": [("Disconnect", 80), ("User", 20)],
+    "timed_out": _REDIRECT_TARGETS,
+    "overflown": _REDIRECT_TARGETS,
+    "no_agent": _REDIRECT_TARGETS,
+    "transferred_to_callback_caller": [("User", 100)],
+    "callback_call_timed_out": [("Disconnect", 100)],
+    "failed": [("Disconnect", 60), ("User", 40)],
+}
+
+# Realistic Auto Attendant value mixes: (value, weight)
+REALISTIC_AA_CALL_RESULTS = [
+    ("transferred_to_user", 30), ("transferred_to_receptionist", 12), ("transferred_to_operator", 8),
+    ("transferred_to_shared_voicemail", 10), ("user_terminated", 25), ("terminated_no_operator", 5),
+    ("terminated_transfer_failed", 3), ("failed_to_establish_media", 2), ("service_terminated", 5),
+]
+REALISTIC_AA_CALL_FLOWS = [
+    ("main_menu", 45), ("first_level_menu", 20), ("user_selection", 15), ("abs_search", 10),
+    ("call_transfer", 7), ("call_termination", 3),
+]
+REALISTIC_AA_TRANSFER_ACTIONS = [
+    ("hunt_group", 45), ("user", 25), ("shared_voicemail", 10), ("application", 8),
+    ("external_pstn", 7), ("orgaa", 3), ("unknown", 2),
+]
+REALISTIC_AA_SEARCH_METHODS = [
+    ("unknown", 80), ("abs_search_dtmf", 8), ("abs_search_name", 8), ("abs_search_extension", 4),
+]
+
+# Relative call arrival rate per local hour of day (business hours peak)
+HOURLY_ARRIVAL_WEIGHTS = [
+    0.03, 0.02, 0.02, 0.02, 0.03, 0.05, 0.15, 0.40, 1.00, 1.60, 1.60, 1.50,
+    1.10, 1.40, 1.40, 1.30, 1.10, 0.70, 0.30, 0.20, 0.15, 0.10, 0.06, 0.04,
+]
+
+# Relative arrival rate on Saturday and Sunday
+WEEKEND_ARRIVAL_FACTOR = 0.15
+
+# Calls per second at an hourly weight of 1.0
+PEAK_CALLS_PER_SECOND = 0.35
+
+# UTC offset of the business hours curve (Australia/Sydney standard time)
+LOCAL_UTC_OFFSET_HOURS = 10
+
+
+def _field_value(field_name, index, start_time, rng, queue_count):
+    """Return a plausible value for one VAAC field."""
+    if field_name in ("UserStartTimeUTC", "AutoAttendantChainStartTime"):
+        return start_time.strftime("%Y-%m-%dT%H:%M:%S")
+    if field_name == "EndTime":
+        return (start_time + timedelta(seconds=rng.randint(5, 900))).strftime("%Y-%m-%dT%H:%M:%S")
+    if field_name == "Date":
+        return start_time.strftime("%Y-%m-%d")
+    if field_name in ("DocumentId", "ConferenceId", "DialogId"):
+        return f"{field_name[:3].lower()}-{index:010d}"
+    if field_name == "CallQueueIdentity":
+        return f"CQQueue{rng.randrange(queue_count)}@example.com"
+    if field_name == "AutoAttendantIdentity":
+        return f"AAReception{rng.randrange(queue_count)}@example.com"
+    if field_name == "CallQueueCallResult":
+        return rng.choice(CALL_RESULTS)
+    if field_name == "CallQueueTargetType":
+        return rng.choice(TARGET_TYPES)
+    if field_name in ("HasCQ", "HasAA"):
+        return True
+    if field_name == "PSTNTotalMinutes":
+        return round(rng.uniform(0, 20), 2)
+    if field_name == "TotalCallCount":
+        return 1
+    if field_name.endswith(("Count", "Counts", "Index", "Seconds", "InSecs")):
+        return rng.randint(0, 30)
+    return f"{field_name}-{rng.randrange(8)}"
+
+
+class _WeightedChoice:
+    """Weighted random choice over (value, weight) pairs."""
+
+    def __init__(self, pairs):
+        self.values = [value for value, _ in pairs]
+        self.cum_weights = list(itertools.accumulate(weight for _, weight in pairs))
+
+    def __call__(self, rng):
+        return self.values[bisect.bisect(self.cum_weights, rng.random() * self.cum_weights[-1])]
+
+
+class _RealisticCalls:
+    """State of the realistic profile: queues, agents and the arrival clock."""
+
+    def __init__(self, rng, start, queue_count, rate_scale=1.0, agents_rng=None):
+        self.rng = rng
+        self.time = start
+        self.rate_scale = rate_scale
+        # Zipf popularity: a few busy queues and a long tail
+        self.queue = _WeightedChoice([(queue, 1.0 / (queue + 1) ** 1.1) for queue in range(queue_count)])
+        self.agents = [(agents_rng or rng).randint(2, 40) for _ in range(queue_count)]
+        self.call_result = _WeightedChoice(REALISTIC_CALL_RESULTS)
+        self.target_type = {result: _WeightedChoice(pairs) for result, pairs in REALISTIC_TARGET_TYPES.items()}
+        self.aa_call_result = _WeightedChoice(REALISTIC_AA_CALL_RESULTS)
+        self.aa_call_flow = _WeightedChoice(REALISTIC_AA_CALL_FLOWS)
+        self.aa_transfer_action = _WeightedChoice(REALISTIC_AA_TRANSFER_ACTIONS)
+        self.aa_search_method = _WeightedChoice(REALISTIC_AA_SEARCH_METHODS)
+
+    def next_start_time(self):
+        """Advance the arrival clock by an exponential gap at the current hour's rate."""
+        local = self.time + timedelta(hours=LOCAL_UTC_OFFSET_HOURS)
+        rate = PEAK_CALLS_PER_SECOND * self.rate_scale * HOURLY_ARRIVAL_WEIGHTS[local.hour]
+        if local.weekday() >= 5:
+            rate *= WEEKEND_ARRIVAL_FACTOR
+        self.time += timedelta(seconds=self.rng.expovariate(rate))
+        return self.time.replace(microsecond=0)
+
+    def values(self, index, start_time):
+        """Return the realistic values of one call, by field name."""
+        rng = self.rng
+        queue = self.queue(rng)
+        agent_count = self.agents[queue]
+        call_result = self.call_result(rng)
+        queue_seconds = min(3600, max(1, int(rng.lognormvariate(math.log(40), 1.0))))
+        talk_seconds = int(rng.lognormvariate(math.log(180), 0.8)) if call_result in (
+            "agent_joined_conference", "transferred_to_agent", "transferred_to_callback_caller") else 0
+        end_time = start_time + timedelta(seconds=queue_seconds + talk_seconds)
+        transferred = rng.random() < 0.1
+        source_queue = self.queue(rng)
+
+        values = {
+            "EndTime": end_time.strftime("%Y-%m-%dT%H:%M:%S") if rng.random() >= 0.002 else None,
+            "CallQueueIdentity": f"CQQueue{queue}@example.com",
+            "CallQueueId": f"cq-{queue:04d}",
+            "CallQueueAgentCount": agent_count,
+            "CallQueueAgentOptInCount": max(0, agent_count - rng.randint(0, 3)),
+            "CallQueueCallResult": call_result,
+            "CallQueueDurationSeconds": queue_seconds,
+            "CallQueueTargetType": self.target_type[call_result](rng),
+            "CallQueueFinalStateAction": call_result,
+            "TransferredFromCallQueueId": f"cq-{source_queue:04d}" if transferred else "",
+            "TransferredFromCallQueueIdentity": f"CQQueue{source_queue}@example.com" if transferred else "",
+            "AutoAttendantIdentity": f"AAReception{queue}@example.com",
+            "AutoAttendantId": f"aa-{queue:04d}",
+            "AutoAttendantCallResult": self.aa_call_result(rng),
+            "AutoAttendantCallFlow": self.aa_call_flow(rng),
+            "AutoAttendantTransferAction": self.aa_transfer_action(rng),
+            "AutoAttendantDirectorySearchMethod": self.aa_search_method(rng),
+            "AutoAttendantCallerActionCounts": min(12, int(rng.expovariate(0.6))),
+            "AutoAttendantChainDurationInSecs": min(600, max(1, int(rng.lognormvariate(math.log(25), 0.7)))),
+            "AutoAttendantChainIndex": 0 if rng.random() < 0.9 else rng.randint(1, 3),
+            "AutoAttendantCount": 1 if rng.random() < 0.92 else 2,
+            "PSTNTotalMinutes": round((queue_seconds + talk_seconds) / 60, 2) if rng.random() < 0.6 else 0,
+        }
+        return values
+
+
+def iter_rows(count, report_type="call_queue", start=None, seed=42, queue_count=40, profile="uniform"):
+    """
+    Generate VAAC dataResult ordered arrays one at a time.
+
+    Args:
+        count (int): Number of rows
+        report_type (str): 'call_queue' or 'auto_attendant'
+        start (datetime, optional): Start time of the first call (UTC)
+        seed (int): Random seed (same seed, same rows)
+        queue_count (int): Number of distinct queues / auto attendants
+        profile (str): 'uniform' or 'realistic' (see module docstring)
+
+    Yields:
+        list: One ordered array per call
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown profile '{profile}', expected one of {', '.join(PROFILES)}")
+    dimensions = CALL_QUEUE_DIMENSIONS if report_type == "call_queue" else AUTO_ATTENDANT_DIMENSIONS
+    field_names = dimensions + DEFAULT_MEASUREMENTS
+    rng = random.Random(seed)
+    start = start or datetime(2025, 12, 1, tzinfo=timezone.utc)
+
+    if profile == "uniform":
+        for index in range(count):
+            start_time = start + timedelta(seconds=index * 3)
+            yield [_field_value(name, index, start_time, rng, queue_count) for name in field_names]
+        return
+
+    calls = _RealisticCalls(rng, start, queue_count)
+    for index in range(count):
+        start_time = calls.next_start_time()
+        yield _realistic_row(calls, field_names, index, start_time, queue_count)
+
+
+def iter_hour_rows(hour_start, field_names, seed=42, queue_count=40, rate_scale=1.0):
+    """
+    Generate the realistic profile calls that started in one UTC hour.
+
+    Every hour is generated independently (its own random stream and
+    DocumentIds), so any time range can be assembled from hours and the same
+    arguments always give the same calls, whatever range is asked for.
+
+    Args:
+        hour_start (datetime): Start of the hour (aware UTC, whole hour)
+        field_names (list): Fields of each row, in order
+        seed (int or str): Random seed (e.g. per tenant)
+        queue_count (int): Number of distinct queues / auto attendants
+        rate_scale (float): Multiplier of the call arrival rate
+
+    Yields:
+        list: One ordered array per call, in start time order
+    """
+    hour_end = hour_start + timedelta(hours=1)
+    calls = _RealisticCalls(random.Random(f"{seed}:{hour_start.isoformat()}"), hour_start, queue_count,
+                            rate_scale, agents_rng=random.Random(f"{seed}:agents"))
+    first_index = int(hour_start.timestamp()) // 3600 * 1000000
+    for offset in itertools.count():
+        start_time = calls.next_start_time()
+        if start_time >= hour_end:
+            return
+        yield _realistic_row(calls, field_names, first_index + offset, start_time, queue_count)
+
+
+def _realistic_row(calls, field_names, index, start_time, queue_count):
+    values = calls.values(index, start_time)
+    row = []
+    for name in field_names:
+        if name in values:
+            row.append(values[name])
+        else:
+            row.append(_field_value(name, index, start_time, calls.rng, queue_count))
+    return row
+
+
+def generate_rows(count, report_type="call_queue", start=None, seed=42, queue_count=40, profile="uniform"):
+    """
+    Generate VAAC dataResult ordered arrays.
+
+    Args:
+        count (int): Number of rows
+        report_type (str): 'call_queue' or 'auto_attendant'
+        start (datetime, optional): Start time of the first call (UTC)
+        seed (int): Random seed (same seed, same rows)
+        queue_count (int): Number of distinct queues / auto attendants
+        profile (str): 'uniform' or 'realistic' (see module docstring)
+
+    Returns:
+        tuple: (rows, dimensions, measurements)
+    """
+    dimensions = CALL_QUEUE_DIMENSIONS if report_type == "call_queue" else AUTO_ATTENDANT_DIMENSIONS
+    rows = list(iter_rows(count, report_type, start, seed, queue_count, profile))
+    return rows, list(dimensions), list(DEFAULT_MEASUREMENTS)
+
+
+def generate_response_body(rows):
+    """Serialize rows as a getanalytics response body (bytes)."""
+    return json.dumps({"dataResult": rows}, separators=(",", ":")).encode("utf-8")
@@ -0,0 +1,400 @@
+"""
+Local VAAC and OAuth Stand-in Server
+
+Serves the two endpoints the add-on calls, so inputs can be load and soak
+tested on one box without the real login.microsoftonline.com and
+api.interfaces.records.teams.microsoft.com:
+
+- POST /<tenant>/oauth2/v2.0/token: password grant, returns a bearer token
+  valid for --token-lifetime seconds
+- GET /Teams.VoiceAnalytics/getanalytics?query=...: decodes the
+  URL-encoded, base64, gzip JSON query built by prepare_vaac_query, applies its
+  Filters, returns the requested Dimensions + Measurements as dataResult
+  ordered arrays, and cuts the result at LimitResultRowsCount
+- GET /stats: request, status, row and byte counters as JSON
+
+Calls are generated with the realistic synthetic_vaac profile, per tenant and
+UTC hour, so the same time range always returns the same calls whatever
+windows it is queried in. Rows are returned in a shuffled order (as the real
+API does not sort them), so truncated responses are not a time prefix.
+
+Fault injection (each applied per request):
+- --latency-ms / --jitter-ms: delay before the response
+- --error-rate / --error-codes: 429 (with Retry-After) and 5xx responses
+- --drip-bytes / --drip-interval-ms: slow-drip bodies written in small pieces
+- --disconnect-rate: connection closed half-way through the body
+
+Point the add-on at the server with the MSTEAMS_VAAC_OAUTH_AUTHORITY and
+MSTEAMS_VAAC_API_ENDPOINT environment variables of splunkd (see README).
+
+Usage:
+    python benchmarks/vaac_standin_server.py [--port 8765] [--calls-scale 1.0] [--error-rate 0.05]
+        [--error-codes 429 500 503] [--latency-ms 200] [--drip-bytes 4096 --drip-interval-ms 50]
+"""
+
+import argparse
+import base64
+import gzip
+import json
+import random
+import secrets
+import sys
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from synthetic_vaac import iter_hour_rows
+
+
+OAUTH_PATH_SUFFIX = "/oauth2/v2.0/token"
+VAAC_PATH = "/Teams.VoiceAnalytics/getanalytics"
+
+# Filter operands understood by the stand-in (the ones the add-on sends)
+OPERANDS = {
+    4: lambda value, bound: value >= bound,  # Greater than or equal
+    6: lambda value, bound: value <= bound,  # Less than or equal
+}
+
+# Longest time range one query may cover (guards against runaway generation)
+MAX_QUERY_DAYS = 31
+
+
+class QueryError(ValueError):
+    """Query the stand-in cannot answer (returned as HTTP 400)."""
+
+
+def decode_query(encoded):
+    """
+    Decode a getanalytics query parameter (inverse of prepare_vaac_query).
+
+    Args:
+        encoded (str): Value of the query parameter, URL decoded once or not
+
+    Returns:
+        dict: JSON query
+    """
+    try:
+        return json.loads(gzip.decompress(base64.b64decode(unquote(encoded))).decode("utf-8"))
+    except Exception as e:
+        raise QueryError(f"Cannot decode query: {str(e)}")
+
+
+def _filter_bound(value):
+    """Comparable form of a filter value (numbers stay numbers, the rest compares as text)."""
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else str(value)
+
+
+def query_time_range(filters):
+    """
+    Return the UTC hours a query's filters select.
+
+    Args:
+        filters (list): Filters of the query
+
+    Returns:
+        tuple: (first hour, end) aware UTC datetimes covering every selectable call
+    """
+    lower, upper = None, None
+    for item in filters:
+        name, operand, value = item.get("DataModelName"), item.get("Operand"), str(item.get("Value"))
+        if name not in ("UserStartTimeUTC", "Date"):
+            continue
+        try:
+            bound = datetime.fromisoformat(value).replace(tzinfo=timezone.utc)
+        except ValueError:
+            raise QueryError(f"Invalid {name} filter value '{value}'")
+        if operand == 4:
+            lower = bound if lower is None else max(lower, bound)
+        elif operand == 6:
+            if name == "Date":
+                bound += timedelta(days=1) - timedelta(seconds=1)
+            upper = bound if upper is None else min(upper, bound)
+
+    if lower is None or upper is None:
+        raise QueryError("Query needs lower and upper UserStartTimeUTC or Date filters")
+    if upper - lower > timedelta(days=MAX_QUERY_DAYS):
+        raise QueryError(f"Query covers more than {MAX_QUERY_DAYS} days")
+    return lower.replace(minute=0, second=0, microsecond=0), upper + timedelta(seconds=1)
+
+
+def answer_query(query, tenant, seed=42, queue_count=40, calls_scale=1.0):
+    """
+    Compute the dataResult of a query.
+
+    Args:
+        query (dict): Decoded JSON query
+        tenant (str): Tenant the calls belong to (part of the generator seed)
+        seed (int): Generator seed
+        queue_count (int): Number of queues / auto attendants per tenant
+        calls_scale (float): Multiplier of the synthetic call arrival rate
+
+    Returns:
+        tuple: (rows, truncated) rows in shuffled order, cut at LimitResultRowsCount
+    """
+    try:
+        dimensions = [item["DataModelName"] for item in query.get("Dimensions", [])]
+        measurements = [item["DataModelName"] for item in query.get("Measurements", [])]
+        filters = [(item["DataModelName"], item["Operand"], _filter_bound(item["Value"]))
+                   for item in query.get("Filters", [])]
+        limit = int(query.get("LimitResultRowsCount", 200000))
+    except (KeyError, TypeError, ValueError) as e:
+        raise QueryError(f"Malformed query: {str(e)}")
+    if not dimensions:
+        raise QueryError("Query has no Dimensions")
+    for _, operand, _ in filters:
+        if operand not in OPERANDS:
+            raise QueryError(f"Unsupported filter Operand {operand}")
+
+    output_fields = dimensions + measurements
+    # Filtered fields that are not returned are generated too, then dropped
+    field_names = output_fields + [name for name, _, _ in filters if name not in output_fields]
+    positions = {name: index for index, name in enumerate(field_names)}
+    checks = [(name, positions[name], OPERANDS[operand], bound) for name, operand, bound in filters]
+    width = len(output_fields)
+
+    hour, end = query_time_range(query.get("Filters", []))
+    rows = []
+    while hour < end:
+        for row in iter_hour_rows(hour, field_names, f"{seed}:{tenant}", queue_count, calls_scale):
+            for name, position, compare, bound in checks:
+                value = row[position]
+                try:
+                    if value is None or not compare(value, bound):
+                        break
+                except TypeError:
+                    raise QueryError(f"Filter value {bound!r} cannot be compared with {name} values")
+            else:
+                rows.append(row[:width])
+        hour += timedelta(hours=1)
+
+    random.Random(f"{seed}:{tenant}:{json.dumps(query, sort_keys=True)}").shuffle(rows)
+    truncated = len(rows) > limit
+    return rows[:limit], truncated
+
+
+class ServerStats:
+    """Thread-safe counters of the stand-in server."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.counters = {"oauth_requests": 0, "vaac_requests": 0, "rows": 0, "bytes": 0,
+                         "truncated": 0, "disconnects": 0, "in_flight": 0, "max_in_flight": 0}
+        self.status = {}
+
+    def add(self, **values):
+        with self._lock:
+            for name, value in values.items():
+                self.counters[name] += value
+            self.counters["max_in_flight"] = max(self.counters["max_in_flight"], self.counters["in_flight"])
+
+    def record_status(self, status):
+        with self._lock:
+            self.status[str(status)] = self.status.get(str(status), 0) + 1
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self.counters, status=dict(self.status), uptime_seconds=round(time.time() - self.started, 1))
+
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """Request handler, configured through the server attributes (see make_server)."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "VAACStandin/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.options.verbose:
+            super().log_message(format, *args)
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        self.server.stats.add(in_flight=1)
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            form = parse_qs(self.rfile.read(length).decode("utf-8"))
+            if not path.endswith(OAUTH_PATH_SUFFIX):
+                self._send_json(404, {"error": "not_found"})
+                return
+            self.server.stats.add(oauth_requests=1)
+            if self._inject_fault(self.server.options.oauth_error_rate):
+                return
+            if form.get("grant_type", [""])[0] != "password" or not form.get("userName") or not form.get("password"):
+                self._send_json(400, {"error": "invalid_grant", "error_description": "Password grant required"})
+                return
+            lifetime = self.server.options.token_lifetime
+            token = f"standin.{secrets.token_urlsafe(24)}"
+            # Calls are generated per tenant, the token tells which one
+            tenant = path[:-len(OAUTH_PATH_SUFFIX)].strip("/") or "common"
+            with self.server.tokens_lock:
+                self.server.tokens[token] = (time.time() + lifetime, tenant)
+            self._send_json(200, {"token_type": "Bearer", "scope": form.get("scope", [""])[0],
+                                  "expires_in": lifetime, "access_token": token})
+        finally:
+            self.server.stats.add(in_flight=-1)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self.server.stats.add(in_flight=1)
+        try:
+            if url.path == "/stats":
+                self._send_json(200, self.server.stats.snapshot())
+            elif url.path == VAAC_PATH:
+                self._get_analytics(url)
+            else:
+                self._send_json(404, {"error": "not_found"})
+        finally:
+            self.server.stats.add(in_flight=-1)
+
+    def _get_analytics(self, url):
+        options = self.server.options
+        self.server.stats.add(vaac_requests=1)
+
+        token = self.headers.get("Authorization", "").partition("Bearer ")[2]
+        with self.server.tokens_lock:
+            expires_at, tenant = self.server.tokens.get(token, (0, None))
+        if expires_at < time.time():
+            self._send_json(401, {"error": "invalid_token"})
+            return
+
+        self._delay()
+        if self._inject_fault(options.error_rate):
+            return
+
+        encoded = parse_qs(url.query).get("query", [None])[0]
+        if encoded is None:
+            self._send_json(400, {"error": "missing query"})
+            return
+        try:
+            query = decode_query(encoded)
+            rows, truncated = answer_query(query, tenant, options.seed, options.queue_count, options.calls_scale)
+        except QueryError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        body = json.dumps({"dataResult": rows}, separators=(",", ":")).encode("utf-8")
+        self.server.stats.add(rows=len(rows), truncated=int(truncated))
+        self._send_body(200, body, drip=True)
+
+    def _delay(self):
+        options = self.server.options
+        delay = options.latency_ms + (self.server.rng.uniform(0, options.jitter_ms) if options.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def _inject_fault(self, rate):
+        """Send an injected error response with probability rate, returns True if sent."""
+        if rate <= 0 or self.server.rng.random() >= rate:
+            return False
+        status = self.server.rng.choice(self.server.options.error_codes)
+        headers = {"Retry-After": str(self.server.options.retry_after)} if status == 429 else {}
+        self._send_json(status, {"error": "injected", "status": status}, headers)
+        return True
+
+    def _send_json(self, status, payload, headers=None):
+        self._send_body(status, json.dumps(payload).encode("utf-8"), headers=headers)
+
+    def _send_body(self, status, body, headers=None, drip=False):
+        options = self.server.options
+        self.server.stats.record_status(status)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+        cut = len(body)
+        if drip and options.disconnect_rate > 0 and self.server.rng.random() < options.disconnect_rate:
+            cut = len(body) // 2
+        piece = options.drip_bytes if drip and options.drip_bytes > 0 else len(body) or 1
+        try:
+            for start in range(0, cut, piece):
+                self.wfile.write(body[start:min(cut, start + piece)])
+                if piece < len(body) and options.drip_interval_ms > 0:
+                    self.wfile.flush()
+                    time.sleep(options.drip_interval_ms / 1000)
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
+            return
+        self.server.stats.add(bytes=cut)
+        if cut < len(body):
+            self.server.stats.add(disconnects=1)
+            self.close_connection = True
+
+
+def make_server(options):
+    """
+    Create the stand-in HTTP server.
+
+    Args:
+        options (argparse.Namespace): Parsed command line options
+
+    Returns:
+        ThreadingHTTPServer: Server, not started yet
+    """
+    ThreadingHTTPServer.request_queue_size = options.backlog
+    server = ThreadingHTTPServer((options.host, options.port), StandinHandler)
+    server.daemon_threads = True
+    server.options = options
+    server.stats = ServerStats()
+    server.rng = random.Random(options.fault_seed)
+    server.tokens = {}
+    server.tokens_lock = threading.Lock()
+    return server
+
+
+def _report_stats(server, interval):
+    while True:
+        time.sleep(interval)
+        print(json.dumps(server.stats.snapshot()), flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--backlog", type=int, default=128, help="Listen queue size")
+    parser.add_argument("--seed", type=int, default=42, help="Call generator seed")
+    parser.add_argument("--queue-count", type=int, default=40)
+    parser.add_argument("--calls-scale", type=float, default=1.0,
+                        help="Call arrival rate multiplier (1.0: about 20k calls per weekday)")
+    parser.add_argument("--token-lifetime", type=int, default=3599, help="expires_in of issued tokens")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Delay before each VAAC response")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Random extra delay, up to this")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of VAAC requests failed")
+    parser.add_argument("--oauth-error-rate", type=float, default=0.0, help="Share of token requests failed")
+    parser.add_argument("--error-codes", type=int, nargs="+", default=[429, 500, 503])
+    parser.add_argument("--retry-after", type=int, default=5, help="Retry-After seconds of 429 responses")
+    parser.add_argument("--drip-bytes", type=int, default=0, help="Write VAAC bodies in pieces of this size")
+    parser.add_argument("--drip-interval-ms", type=float, default=0.0, help="Pause between drip pieces")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0,
+                        help="Share of VAAC responses cut off half-way through the body")
+    parser.add_argument("--fault-seed", type=int, default=None, help="Seed of the fault injection")
+    parser.add_argument("--stats-interval", type=float, default=0.0, help="Print counters every N seconds")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    return parser.parse_args(argv)
+
+
+def main():
+    options = parse_args()
+    server = make_server(options)
+    host, port = server.server_address[:2]
+    print(f"VAAC stand-in listening on http://{host}:{port}", flush=True)
+    print(f"  MSTEAMS_VAAC_OAUTH_AUTHORITY=http://{host}:{port}", flush=True)
+    print(f"  MSTEAMS_VAAC_API_ENDPOINT=http://{host}:{port}{VAAC_PATH}", flush=True)
+    if options.stats_interval > 0:
+        threading.Thread(target=_report_stats, args=(server, options.stats_interval), daemon=True).start()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(server.stats.snapshot()), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
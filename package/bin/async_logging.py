@@ -0,0 +1,131 @@
+"""
+Asynchronous Logging and Sampled Debug Traces
+
+Per-record debug traces in the enrichment loops cost twice: every message is
+formatted, and every thread writing one waits for the log file handler's lock
+and the disk write. This module keeps DEBUG level usable on large runs:
+
+- enable_async_logging moves a logger's handlers behind a bounded queue that
+  one background thread writes to the log file. Logging calls only enqueue
+  the record; when the queue is full, records are dropped (and the number of
+  dropped records is logged when logging stops) instead of stalling the
+  ingestion pipeline.
+- trace_interval selects every Nth record for per-record debug traces. The
+  selection is by record index, so the same records are traced on every run
+  over the same data.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+from logging.handlers import QueueHandler, QueueListener
+
+
+# Records waiting for the writer thread before new records are dropped
+DEFAULT_LOG_QUEUE_SIZE = 10000
+
+# Per-record debug traces are written for one record in this many
+DEFAULT_DEBUG_SAMPLE_RATE = 100
+
+# Logger name -> (BoundedQueueHandler, QueueListener) of the loggers logging asynchronously
+_ASYNC_LOGGERS = {}
+_ASYNC_LOGGERS_LOCK = threading.Lock()
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records while its bounded queue is full.
+
+    Attributes:
+        dropped (int): Number of records dropped
+    """
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _QueueWriter(QueueListener):
+    """QueueListener that waits for room in a full queue for its stop sentinel."""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def enable_async_logging(logger, queue_size=DEFAULT_LOG_QUEUE_SIZE):
+    """
+    Write the records of a logger from a background thread.
+
+    The logger's handlers are moved to a QueueListener and replaced by a
+    BoundedQueueHandler. Calling it again for the same logger does nothing.
+
+    Args:
+        logger (logging.Logger): Logger with its handlers attached
+        queue_size (int): Records queued before new records are dropped
+
+    Returns:
+        BoundedQueueHandler: Handler of the logger, or None if the logger has no handlers
+    """
+    with _ASYNC_LOGGERS_LOCK:
+        if logger.name in _ASYNC_LOGGERS:
+            return _ASYNC_LOGGERS[logger.name][0]
+        handlers = list(logger.handlers)
+        if not handlers:
+            return None
+
+        log_queue = queue.Queue(max(1, int(queue_size)))
+        handler = BoundedQueueHandler(log_queue)
+        listener = _QueueWriter(log_queue, *handlers, respect_handler_level=True)
+        for file_handler in handlers:
+            logger.removeHandler(file_handler)
+        logger.addHandler(handler)
+        listener.start()
+        _ASYNC_LOGGERS[logger.name] = (handler, listener)
+        return handler
+
+
+def stop_async_logging():
+    """
+    Write the queued records and give every asynchronous logger its handlers back.
+
+    Registered to run at exit, so records queued at the end of a run are not lost.
+    """
+    with _ASYNC_LOGGERS_LOCK:
+        for name, (handler, listener) in _ASYNC_LOGGERS.items():
+            listener.stop()
+            logger = logging.getLogger(name)
+            logger.removeHandler(handler)
+            for file_handler in listener.handlers:
+                logger.addHandler(file_handler)
+            if handler.dropped:
+                logger.warning(f"Dropped {handler.dropped} log records while the log queue was full")
+        _ASYNC_LOGGERS.clear()
+
+
+atexit.register(stop_async_logging)
+
+
+def trace_interval(logger, sample_rate=DEFAULT_DEBUG_SAMPLE_RATE):
+    """
+    Return N for per-record debug traces of every Nth record, 0 if DEBUG is off.
+
+    Check `trace_every and idx % trace_every == 0` per record, so disabled
+    traces cost neither formatting nor a logger call.
+
+    Args:
+        logger (logging.Logger): Logger of the traces
+        sample_rate (int): Trace one record in this many (1 traces every record)
+
+    Returns:
+        int: Trace interval, 0 if the logger does not log DEBUG records
+    """
+    if not logger.isEnabledFor(logging.DEBUG):
+        return 0
+    return max(1, int(sample_rate))
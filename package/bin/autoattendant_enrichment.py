@@ -33,6 +33,9 @@ ENRICHED FIELDS (calculated by this module):
 - LanguageCode: Language code (e.g., "en-AU")
 - (Additional enrichments can be added as needed)
 
+Each column is declared once in AUTOATTENDANT_SPEC; every engine uses the
+enrichment functions compiled from it (see field_mapping).
+
 Note: This is a basic implementation. Additional enrichment logic from PowerQuery
 can be added here as requirements evolve.
 
@@ -42,6 +45,13 @@ Source: Based on callqueue_enrichment.py structure
 from datetime import datetime
 import pytz
 import logging
+from itertools import chain, islice
+
+from field_mapping import (
+    DEFAULT_BATCH_SIZE, DEFAULT_PROCESS_CHUNK_SIZE, Derived, Field, FieldSpec, Option, compile_enricher,
+    enrich_columns, enrich_process_pool, fixed, iter_enrich_columns
+)
+from run_metrics import RunMetrics
 
 
 # ============================================================================
@@ -100,11 +110,80 @@ def parse_timestamp_to_utc(timestamp_str):
         return None
 
 
+# ============================================================================
+# FIELD MAPPING (every output column declared once, see field_mapping)
+# ============================================================================
+
+def _chain_start_time(raw_value):
+    """AutoAttendantChainStartTime -> (AAChainStartTimeUTC, parsed or empty)."""
+    if not raw_value:
+        return ('', True)
+    chain_start_utc = parse_timestamp_to_utc(raw_value)
+    if chain_start_utc is None:
+        # Unparsable: the raw value is kept
+        return (raw_value, False)
+    return (chain_start_utc.isoformat(), True)
+
+
+# Output columns of every Auto Attendant engine, in output order
+AUTOATTENDANT_SPEC = FieldSpec(
+    name="Auto Attendant",
+    options=(
+        ('language_code', 'en-AU'),
+    ),
+    derived=(
+        Derived('ra_name', (('AutoAttendantIdentity', ''),), fixed(extract_aa_ra_name)),
+        Derived('chain_start', (('AutoAttendantChainStartTime', ''),), fixed(_chain_start_time)),
+    ),
+    fields=(
+        # Raw fields with "raw" prefix
+        Field('AutoAttendant[rawAutoAttendantIdentity]', 'AutoAttendantIdentity', ''),
+        Field('AutoAttendant[rawAutoAttendantCallFlow]', 'AutoAttendantCallFlow', ''),
+        Field('AutoAttendant[rawAutoAttendantCallResult]', 'AutoAttendantCallResult', ''),
+        Field('AutoAttendant[rawAutoAttendantCallerActionCounts]', 'AutoAttendantCallerActionCounts', 0),
+        Field('AutoAttendant[rawAutoAttendantChainDurationInSecs]', 'AutoAttendantChainDurationInSecs', 0),
+        Field('AutoAttendant[rawAutoAttendantChainIndex]', 'AutoAttendantChainIndex', 0),
+        Field('AutoAttendant[rawAutoAttendantChainStartTime]', 'AutoAttendantChainStartTime', ''),
+        Field('AutoAttendant[rawAutoAttendantCount]', 'AutoAttendantCount', 0),
+        Field('AutoAttendant[rawAutoAttendantDirectorySearchMethod]', 'AutoAttendantDirectorySearchMethod', ''),
+        Field('AutoAttendant[rawAutoAttendantId]', 'AutoAttendantId', ''),
+        Field('AutoAttendant[rawAutoAttendantTransferAction]', 'AutoAttendantTransferAction', ''),
+        Field('AutoAttendant[rawHasAA]', 'HasAA', ''),
+        Field('AutoAttendant[rawTotalCallCount]', 'TotalCallCount', 1),
+        Field('AutoAttendant[rawPSTNTotalMinutes]', 'PSTNTotalMinutes', 0),
+        # Pass-through identifiers (read with the API response casing)
+        Field('AutoAttendant[DocumentID]', 'DocumentId', ''),
+        Field('AutoAttendant[ConferenceID]', 'ConferenceId', ''),
+        Field('AutoAttendant[DialogID]', 'DialogId', ''),
+        # AA names (no display name lookup)
+        Field('AutoAttendant[AARAName]', 'ra_name'),
+        Field('AutoAttendant[AASlicer]', 'ra_name'),
+        Field('AutoAttendant[AAName]', None, ''),
+        # Copied/renamed fields
+        Field('AutoAttendant[AAGUID]', 'AutoAttendantId', ''),
+        Field('AutoAttendant[AACallCount]', 'TotalCallCount', 1),
+        Field('AutoAttendant[AAChainDurationSeconds]', 'AutoAttendantChainDurationInSecs', 0),
+        Field('AutoAttendant[AACallFlow]', 'AutoAttendantCallFlow', ''),
+        Field('AutoAttendant[AACallResult]', 'AutoAttendantCallResult', ''),
+        Field('AutoAttendant[AATransferAction]', 'AutoAttendantTransferAction', ''),
+        Field('AutoAttendant[PSTNTotalMinutes]', 'PSTNTotalMinutes', 0),
+        Field('AutoAttendant[LanguageCode]', Option('language_code')),
+        # Chain start time
+        Field('AutoAttendant[AAChainStartTimeUTC]', 'chain_start', item=0),
+    ),
+    # Records with an unparsable AutoAttendantChainStartTime
+    parse_failure=('chain_start', 1),
+)
+
+# Output columns in the order produced by every Auto Attendant engine
+AUTOATTENDANT_OUTPUT_KEYS = AUTOATTENDANT_SPEC.keys
+
+
 # ============================================================================
 # MAIN ENRICHMENT ORCHESTRATOR
 # ============================================================================
 
-def enrich_autoattendant_data(raw_data_list, config=None, logger=None):
+def enrich_autoattendant_data(raw_data, config=None, logger=None, metrics=None, on_drop=None):
     """
     Enrich raw VAAC API Auto Attendant data with calculated fields.
 
@@ -112,15 +191,31 @@ def enrich_autoattendant_data(raw_data_list, config=None, logger=None):
     essential derived fields. Additional enrichment logic can be added
     as requirements evolve.
 
+    Records are pulled from raw_data in fixed-size batches and enriched records
+    are yielded as each batch completes, so a streamed VAAC response can be
+    enriched and written while it is still downloading. With the process
+    engine, chunks of records are enriched in worker processes like Call
+    Queue records (see callqueue_enrichment.enrich_callqueue_data).
+
     Args:
-        raw_data_list (list): List of raw data dictionaries from VAAC API
+        raw_data (iterable): Raw data dictionaries from VAAC API (list or iterator)
         config (dict): Configuration dictionary with keys:
             - timezone_offset: str (default "UTC")
             - language_code: str (default "en-AU")
+            - parallel_workers: int (default 1), worker processes of the process engine
+            - enrichment_engine: str (default "row"), "process" enables the process pool
+            - process_chunk_size: int (default DEFAULT_PROCESS_CHUNK_SIZE)
+            - batch_size: int (default DEFAULT_BATCH_SIZE)
+            - debug_sample_rate: int (default DEFAULT_DEBUG_SAMPLE_RATE), per-record
+              debug traces are logged for one record in this many
         logger (logging.Logger, optional): Logger instance
+        metrics (RunMetrics, optional): Run metrics receiving the enrichment
+            and timestamp parse failure counts
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
 
-    Returns:
-        list: List of enriched data dictionaries with AutoAttendant[field] structure
+    Yields:
+        dict: Enriched data dictionaries with AutoAttendant[field] structure, in input order
     """
     if logger is None:
         logger = logging.getLogger(__name__)
@@ -128,93 +223,90 @@ def enrich_autoattendant_data(raw_data_list, config=None, logger=None):
     if config is None:
         config = {}
 
-    # Default configuration
-    language_code = config.get('language_code', 'en-AU')
-
-    logger.info(f"Starting Auto Attendant enrichment for {len(raw_data_list)} records")
-    logger.debug(f"Enrichment config: language={language_code}")
-
-    enriched_data = []
-    failed_count = 0
-
-    for idx, raw_record in enumerate(raw_data_list):
-        try:
-            enriched = {}
-
-            if idx == 0:
-                logger.debug(f"Sample raw AA record (first): {raw_record}")
-
-            # ====================================================================
-            # STEP 1: Preserve raw fields with "raw" prefix
-            # ====================================================================
-            logger.debug(f"Step 1/4: Preserving raw AA fields for record {idx + 1}/{len(raw_data_list)}")
-            enriched['AutoAttendant[rawAutoAttendantIdentity]'] = raw_record.get('AutoAttendantIdentity', '')
-            enriched['AutoAttendant[rawAutoAttendantCallFlow]'] = raw_record.get('AutoAttendantCallFlow', '')
-            enriched['AutoAttendant[rawAutoAttendantCallResult]'] = raw_record.get('AutoAttendantCallResult', '')
-            enriched['AutoAttendant[rawAutoAttendantCallerActionCounts]'] = raw_record.get('AutoAttendantCallerActionCounts', 0)
-            enriched['AutoAttendant[rawAutoAttendantChainDurationInSecs]'] = raw_record.get('AutoAttendantChainDurationInSecs', 0)
-            enriched['AutoAttendant[rawAutoAttendantChainIndex]'] = raw_record.get('AutoAttendantChainIndex', 0)
-            enriched['AutoAttendant[rawAutoAttendantChainStartTime]'] = raw_record.get('AutoAttendantChainStartTime', '')
-            enriched['AutoAttendant[rawAutoAttendantCount]'] = raw_record.get('AutoAttendantCount', 0)
-            enriched['AutoAttendant[rawAutoAttendantDirectorySearchMethod]'] = raw_record.get('AutoAttendantDirectorySearchMethod', '')
-            enriched['AutoAttendant[rawAutoAttendantId]'] = raw_record.get('AutoAttendantId', '')
-            enriched['AutoAttendant[rawAutoAttendantTransferAction]'] = raw_record.get('AutoAttendantTransferAction', '')
-            enriched['AutoAttendant[rawHasAA]'] = raw_record.get('HasAA', '')
-            enriched['AutoAttendant[rawTotalCallCount]'] = raw_record.get('TotalCallCount', 1)
-            enriched['AutoAttendant[rawPSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
-
-            # Pass-through identifiers if they exist
-            enriched['AutoAttendant[DocumentID]'] = raw_record.get('DocumentID', '')
-            enriched['AutoAttendant[ConferenceID]'] = raw_record.get('ConferenceID', '')
-            enriched['AutoAttendant[DialogID]'] = raw_record.get('DialogID', '')
-
-            # ====================================================================
-            # STEP 2: Extract AA names
-            # ====================================================================
-            logger.debug(f"Step 2/4: Extracting AA names for record {idx + 1}")
-            aa_identity = raw_record.get('AutoAttendantIdentity', '')
-            ra_name = extract_aa_ra_name(aa_identity)
-            enriched['AutoAttendant[AARAName]'] = ra_name
-            enriched['AutoAttendant[AASlicer]'] = ra_name  # Simple mode: use RA name
-            enriched['AutoAttendant[AAName]'] = ''  # No lookup in simple mode
-            logger.debug(f"AA names: Identity={aa_identity}, RAName={ra_name}")
-
-            # ====================================================================
-            # STEP 3: Copy/rename other fields
-            # ====================================================================
-            logger.debug(f"Step 3/4: Copying/renaming AA fields for record {idx + 1}")
-            enriched['AutoAttendant[AAGUID]'] = raw_record.get('AutoAttendantId', '')
-            enriched['AutoAttendant[AACallCount]'] = raw_record.get('TotalCallCount', 1)
-            enriched['AutoAttendant[AAChainDurationSeconds]'] = raw_record.get('AutoAttendantChainDurationInSecs', 0)
-            enriched['AutoAttendant[AACallFlow]'] = raw_record.get('AutoAttendantCallFlow', '')
-            enriched['AutoAttendant[AACallResult]'] = raw_record.get('AutoAttendantCallResult', '')
-            enriched['AutoAttendant[AATransferAction]'] = raw_record.get('AutoAttendantTransferAction', '')
-            enriched['AutoAttendant[PSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
-            enriched['AutoAttendant[LanguageCode]'] = language_code
-
-            # ====================================================================
-            # STEP 4: Parse chain start time if needed
-            # ====================================================================
-            logger.debug(f"Step 4/4: Parsing AA chain start time for record {idx + 1}")
-            chain_start_time = raw_record.get('AutoAttendantChainStartTime', '')
-            if chain_start_time:
-                chain_start_utc = parse_timestamp_to_utc(chain_start_time)
-                enriched['AutoAttendant[AAChainStartTimeUTC]'] = chain_start_utc.isoformat() if chain_start_utc else chain_start_time
-                logger.debug(f"Chain start time: {chain_start_time} → {chain_start_utc}")
-            else:
-                enriched['AutoAttendant[AAChainStartTimeUTC]'] = ''
-                logger.debug("No chain start time in record")
-
-            enriched_data.append(enriched)
-
-            if (idx + 1) % 100 == 0:
-                logger.info(f"Progress: Enriched {idx + 1}/{len(raw_data_list)} AA records")
-
-        except Exception as e:
-            failed_count += 1
-            logger.error(f"Failed to enrich AA record {idx + 1}/{len(raw_data_list)}: {str(e)}", exc_info=True)
-            logger.debug(f"Failed AA record data: {raw_record}")
-            # Continue processing remaining records
+    logger.info("Starting Auto Attendant enrichment")
+    logger.debug(f"Enrichment config: language={config.get('language_code', 'en-AU')}")
+
+    records = iter(raw_data)
+    parallel_workers = config.get('parallel_workers', 1)
+
+    if config.get('enrichment_engine') == 'process' and parallel_workers > 1:
+        chunk_size = max(1, int(config.get('process_chunk_size', DEFAULT_PROCESS_CHUNK_SIZE)))
+        first_chunk = list(islice(records, chunk_size))
+        if len(first_chunk) == chunk_size:
+            logger.info(f"Using process pool with {parallel_workers} workers and chunks of {chunk_size} AA records")
+            yield from enrich_process_pool(
+                AUTOATTENDANT_SPEC, _enrich_autoattendant_chunk, chain(first_chunk, records), config, logger,
+                parallel_workers, chunk_size, metrics, on_drop=on_drop
+            )
+            return
+        # Whole input fits in one chunk, not worth starting worker processes
+        records = iter(first_chunk)
+
+    # Enrichment holds the GIL, so the row engine enriches its batches in the calling thread
+    batch_size = max(1, int(config.get('batch_size', DEFAULT_BATCH_SIZE)))
+    total = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        yield from _enrich_autoattendant_data_sequential(batch, config, logger, metrics, total, on_drop)
+        total += len(batch)
+        logger.info(f"Progress: Enriched batches totalling {total} AA records")
+
+
+def _enrich_autoattendant_chunk(task):
+    """
+    Enrich one contiguous chunk of Auto Attendant records (chunk worker of
+    field_mapping.enrich_process_pool, run in a worker process).
+
+    Args:
+        task (tuple): (chunk_index, raw_records, config)
+
+    Returns:
+        tuple: (chunk_index, enriched_records, positions of the dropped records in the chunk, metric counts)
+    """
+    chunk_index, raw_records, config = task
+    metrics = RunMetrics()
+    dropped = []
+    # Worker processes have no add-on log handler; only warnings and errors surface
+    enriched = _enrich_autoattendant_data_sequential(raw_records, config, logging.getLogger(f"{__name__}.worker"),
+                                                     metrics, on_drop=dropped.append)
+    return (chunk_index, enriched, dropped, metrics.counts)
+
+
+def _enrich_autoattendant_data_sequential(raw_data_list, config, logger, metrics=None, first_index=0,
+                                          on_drop=None):
+    """
+    Enrich a batch of Auto Attendant records in the calling thread.
+
+    Records are enriched by the function compiled from AUTOATTENDANT_SPEC for
+    this config (see field_mapping.compile_enricher).
+
+    Args:
+        raw_data_list (list): List of raw data dictionaries
+        config (dict): Enrichment configuration
+        logger (logging.Logger): Logger instance
+        metrics (RunMetrics, optional): Run metrics receiving the failure counts
+        first_index (int): Position of the first record in the whole input
+            (record numbers in log messages, debug trace sampling)
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
+
+    Returns:
+        list: List of enriched data dictionaries
+    """
+    def log_failure(idx, raw_record, e):
+        logger.error(f"Failed to enrich AA record {idx + 1}: {str(e)}", exc_info=e)
+        logger.debug(f"Failed AA record data: {raw_record}")
+        if on_drop is not None:
+            on_drop(idx)
+
+    enricher = compile_enricher(AUTOATTENDANT_SPEC, config, logger)
+    enriched_data, failed_count, timestamp_parse_fail = enricher.rows(raw_data_list, first_index, log_failure)
+
+    if metrics is not None:
+        metrics.count("timestamp_parse_failures", timestamp_parse_fail)
+        metrics.count("enrichment_failures", failed_count)
 
     # Final summary
     logger.info(f"AA enrichment complete: {len(enriched_data)} successful, {failed_count} failed")
@@ -222,3 +314,77 @@ def enrich_autoattendant_data(raw_data_list, config=None, logger=None):
         logger.debug(f"Sample enriched AA record (first): {enriched_data[0]}")
 
     return enriched_data
+
+
+# ============================================================================
+# COLUMNAR ENRICHMENT (works directly on VAAC ordered arrays)
+# ============================================================================
+
+def enrich_autoattendant_columns(data_result, dimensions, measurements, config=None, logger=None, metrics=None,
+                                 first_index=0, on_drop=None):
+    """
+    Enrich VAAC Auto Attendant ordered arrays using whole-column operations.
+
+    Same engine as callqueue_enrichment.enrich_callqueue_columns: each source
+    field is extracted once as a column, the resource account name and the
+    chain start time are computed once per distinct value and the enriched
+    dictionaries are assembled in a single pass.
+
+    The output is identical to _enrich_autoattendant_data_sequential applied to
+    transform_ordered_arrays_to_dicts(data_result, dimensions, measurements).
+
+    Args:
+        data_result (list): VAAC dataResult ordered arrays
+        dimensions (list): Dimension names (ordered as in API query)
+        measurements (list): Measurement names (ordered as in API query)
+        config (dict): Enrichment configuration (same keys as enrich_autoattendant_data)
+        logger (logging.Logger, optional): Logger instance
+        metrics (RunMetrics, optional): Run metrics receiving the failure counts
+        first_index (int): Position of the first row in the whole input
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
+
+    Returns:
+        list: List of enriched data dictionaries with AutoAttendant[field] structure
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    if config is None:
+        config = {}
+
+    return enrich_columns(AUTOATTENDANT_SPEC, data_result, dimensions, measurements, config, logger, metrics,
+                          first_index, on_drop)
+
+
+def iter_enrich_autoattendant_columns(data_rows, dimensions, measurements, config=None, logger=None, metrics=None,
+                                      on_drop=None):
+    """
+    Enrich an iterable of VAAC Auto Attendant ordered arrays with the columnar engine.
+
+    Rows are pulled in batches of config['batch_size'] (default DEFAULT_BATCH_SIZE)
+    and each batch is enriched like enrich_autoattendant_columns (see
+    field_mapping.iter_enrich_columns), so a streamed response never has to be
+    held in memory as a whole.
+
+    Args:
+        data_rows (iterable): VAAC dataResult ordered arrays (list or iterator)
+        dimensions (list): Dimension names (ordered as in API query)
+        measurements (list): Measurement names (ordered as in API query)
+        config (dict): Enrichment configuration (same keys as enrich_autoattendant_data)
+        logger (logging.Logger, optional): Logger instance
+        metrics (RunMetrics, optional): Run metrics receiving the failure counts
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
+
+    Yields:
+        dict: Enriched data dictionaries with AutoAttendant[field] structure, in input order
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    if config is None:
+        config = {}
+
+    return iter_enrich_columns(AUTOATTENDANT_SPEC, data_rows, dimensions, measurements, config, logger, metrics,
+                               on_drop=on_drop)
@@ -0,0 +1,226 @@
+"""
+Historical Backfill
+
+Walks a date range day by day for inputs in backfill mode, so months of
+history are collected as many small, resumable units instead of one huge
+first-run lookback.
+
+- backfill_days: the UTC days of the configured range
+- Per-day records in the splunk_msteams_checkpoints KV collection (key
+  "<input>_backfill_<YYYY-MM-DD>"): completed days are skipped, and a day
+  interrupted part-way resumes after its last fully written query window
+- RateLimiter: caps the VAAC requests per minute shared by all days that are
+  collected concurrently
+"""
+
+import logging
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+
+# Default number of days collected at the same time
+DEFAULT_BACKFILL_CONCURRENT_DAYS = 2
+
+# Default cap of VAAC requests per minute across all concurrently collected days
+DEFAULT_BACKFILL_REQUESTS_PER_MINUTE = 30
+
+# Status of a fully collected day
+BACKFILL_DAY_COMPLETE = "complete"
+
+# Status of a day whose events are written up to its last_datetime
+BACKFILL_DAY_PARTIAL = "partial"
+
+
+BackfillDay = namedtuple('BackfillDay', ['day', 'resume_from', 'processed_records'])
+BackfillDay.__doc__ = """Day still to collect, resumed from resume_from (None: start of the day)."""
+
+
+def parse_backfill_date(value):
+    """
+    Parse a backfill range date.
+
+    Args:
+        value (str): Date as YYYY-MM-DD
+
+    Returns:
+        date: Parsed date
+
+    Raises:
+        ValueError: If the value is not a YYYY-MM-DD date
+    """
+    try:
+        return datetime.strptime(str(value).strip(), "%Y-%m-%d").date()
+    except ValueError:
+        raise ValueError(f"Invalid backfill date '{value}', expected YYYY-MM-DD")
+
+
+def backfill_days(start_date, end_date=None):
+    """
+    List the UTC days of a backfill range.
+
+    Args:
+        start_date (str or date): First day (inclusive)
+        end_date (str or date, optional): Last day (inclusive), defaults to
+            yesterday (UTC) since the current day is not complete yet
+
+    Returns:
+        list: date objects in order (empty if start_date is after end_date)
+    """
+    if not isinstance(start_date, date):
+        start_date = parse_backfill_date(start_date)
+    if end_date in (None, ""):
+        end_date = datetime.now(timezone.utc).date() - timedelta(days=1)
+    elif not isinstance(end_date, date):
+        end_date = parse_backfill_date(end_date)
+
+    return [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+
+
+def day_range(day):
+    """
+    Return the UTC time range [start, end) of a day.
+
+    Args:
+        day (date): Day
+
+    Returns:
+        tuple: (start, end) aware UTC datetimes
+    """
+    start = datetime.combine(day, datetime.min.time(), timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def backfill_checkpoint_key(input_name, day):
+    """
+    KV checkpoint key of one backfill day.
+
+    Args:
+        input_name (str): Normalized input name
+        day (date): Day
+
+    Returns:
+        str: Checkpoint key
+    """
+    return f"{input_name}_backfill_{day.isoformat()}"
+
+
+def pending_backfill_days(checkpoint_helper, input_name, days, logger=None):
+    """
+    Filter out the days that already have a completion record.
+
+    Args:
+        checkpoint_helper: KVStoreCheckpointer of the input
+        input_name (str): Normalized input name
+        days (list): Days of the backfill range
+        logger (logging.Logger, optional): Logger instance
+
+    Returns:
+        list: BackfillDay tuples of the days still to collect, in order
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    pending = []
+    for day in days:
+        try:
+            record = checkpoint_helper.get(backfill_checkpoint_key(input_name, day))
+        except Exception as e:
+            logger.warning(f"Failed to read backfill checkpoint of {day.isoformat()}, collecting it again: {str(e)}")
+            record = None
+        if not record:
+            pending.append(BackfillDay(day, None, 0))
+        elif record.get("status") == BACKFILL_DAY_PARTIAL:
+            resume_from = _parse_resume_point(record, day)
+            records = int(record.get("processed_records", 0)) if resume_from is not None else 0
+            pending.append(BackfillDay(day, resume_from, records))
+        elif record.get("status") != BACKFILL_DAY_COMPLETE:
+            pending.append(BackfillDay(day, None, 0))
+    return pending
+
+
+def _parse_resume_point(record, day):
+    """Return the aware last_datetime of a partial day record, None if unusable."""
+    try:
+        resume_from = datetime.fromisoformat(record["last_datetime"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    if resume_from.tzinfo is None:
+        resume_from = resume_from.replace(tzinfo=timezone.utc)
+    start, end = day_range(day)
+    return resume_from if start < resume_from < end else None
+
+
+def mark_day_progress(checkpoint_helper, input_name, day, last_datetime, records, report_type):
+    """
+    Store the progress of a day whose events are written up to last_datetime.
+
+    Args:
+        checkpoint_helper: KVStoreCheckpointer of the input
+        input_name (str): Normalized input name
+        day (date): Day being collected
+        last_datetime (datetime): End of the last fully written query window
+        records (int): Events written for the day so far
+        report_type (str): Report type of the input
+    """
+    checkpoint_helper.update(backfill_checkpoint_key(input_name, day), {
+        "status": BACKFILL_DAY_PARTIAL,
+        "day": day.isoformat(),
+        "last_datetime": last_datetime.isoformat(),
+        "processed_records": records,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "report_type": report_type
+    })
+
+
+def mark_day_complete(checkpoint_helper, input_name, day, records, windows, report_type):
+    """
+    Store the completion record of a backfill day.
+
+    Args:
+        checkpoint_helper: KVStoreCheckpointer of the input
+        input_name (str): Normalized input name
+        day (date): Collected day
+        records (int): Events written for the day
+        windows (int): Query windows of the day
+        report_type (str): Report type of the input
+    """
+    checkpoint_helper.update(backfill_checkpoint_key(input_name, day), {
+        "status": BACKFILL_DAY_COMPLETE,
+        "day": day.isoformat(),
+        "processed_records": records,
+        "windows": windows,
+        "updated_at": datetime.now(timezone.utc).isoformat(),
+        "report_type": report_type
+    })
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter spacing calls evenly at a maximum rate.
+
+    Args:
+        requests_per_minute (int): Maximum number of acquire() calls per minute
+    """
+
+    def __init__(self, requests_per_minute=DEFAULT_BACKFILL_REQUESTS_PER_MINUTE):
+        self.interval = 60.0 / max(1, int(requests_per_minute))
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        """
+        Block until the next request slot.
+
+        Returns:
+            float: Seconds waited
+        """
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
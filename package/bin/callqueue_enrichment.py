@@ -31,11 +31,11 @@ ENRICHED FIELDS (calculated by this module):
 - Date: Hourly timestamp (YYYY-MM-DDTHH:00:00)
 - DateTimeCQName: Composite key (formatted date + queue name)
 - CQConnectivityTypeCode: Numeric code (8600-8620)
-- CQConnectivityTypeString: Human-readable connectivity type
+- CQConnectivityTypeString: Human-readable connectivity type (in the LanguageCode language)
 - CQCallResultLegendCode: High-level result category (4001-4005, 4999)
-- CQCallResultLegendString: Human-readable result category
+- CQCallResultLegendString: Human-readable result category (in the LanguageCode language)
 - CQTargetTypeLegendCode: Detailed disposition code (4010-4034)
-- CQTargetTypeLegendString: Human-readable detailed disposition
+- CQTargetTypeLegendString: Human-readable detailed disposition (in the LanguageCode language)
 - CQCallCountAbandoned: 1 if abandoned, 0 otherwise
 - CQHour: Hour of day (0-23)
 - CQRAName: Queue resource account name (before @)
@@ -49,8 +49,11 @@ ENRICHED FIELDS (calculated by this module):
 - CQCallResultRaw: Raw result
 - CQConnectivityTypeRaw: Raw connectivity type
 - PSTNTotalMinutes: PSTN minutes
-- ConferenceID, DialogID, DocumentID: Pass-through identifiers
-- LanguageCode: Language code (e.g., "en-AU")
+- DocumentId, ConferenceId, DialogId: Pass-through identifiers (API response casing)
+- LanguageCode: Language code (e.g., "en-AU"), selects the legend strings (see legend_strings)
+
+Each column is declared once in CALLQUEUE_SPEC; every engine uses the
+enrichment functions compiled from it per config (see field_mapping).
 
 Source: PowerQuery M code from powerquery.txt
 """
@@ -58,12 +61,22 @@ Source: PowerQuery M code from powerquery.txt
 from datetime import datetime, timedelta
 import pytz
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import namedtuple
+from itertools import chain, islice
 import os
 
+from field_mapping import (
+    DEFAULT_BATCH_SIZE, DEFAULT_PROCESS_CHUNK_SIZE, Derived, Field, FieldSpec, Option, compile_enricher,
+    enrich_columns, enrich_process_pool, fixed, iter_enrich_columns
+)
+from legend_strings import (
+    CALL_RESULT_LEGEND_STRINGS, DEFAULT_LANGUAGE, TARGET_TYPE_LEGEND_STRINGS, UNKNOWN_STRING, get_legend_pack
+)
+from run_metrics import RunMetrics
+
 
 # ============================================================================
-# LOOKUP TABLES - HARDCODED (English only)
+# LOOKUP TABLES - HARDCODED
 # ============================================================================
 
 # Connectivity Type Codes
@@ -77,52 +90,8 @@ CONNECTIVITY_TYPE_CODES = {
     None: 8620  # None/Unknown
 }
 
-# Connectivity Type Strings (English)
-CONNECTIVITY_TYPE_STRINGS = {
-    8600: "Calling Plan",
-    8601: "Direct Routing",
-    8602: "Operator Connect",
-    8610: "ACS Call",
-    8620: "Unknown"
-}
-
-# Call Result Legend Codes (High-level categories)
-# Source: PowerQuery lines 476-497
-# Maps (CallResult, TargetType) -> LegendCode
-CALL_RESULT_LEGEND_STRINGS = {
-    4001: "Agent Answered",
-    4002: "Overflowed",
-    4003: "Timed Out",
-    4004: "No Agents",
-    4005: "Other",
-    4999: "Not Authorized"
-}
-
-# Target Type Legend Codes (Detailed disposition)
-# Source: PowerQuery lines 499-550
-TARGET_TYPE_LEGEND_STRINGS = {
-    0: "Not Authorized",
-    4005: "Other",
-    4010: "Agent Answered (Call)",
-    4011: "Agent Answered (Callback)",
-    4012: "Abandoned",
-    4013: "Overflowed (Application)",
-    4014: "Overflowed (Voicemail)",
-    4015: "Overflowed (Disconnect)",
-    4016: "Overflowed (External)",
-    4017: "Overflowed (User)",
-    4020: "Timed Out (Application)",
-    4021: "Timed Out (Voicemail)",
-    4022: "Timed Out (Disconnect)",
-    4023: "Timed Out (External)",
-    4024: "Timed Out (User)",
-    4025: "Timed Out (Callback)",
-    4030: "No Agents (Application)",
-    4031: "No Agents (Voicemail)",
-    4032: "No Agents (Disconnect)",
-    4033: "No Agents (External)",
-    4034: "No Agents (User)"
-}
+# Legend and connectivity type strings: English built in, other languages
+# loaded on first use (see legend_strings)
 
 # Timezone offset mapping
 # Supports UTC-12:00 through UTC+14:00 including half-hour and 45-minute zones
@@ -196,7 +165,7 @@ def get_corrected_target_type(call_result, target_type):
         return target_type if target_type else ""
 
 
-def parse_timestamp_to_utc(timestamp_str, logger=None):
+def parse_timestamp_to_utc(timestamp_str, logger=None, trace=True):
     """
     Parse timestamp string to UTC datetime.
 
@@ -205,29 +174,36 @@ def parse_timestamp_to_utc(timestamp_str, logger=None):
     Args:
         timestamp_str (str): Timestamp string from VAAC API
         logger (logging.Logger, optional): Logger instance
+        trace (bool): Log debug traces of the parsing (False for records not
+            selected by the debug sampling)
 
     Returns:
         datetime: Parsed datetime in UTC timezone
     """
     if logger is None:
         logger = logging.getLogger(__name__)
+    trace = trace and logger.isEnabledFor(logging.DEBUG)
 
     if not timestamp_str:
-        logger.debug("Empty timestamp string provided, returning None")
+        if trace:
+            logger.debug("Empty timestamp string provided, returning None")
         return None
 
     try:
         # Try parsing with or without 'Z' suffix
         if timestamp_str.endswith('Z'):
             dt = datetime.fromisoformat(timestamp_str.replace('Z', '+00:00'))
-            logger.debug(f"Parsed timestamp with 'Z' suffix: {timestamp_str} → {dt}")
+            if trace:
+                logger.debug(f"Parsed timestamp with 'Z' suffix: {timestamp_str} → {dt}")
         elif '+' in timestamp_str or timestamp_str.count('-') > 2:
             dt = datetime.fromisoformat(timestamp_str)
-            logger.debug(f"Parsed timestamp with timezone: {timestamp_str} → {dt}")
+            if trace:
+                logger.debug(f"Parsed timestamp with timezone: {timestamp_str} → {dt}")
         else:
             # Assume UTC if no timezone info
             dt = datetime.fromisoformat(timestamp_str).replace(tzinfo=pytz.UTC)
-            logger.debug(f"Parsed timestamp assuming UTC: {timestamp_str} → {dt}")
+            if trace:
+                logger.debug(f"Parsed timestamp assuming UTC: {timestamp_str} → {dt}")
 
         # Ensure UTC
         if dt.tzinfo is None:
@@ -241,44 +217,50 @@ def parse_timestamp_to_utc(timestamp_str, logger=None):
         return None
 
 
-def convert_to_local_timezone(utc_dt, timezone_offset, logger=None):
+# Resolved tzinfo per timezone_offset setting (None if the setting cannot be resolved)
+_TIMEZONE_CACHE = {}
+
+# Per named zone: UTC hour -> (utc offset, pytz tzinfo) valid for that whole hour
+_HOURLY_OFFSET_CACHE = {}
+
+# Hours kept per zone before the hourly cache is reset (about 11 years)
+MAX_HOURLY_OFFSET_CACHE_SIZE = 100000
+
+_ONE_HOUR = timedelta(hours=1)
+_LAST_MICROSECOND = timedelta(hours=1, microseconds=-1)
+
+
+def resolve_timezone(timezone_offset, logger=None):
     """
-    Convert UTC datetime to local timezone.
+    Resolve a timezone setting to a tzinfo object, caching the result.
 
     Supports both:
     1. Timezone names (e.g., "Australia/Sydney") - automatically handles DST
     2. Legacy fixed offsets (e.g., "UTC+10:00") - for backward compatibility
 
-    Source: PowerQuery lines 337-429 (enhanced with auto DST support)
-
     Args:
-        utc_dt (datetime): UTC datetime
         timezone_offset (str): Timezone name or offset string
         logger (logging.Logger, optional): Logger instance
 
     Returns:
-        datetime: Datetime in local timezone
+        tzinfo: Resolved timezone, or None if the setting is invalid
     """
+    try:
+        return _TIMEZONE_CACHE[timezone_offset]
+    except KeyError:
+        pass
+
     if logger is None:
         logger = logging.getLogger(__name__)
 
-    if not utc_dt:
-        logger.debug("No UTC datetime provided, returning None")
-        return None
-
     try:
         # Detect format: timezone name contains "/", fixed offset does not
         if "/" in timezone_offset:
             # TIMEZONE NAME FORMAT (e.g., "Australia/Sydney")
-            # Automatically handles DST transitions
             logger.debug(f"Using timezone name: {timezone_offset} (auto DST)")
             tz = pytz.timezone(timezone_offset)
-            local_dt = utc_dt.astimezone(tz)
-            logger.debug(f"Converted {utc_dt} to {timezone_offset}: {local_dt} (offset: {local_dt.strftime('%z')})")
-            return local_dt
         else:
             # LEGACY FIXED OFFSET FORMAT (e.g., "UTC+10:00")
-            # For backward compatibility with existing configurations
             logger.debug(f"Using legacy fixed offset: {timezone_offset}")
 
             # Get the offset string
@@ -287,31 +269,98 @@ def convert_to_local_timezone(utc_dt, timezone_offset, logger=None):
                 logger.warning(f"Unknown timezone offset '{timezone_offset}', using UTC (+00:00)")
 
             # Parse offset
-            if offset_str.startswith('+'):
-                sign = 1
-                offset_str = offset_str[1:]
-            else:
-                sign = -1
-                offset_str = offset_str[1:]
-
-            # Split hours and minutes
-            if ':' in offset_str:
-                hours, minutes = offset_str.split(':')
-                hours = int(hours)
-                minutes = int(minutes)
-            else:
-                hours = int(offset_str)
-                minutes = 0
-
-            # Create timezone
-            total_minutes = sign * (hours * 60 + minutes)
-            tz = pytz.FixedOffset(total_minutes)
-
-            # Convert
-            local_dt = utc_dt.astimezone(tz)
-            logger.debug(f"Converted to local time: {local_dt}")
-            return local_dt
+            sign = 1 if offset_str.startswith('+') else -1
+            hours, minutes = offset_str[1:].split(':')
+            tz = pytz.FixedOffset(sign * (int(hours) * 60 + int(minutes)))
     except Exception as e:
+        logger.error(f"Failed to resolve timezone '{timezone_offset}': {str(e)}")
+        tz = None
+
+    _TIMEZONE_CACHE[timezone_offset] = tz
+    return tz
+
+
+def _hourly_offset(utc_dt, tz, hour_cache):
+    """
+    Return the (offset, tzinfo) pair that applies to the UTC hour of utc_dt.
+
+    The pair is cached only if the zone has no transition inside that hour, so
+    zones with half-hour DST changes stay exact.
+
+    Args:
+        utc_dt (datetime): UTC datetime
+        tz (tzinfo): Named timezone
+        hour_cache (dict): Hourly cache of the zone
+
+    Returns:
+        tuple: (timedelta offset, tzinfo) or None if the hour contains a transition
+    """
+    hour_start = utc_dt.replace(minute=0, second=0, microsecond=0)
+    try:
+        return hour_cache[hour_start]
+    except KeyError:
+        pass
+
+    local_start = hour_start.astimezone(tz)
+    local_end = (hour_start + _LAST_MICROSECOND).astimezone(tz)
+    if local_start.tzinfo is local_end.tzinfo:
+        entry = (local_start.utcoffset(), local_start.tzinfo)
+    else:
+        entry = None
+
+    if len(hour_cache) >= MAX_HOURLY_OFFSET_CACHE_SIZE:
+        hour_cache.clear()
+    hour_cache[hour_start] = entry
+    return entry
+
+
+def convert_to_local_timezone(utc_dt, timezone_offset, logger=None):
+    """
+    Convert UTC datetime to local timezone.
+
+    Supports both:
+    1. Timezone names (e.g., "Australia/Sydney") - automatically handles DST
+    2. Legacy fixed offsets (e.g., "UTC+10:00") - for backward compatibility
+
+    The timezone is resolved once per setting (see resolve_timezone). For named
+    zones the UTC offset is cached per UTC hour, so converting a record is a
+    single addition.
+
+    Source: PowerQuery lines 337-429 (enhanced with auto DST support)
+
+    Args:
+        utc_dt (datetime): UTC datetime
+        timezone_offset (str): Timezone name or offset string
+        logger (logging.Logger, optional): Logger instance
+
+    Returns:
+        datetime: Datetime in local timezone
+    """
+    if not utc_dt:
+        if logger is not None:
+            logger.debug("No UTC datetime provided, returning None")
+        return None
+
+    tz = _TIMEZONE_CACHE.get(timezone_offset) or resolve_timezone(timezone_offset, logger)
+    if tz is None:
+        # Invalid setting, already reported by resolve_timezone
+        return utc_dt
+
+    try:
+        hour_cache = _HOURLY_OFFSET_CACHE.get(timezone_offset)
+        if hour_cache is None and "/" in timezone_offset:
+            hour_cache = _HOURLY_OFFSET_CACHE.setdefault(timezone_offset, {})
+
+        if hour_cache is not None and utc_dt.tzinfo is pytz.UTC:
+            entry = _hourly_offset(utc_dt, tz, hour_cache)
+            if entry is not None:
+                offset, local_tzinfo = entry
+                return (utc_dt + offset).replace(tzinfo=local_tzinfo)
+
+        return utc_dt.astimezone(tz)
+    except Exception as e:
+        if logger is None:
+            logger = logging.getLogger(__name__)
         logger.error(f"Failed to convert timezone for {utc_dt} with offset {timezone_offset}: {str(e)}")
         logger.warning("Returning UTC datetime as fallback")
         return utc_dt
@@ -482,191 +531,390 @@ def format_datetime_cqname(local_dt, ra_name):
 
 
 # ============================================================================
-# SINGLE RECORD ENRICHMENT (for parallel processing)
+# DISPOSITION TABLE
 # ============================================================================
 
-def enrich_single_callqueue_record(record_data):
+# Known CallQueueCallResult values (source: PowerQuery legend code mappings)
+CALL_QUEUE_CALL_RESULTS = (
+    "agent_joined_conference",
+    "transferred_to_agent",
+    "transferred_to_callback_caller",
+    "overflown",
+    "timed_out",
+    "callback_call_timed_out",
+    "no_agent",
+    "disconnected",
+    "NOTAUTHCQ",
+    "",
+    None,
+)
+
+# Known CallQueueTargetType values
+CALL_QUEUE_TARGET_TYPES = (
+    "User",
+    "ApplicationEndpoint",
+    "ConfigurationEndpoint",
+    "MailBox",
+    "Disconnect",
+    "Phone",
+    "",
+    None,
+)
+
+# Upper bound for pairs added on the fly (guards against unexpected API values)
+MAX_DISPOSITION_TABLE_SIZE = 4096
+
+# Fully resolved disposition of a (CallQueueCallResult, CallQueueTargetType) pair
+Disposition = namedtuple("Disposition", [
+    "cq_target_type",
+    "call_result_code",
+    "target_type_code",
+    "call_result_string",
+    "target_type_string",
+    "abandoned",
+])
+
+
+def _compute_disposition(call_result, target_type):
     """
-    Enrich a single Call Queue record. Designed for parallel processing.
+    Resolve a (call result, target type) pair using the PowerQuery rules.
 
     Args:
-        record_data (tuple): (idx, raw_record, config) where:
-            - idx: Record index
-            - raw_record: Raw data dictionary
-            - config: Enrichment configuration dictionary
+        call_result (str): Raw CallQueueCallResult value
+        target_type (str): Raw CallQueueTargetType value
 
     Returns:
-        tuple: (idx, enriched_record, success, error_message)
+        Disposition: Corrected target type, legend codes, legend strings and abandoned flag
     """
-    idx, raw_record, config = record_data
+    cq_target_type = get_corrected_target_type(call_result, target_type)
+    call_result_code = get_call_result_legend_code(call_result, cq_target_type)
+    target_type_code = get_target_type_legend_code(call_result, cq_target_type)
+    return Disposition(
+        cq_target_type,
+        call_result_code,
+        target_type_code,
+        CALL_RESULT_LEGEND_STRINGS.get(call_result_code, UNKNOWN_STRING),
+        TARGET_TYPE_LEGEND_STRINGS.get(target_type_code, UNKNOWN_STRING),
+        calculate_abandoned_count(call_result, cq_target_type),
+    )
+
+
+# Precomputed at import time for every known pair, extended on first sight of new pairs
+DISPOSITION_TABLE = {
+    (call_result, target_type): _compute_disposition(call_result, target_type)
+    for call_result in CALL_QUEUE_CALL_RESULTS
+    for target_type in CALL_QUEUE_TARGET_TYPES
+}
 
-    # Extract config
-    timezone_offset = config.get('timezone_offset', 'UTC')
-    language_code = config.get('language_code', 'en-AU')
-    enable_legend_codes = config.get('enable_legend_codes', True)
-    enable_legend_strings = config.get('enable_legend_strings', True)
-    enable_timezone_conversion = config.get('enable_timezone_conversion', True)
 
+def get_disposition(call_result, target_type):
+    """
+    Look up the disposition of a (call result, target type) pair in one step.
+
+    Replaces separate calls to get_corrected_target_type, get_call_result_legend_code,
+    get_target_type_legend_code, calculate_abandoned_count and the legend string lookups.
+
+    Args:
+        call_result (str): Raw CallQueueCallResult value
+        target_type (str): Raw CallQueueTargetType value
+
+    Returns:
+        Disposition: Corrected target type, legend codes, legend strings and abandoned flag
+    """
+    key = (call_result, target_type)
     try:
-        enriched = {}
-
-        # ====================================================================
-        # STEP 1: Preserve raw fields with "raw" prefix
-        # ====================================================================
-        enriched['CallQueue[rawUserStartTimeUTC]'] = raw_record.get('UserStartTimeUTC', '')
-        enriched['CallQueue[rawEndTime]'] = raw_record.get('EndTime', '')
-        enriched['CallQueue[rawCallQueueId]'] = raw_record.get('CallQueueId', '')
-        enriched['CallQueue[rawCallQueueIdentity]'] = raw_record.get('CallQueueIdentity', '')
-        enriched['CallQueue[rawCallQueueCallResult]'] = raw_record.get('CallQueueCallResult', '')
-        enriched['CallQueue[rawCallQueueTargetType]'] = raw_record.get('CallQueueTargetType', '')
-        enriched['CallQueue[rawCallQueueDurationSeconds]'] = raw_record.get('CallQueueDurationSeconds', 0)
-        enriched['CallQueue[rawCallQueueAgentCount]'] = raw_record.get('CallQueueAgentCount', 0)
-        enriched['CallQueue[rawCallQueueAgentOptInCount]'] = raw_record.get('CallQueueAgentOptInCount', 0)
-        enriched['CallQueue[rawPSTNConnectivityType]'] = raw_record.get('PSTNConnectivityType', '')
-        enriched['CallQueue[rawPSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
-        enriched['CallQueue[rawTotalCallCount]'] = raw_record.get('TotalCallCount', 1)
-
-        # Common dimension identifiers (match API response casing)
-        enriched['CallQueue[DocumentId]'] = raw_record.get('DocumentId', '')
-        enriched['CallQueue[ConferenceId]'] = raw_record.get('ConferenceId', '')
-        enriched['CallQueue[DialogId]'] = raw_record.get('DialogId', '')
-
-        # ====================================================================
-        # STEP 2: Calculate CQTargetType (corrected)
-        # ====================================================================
-        raw_call_result = raw_record.get('CallQueueCallResult', '')
-        raw_target_type = raw_record.get('CallQueueTargetType', '')
-        cq_target_type = get_corrected_target_type(raw_call_result, raw_target_type)
-        enriched['CallQueue[CQTargetType]'] = cq_target_type
-
-        # ====================================================================
-        # STEP 3: Parse timestamps to UTC
-        # ====================================================================
-        call_start_utc = parse_timestamp_to_utc(raw_record.get('UserStartTimeUTC', ''))
-        call_end_utc = parse_timestamp_to_utc(raw_record.get('EndTime', ''))
-
-        enriched['CallQueue[CallStartTimeUTC]'] = call_start_utc.isoformat() if call_start_utc else ''
-        enriched['CallQueue[CallEndTimeUTC]'] = call_end_utc.isoformat() if call_end_utc else ''
-
-        # ====================================================================
-        # STEP 4: Convert to local timezone
-        # ====================================================================
-        if enable_timezone_conversion and call_start_utc:
-            call_start_local = convert_to_local_timezone(call_start_utc, timezone_offset)
-            call_end_local = convert_to_local_timezone(call_end_utc, timezone_offset) if call_end_utc else None
-        else:
-            call_start_local = call_start_utc
-            call_end_local = call_end_utc
+        return DISPOSITION_TABLE[key]
+    except KeyError:
+        disposition = _compute_disposition(call_result, target_type)
+        if len(DISPOSITION_TABLE) < MAX_DISPOSITION_TABLE_SIZE:
+            DISPOSITION_TABLE[key] = disposition
+        return disposition
+    except TypeError:
+        # Unhashable value from the API, resolve without caching
+        return _compute_disposition(call_result, target_type)
 
-        enriched['CallQueue[CallStartTimeLocal]'] = call_start_local.isoformat() if call_start_local else ''
-        enriched['CallQueue[CallEndTimeLocal]'] = call_end_local.isoformat() if call_end_local else ''
 
-        # ====================================================================
-        # STEP 5: Derive date fields
-        # ====================================================================
-        if call_start_local:
-            call_start_date = call_start_local.replace(hour=0, minute=0, second=0, microsecond=0)
-            enriched['CallQueue[CallStartDateLocal]'] = call_start_date.isoformat()
+# ============================================================================
+# FIELD MAPPING (every output column declared once, see field_mapping)
+# ============================================================================
+
+# (ok, CallStartTimeUTC, CallStartTimeLocal, CallStartDateLocal, Date, CQHour,
+# DateTimeCQName prefix) of a record without a parsable start time
+_NO_START_TIME = (False, '', '', '', '', 0, None)
+
+
+def _start_time_fields(call_start_utc, call_start_local):
+    """Start time fields of a parsed start time (see _NO_START_TIME)."""
+    if not call_start_local:
+        return (True, call_start_utc.isoformat(), '', '', '', 0, None)
+    return (
+        True,
+        call_start_utc.isoformat(),
+        call_start_local.isoformat(),
+        call_start_local.replace(hour=0, minute=0, second=0, microsecond=0).isoformat(),
+        call_start_local.replace(minute=0, second=0, microsecond=0).isoformat(),
+        call_start_local.hour,
+        call_start_local.strftime('%-d/%-m/%Y %-I:%M:%S %p'),
+    )
+
+
+def _build_start_times(options, logger):
+    """Derived build: UserStartTimeUTC -> start time fields, in UTC or the input's timezone."""
+    timezone_offset = options['timezone_offset']
+
+    if options['enable_timezone_conversion']:
+        def start_times(raw_value):
+            call_start_utc = parse_timestamp_to_utc(raw_value, logger, False)
+            if not call_start_utc:
+                return _NO_START_TIME
+            return _start_time_fields(call_start_utc,
+                                      convert_to_local_timezone(call_start_utc, timezone_offset, logger))
+    else:
+        def start_times(raw_value):
+            call_start_utc = parse_timestamp_to_utc(raw_value, logger, False)
+            if not call_start_utc:
+                return _NO_START_TIME
+            return _start_time_fields(call_start_utc, call_start_utc)
+    return start_times
+
+
+def _build_end_times(options, logger):
+    """Derived build: (EndTime, start time fields) -> (CallEndTimeUTC, CallEndTimeLocal)."""
+    timezone_offset = options['timezone_offset']
+
+    if options['enable_timezone_conversion']:
+        def end_times(raw_value, start):
+            call_end_utc = parse_timestamp_to_utc(raw_value, logger, False)
+            if not call_end_utc:
+                return ('', '')
+            utc_iso = call_end_utc.isoformat()
+            if not start[0]:
+                # Without a parsed start time the end time is not converted
+                return (utc_iso, utc_iso)
+            call_end_local = convert_to_local_timezone(call_end_utc, timezone_offset, logger)
+            return (utc_iso, call_end_local.isoformat() if call_end_local else '')
+    else:
+        def end_times(raw_value, start):
+            call_end_utc = parse_timestamp_to_utc(raw_value, logger, False)
+            if not call_end_utc:
+                return ('', '')
+            utc_iso = call_end_utc.isoformat()
+            return (utc_iso, utc_iso)
+    return end_times
+
+
+def _build_disposition(options, logger):
+    """Derived build: (CallQueueCallResult, CallQueueTargetType) -> Disposition, in the input's language."""
+    if not (options['enable_legend_codes'] and options['enable_legend_strings']):
+        # Legend strings are not output: no pack to load
+        return get_disposition
+    pack = get_legend_pack(options['language_code'], logger)
+    if pack.language == DEFAULT_LANGUAGE:
+        return get_disposition
+
+    # Localized copies of the shared dispositions, per compiled enricher
+    localized = {}
+
+    def localize(disposition):
+        return disposition._replace(
+            call_result_string=pack.call_result_string(disposition.call_result_code),
+            target_type_string=pack.target_type_string(disposition.target_type_code),
+        )
+
+    def disposition(call_result, target_type):
+        key = (call_result, target_type)
+        try:
+            return localized[key]
+        except KeyError:
+            resolved = localize(get_disposition(call_result, target_type))
+            if len(localized) < MAX_DISPOSITION_TABLE_SIZE:
+                localized[key] = resolved
+            return resolved
+        except TypeError:
+            return localize(get_disposition(call_result, target_type))
+    return disposition
+
+
+def _build_connectivity_type(options, logger):
+    """Derived build: PSTNConnectivityType -> (CQConnectivityTypeCode, CQConnectivityTypeString)."""
+    string = get_legend_pack(options['language_code'], logger).connectivity_type_string
+    table = {raw: (code, string(code)) for raw, code in CONNECTIVITY_TYPE_CODES.items()}
+    unknown = (8620, string(8620))
+    get = table.get
+
+    def connectivity_type(raw_connectivity):
+        return get(raw_connectivity, unknown)
+    return connectivity_type
+
+
+def _datetime_cqname(start, ra_name):
+    """(start time fields, CQRAName) -> DateTimeCQName, as format_datetime_cqname."""
+    formatted = start[6]
+    return ra_name if formatted is None else f"{formatted}{ra_name}"
+
+
+# Output columns of every Call Queue engine, in output order
+# Source: PowerQuery M code from powerquery.txt (see the module docstring)
+CALLQUEUE_SPEC = FieldSpec(
+    name="Call Queue",
+    options=(
+        ('timezone_offset', 'UTC'),
+        ('language_code', 'en-AU'),
+        ('enable_legend_codes', True),
+        ('enable_legend_strings', True),
+        ('enable_timezone_conversion', True),
+    ),
+    derived=(
+        # In the order of the original enrichment steps (a failing step drops the record)
+        Derived('disposition', (('CallQueueCallResult', ''), ('CallQueueTargetType', '')), _build_disposition),
+        Derived('start', (('UserStartTimeUTC', ''),), _build_start_times),
+        Derived('end', (('EndTime', ''), 'start'), _build_end_times),
+        Derived('connectivity', (('PSTNConnectivityType', ''),), _build_connectivity_type),
+        Derived('ra_name', (('CallQueueIdentity', ''),), fixed(extract_queue_ra_name)),
+        Derived('datetime_cqname', ('start', 'ra_name'), fixed(_datetime_cqname)),
+    ),
+    fields=(
+        # Raw fields with "raw" prefix
+        Field('CallQueue[rawUserStartTimeUTC]', 'UserStartTimeUTC', ''),
+        Field('CallQueue[rawEndTime]', 'EndTime', ''),
+        Field('CallQueue[rawCallQueueId]', 'CallQueueId', ''),
+        Field('CallQueue[rawCallQueueIdentity]', 'CallQueueIdentity', ''),
+        Field('CallQueue[rawCallQueueCallResult]', 'CallQueueCallResult', ''),
+        Field('CallQueue[rawCallQueueTargetType]', 'CallQueueTargetType', ''),
+        Field('CallQueue[rawCallQueueDurationSeconds]', 'CallQueueDurationSeconds', 0),
+        Field('CallQueue[rawCallQueueAgentCount]', 'CallQueueAgentCount', 0),
+        Field('CallQueue[rawCallQueueAgentOptInCount]', 'CallQueueAgentOptInCount', 0),
+        Field('CallQueue[rawPSTNConnectivityType]', 'PSTNConnectivityType', ''),
+        Field('CallQueue[rawPSTNTotalMinutes]', 'PSTNTotalMinutes', 0),
+        Field('CallQueue[rawTotalCallCount]', 'TotalCallCount', 1),
+        # Pass-through identifiers (API response casing, as the threaded engine always wrote them)
+        Field('CallQueue[DocumentId]', 'DocumentId', ''),
+        Field('CallQueue[ConferenceId]', 'ConferenceId', ''),
+        Field('CallQueue[DialogId]', 'DialogId', ''),
+        # Corrected target type
+        Field('CallQueue[CQTargetType]', 'disposition', item=0),
+        # Timestamps and date fields
+        Field('CallQueue[CallStartTimeUTC]', 'start', item=1),
+        Field('CallQueue[CallEndTimeUTC]', 'end', item=0),
+        Field('CallQueue[CallStartTimeLocal]', 'start', item=2),
+        Field('CallQueue[CallEndTimeLocal]', 'end', item=1),
+        Field('CallQueue[CallStartDateLocal]', 'start', item=3),
+        Field('CallQueue[Date]', 'start', item=4),
+        Field('CallQueue[CQHour]', 'start', item=5),
+        # Connectivity type
+        Field('CallQueue[CQConnectivityTypeCode]', 'connectivity', item=0),
+        Field('CallQueue[CQConnectivityTypeString]', 'connectivity', item=1),
+        Field('CallQueue[CQConnectivityTypeRaw]', 'PSTNConnectivityType', ''),
+        # Legend codes and strings
+        Field('CallQueue[CQCallResultLegendCode]', 'disposition', item=1,
+              requires=('enable_legend_codes',), disabled=0),
+        Field('CallQueue[CQTargetTypeLegendCode]', 'disposition', item=2,
+              requires=('enable_legend_codes',), disabled=0),
+        Field('CallQueue[CQCallResultLegendString]', 'disposition', item=3,
+              requires=('enable_legend_codes', 'enable_legend_strings'), disabled=''),
+        Field('CallQueue[CQTargetTypeLegendString]', 'disposition', item=4,
+              requires=('enable_legend_codes', 'enable_legend_strings'), disabled=''),
+        Field('CallQueue[CQCallCountAbandoned]', 'disposition', item=5),
+        # Queue names (simple mode: no display name lookup)
+        Field('CallQueue[CQRAName]', 'ra_name'),
+        Field('CallQueue[CQSlicer]', 'ra_name'),
+        Field('CallQueue[CQName]', None, ''),
+        # Composite key
+        Field('CallQueue[DateTimeCQName]', 'datetime_cqname'),
+        # Copied/renamed fields
+        Field('CallQueue[CQGUID]', 'CallQueueId', ''),
+        Field('CallQueue[CQAgentCount]', 'CallQueueAgentCount', 0),
+        Field('CallQueue[CQAgentOptInCount]', 'CallQueueAgentOptInCount', 0),
+        Field('CallQueue[CQCallDurationSeconds]', 'CallQueueDurationSeconds', 0),
+        Field('CallQueue[CQCallCount]', 'TotalCallCount', 1),
+        Field('CallQueue[CQCallResultRaw]', 'CallQueueCallResult', ''),
+        Field('CallQueue[PSTNTotalMinutes]', 'PSTNTotalMinutes', 0),
+        Field('CallQueue[LanguageCode]', Option('language_code')),
+    ),
+    # Records without a parsable UserStartTimeUTC
+    parse_failure=('start', 0),
+)
+
+# Output columns in the order produced by every Call Queue engine
+CALLQUEUE_OUTPUT_KEYS = CALLQUEUE_SPEC.keys
+
 
-            hourly_timestamp = call_start_local.replace(minute=0, second=0, microsecond=0)
-            enriched['CallQueue[Date]'] = hourly_timestamp.isoformat()
+# ============================================================================
+# SINGLE RECORD ENRICHMENT
+# ============================================================================
 
-            enriched['CallQueue[CQHour]'] = call_start_local.hour
-        else:
-            enriched['CallQueue[CallStartDateLocal]'] = ''
-            enriched['CallQueue[Date]'] = ''
-            enriched['CallQueue[CQHour]'] = 0
-
-        # ====================================================================
-        # STEP 6: Map connectivity type
-        # ====================================================================
-        raw_connectivity = raw_record.get('PSTNConnectivityType', '')
-        connectivity_code = CONNECTIVITY_TYPE_CODES.get(raw_connectivity, 8620)
-        enriched['CallQueue[CQConnectivityTypeCode]'] = connectivity_code
-        enriched['CallQueue[CQConnectivityTypeString]'] = CONNECTIVITY_TYPE_STRINGS.get(connectivity_code, "Unknown")
-        enriched['CallQueue[CQConnectivityTypeRaw]'] = raw_connectivity
-
-        # ====================================================================
-        # STEP 7: Calculate legend codes
-        # ====================================================================
-        if enable_legend_codes:
-            call_result_code = get_call_result_legend_code(raw_call_result, cq_target_type)
-            target_type_code = get_target_type_legend_code(raw_call_result, cq_target_type)
-            enriched['CallQueue[CQCallResultLegendCode]'] = call_result_code
-            enriched['CallQueue[CQTargetTypeLegendCode]'] = target_type_code
-
-            if enable_legend_strings:
-                enriched['CallQueue[CQCallResultLegendString]'] = CALL_RESULT_LEGEND_STRINGS.get(call_result_code, "Unknown")
-                enriched['CallQueue[CQTargetTypeLegendString]'] = TARGET_TYPE_LEGEND_STRINGS.get(target_type_code, "Unknown")
-            else:
-                enriched['CallQueue[CQCallResultLegendString]'] = ''
-                enriched['CallQueue[CQTargetTypeLegendString]'] = ''
-        else:
-            enriched['CallQueue[CQCallResultLegendCode]'] = 0
-            enriched['CallQueue[CQTargetTypeLegendCode]'] = 0
-            enriched['CallQueue[CQCallResultLegendString]'] = ''
-            enriched['CallQueue[CQTargetTypeLegendString]'] = ''
-
-        # ====================================================================
-        # STEP 8: Calculate abandoned count
-        # ====================================================================
-        enriched['CallQueue[CQCallCountAbandoned]'] = calculate_abandoned_count(raw_call_result, cq_target_type)
-
-        # ====================================================================
-        # STEP 9: Extract queue names
-        # ====================================================================
-        queue_identity = raw_record.get('CallQueueIdentity', '')
-        ra_name = extract_queue_ra_name(queue_identity)
-        enriched['CallQueue[CQRAName]'] = ra_name
-        enriched['CallQueue[CQSlicer]'] = ra_name
-        enriched['CallQueue[CQName]'] = ''
-
-        # ====================================================================
-        # STEP 10: Create composite key
-        # ====================================================================
-        enriched['CallQueue[DateTimeCQName]'] = format_datetime_cqname(call_start_local, ra_name)
-
-        # ====================================================================
-        # STEP 11: Copy/rename other fields
-        # ====================================================================
-        enriched['CallQueue[CQGUID]'] = raw_record.get('CallQueueId', '')
-        enriched['CallQueue[CQAgentCount]'] = raw_record.get('CallQueueAgentCount', 0)
-        enriched['CallQueue[CQAgentOptInCount]'] = raw_record.get('CallQueueAgentOptInCount', 0)
-        enriched['CallQueue[CQCallDurationSeconds]'] = raw_record.get('CallQueueDurationSeconds', 0)
-        enriched['CallQueue[CQCallCount]'] = raw_record.get('TotalCallCount', 1)
-        enriched['CallQueue[CQCallResultRaw]'] = raw_call_result
-        enriched['CallQueue[PSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
-        enriched['CallQueue[LanguageCode]'] = language_code
-
-        return (idx, enriched, True, None)
+def enrich_single_callqueue_record(record_data, enricher=None, metrics=None):
+    """
+    Enrich a single Call Queue record.
 
-    except Exception as e:
-        return (idx, None, False, str(e))
+    Args:
+        record_data (tuple): (idx, raw_record, config) where:
+            - idx: Record index
+            - raw_record: Raw data dictionary
+            - config: Enrichment configuration dictionary
+        enricher (CompiledEnricher, optional): Enricher compiled from
+            CALLQUEUE_SPEC for config, resolved once per batch by the caller
+            (compiled from config if not given)
+        metrics (RunMetrics, optional): Run metrics receiving the timestamp
+            parse failure count
+
+    Returns:
+        tuple: (idx, enriched_record, success, error_message)
+    """
+    idx, raw_record, config = record_data
+    if enricher is None:
+        enricher = compile_enricher(CALLQUEUE_SPEC, config, logging.getLogger(__name__))
+    errors = []
+    enriched, _, timestamp_parse_fail = enricher.rows((raw_record,), idx,
+                                                      lambda _idx, _record, e: errors.append(str(e)))
+    if metrics is not None:
+        # Counted as in the sequential path, also for records that then fail
+        metrics.count("timestamp_parse_failures", timestamp_parse_fail)
+    if errors:
+        return (idx, None, False, errors[0])
+    return (idx, enriched[0], True, None)
 
 
 # ============================================================================
 # MAIN ENRICHMENT ORCHESTRATOR
 # ============================================================================
 
-def enrich_callqueue_data(raw_data_list, config=None, logger=None):
+def enrich_callqueue_data(raw_data, config=None, logger=None, metrics=None, rollup=None, on_drop=None):
     """
     Enrich raw VAAC API Call Queue data with all calculated fields.
 
     This function applies all PowerQuery transformations to match the PowerBI
     enrichment logic and output format.
 
+    Records are pulled from raw_data in fixed-size batches and enriched records
+    are yielded as each batch completes, so a streamed VAAC response can be
+    enriched and written while it is still downloading. Memory use is bounded
+    by the batch size rather than by the size of the query window.
+
     Args:
-        raw_data_list (list): List of raw data dictionaries from VAAC API
+        raw_data (iterable): Raw data dictionaries from VAAC API (list or iterator)
         config (dict): Configuration dictionary with keys:
             - timezone_offset: str (default "UTC")
             - language_code: str (default "en-AU")
             - enable_legend_codes: bool (default True)
             - enable_legend_strings: bool (default True)
             - enable_timezone_conversion: bool (default True)
+            - parallel_workers: int (default 1), worker processes of the process engine
+            - enrichment_engine: str (default "row"), "process" enables the process pool
+            - process_chunk_size: int (default DEFAULT_PROCESS_CHUNK_SIZE)
+            - batch_size: int (default DEFAULT_BATCH_SIZE)
+            - debug_sample_rate: int (default DEFAULT_DEBUG_SAMPLE_RATE), per-record
+              debug traces are logged for one record in this many
         logger (logging.Logger, optional): Logger instance
-
-    Returns:
-        list: List of enriched data dictionaries with CallQueue[field] structure
+        metrics (RunMetrics, optional): Run metrics receiving the enrichment
+            and timestamp parse failure counts
+        rollup (HourlyQueueRollup, optional): Receives the enriched records, in
+            output order, for the hourly per-queue rollups
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
+
+    Yields:
+        dict: Enriched data dictionaries with CallQueue[field] structure, in input order
     """
     if logger is None:
         logger = logging.getLogger(__name__)
@@ -674,277 +922,176 @@ def enrich_callqueue_data(raw_data_list, config=None, logger=None):
     if config is None:
         config = {}
 
-    logger.info(f"Starting Call Queue enrichment for {len(raw_data_list)} records")
+    logger.info("Starting Call Queue enrichment")
     logger.debug(f"Enrichment config: {config}")
 
-    # Determine if we should use parallel processing
+    records = iter(raw_data)
     parallel_workers = config.get('parallel_workers', 1)
-    use_parallel = parallel_workers > 1 and len(raw_data_list) >= 100
 
-    if use_parallel:
-        logger.info(f"Using parallel processing with {parallel_workers} workers for {len(raw_data_list)} records")
-        return _enrich_callqueue_data_parallel(raw_data_list, config, logger, parallel_workers)
-    else:
-        logger.info(f"Using sequential processing for {len(raw_data_list)} records")
-        return _enrich_callqueue_data_sequential(raw_data_list, config, logger)
+    if config.get('enrichment_engine') == 'process' and parallel_workers > 1:
+        chunk_size = max(1, int(config.get('process_chunk_size', DEFAULT_PROCESS_CHUNK_SIZE)))
+        first_chunk = list(islice(records, chunk_size))
+        if len(first_chunk) == chunk_size:
+            logger.info(f"Using process pool with {parallel_workers} workers and chunks of {chunk_size} records")
+            yield from enrich_process_pool(
+                CALLQUEUE_SPEC, _enrich_callqueue_chunk, chain(first_chunk, records), config, logger,
+                parallel_workers, chunk_size, metrics, rollup, on_drop
+            )
+            return
+        # Whole input fits in one chunk, not worth starting worker processes
+        records = iter(first_chunk)
+
+    # Enrichment holds the GIL, so the row engine enriches its batches in the calling thread
+    batch_size = max(1, int(config.get('batch_size', DEFAULT_BATCH_SIZE)))
+    total = 0
+    while True:
+        batch = list(islice(records, batch_size))
+        if not batch:
+            break
+        enriched = _enrich_callqueue_data_sequential(batch, config, logger, metrics, total, on_drop)
+        total += len(batch)
+        if rollup is not None:
+            rollup.record(enriched)
+        yield from enriched
+
+        logger.info(f"Progress: Enriched batches totalling {total} records")
+
+
+def _enrich_callqueue_chunk(task):
+    """
+    Enrich one contiguous chunk of Call Queue records (chunk worker of
+    field_mapping.enrich_process_pool, run in a worker process).
+
+    Args:
+        task (tuple): (chunk_index, raw_records, config)
 
+    Returns:
+        tuple: (chunk_index, enriched_records, positions of the dropped records in the chunk, metric counts)
+    """
+    chunk_index, raw_records, config = task
+    metrics = RunMetrics()
+    dropped = []
+    # Worker processes have no add-on log handler; only warnings and errors surface
+    enriched = _enrich_callqueue_data_sequential(raw_records, config, logging.getLogger(f"{__name__}.worker"),
+                                                 metrics, on_drop=dropped.append)
+    return (chunk_index, enriched, dropped, metrics.counts)
 
-def _enrich_callqueue_data_parallel(raw_data_list, config, logger, parallel_workers):
+
+def _enrich_callqueue_data_sequential(raw_data_list, config, logger, metrics=None, first_index=0, on_drop=None):
     """
-    Enrich Call Queue data using parallel processing.
+    Enrich Call Queue data using sequential processing.
+
+    Records are enriched by the function compiled from CALLQUEUE_SPEC for this
+    config (see field_mapping.compile_enricher).
 
     Args:
         raw_data_list (list): List of raw data dictionaries
         config (dict): Enrichment configuration
         logger (logging.Logger): Logger instance
-        parallel_workers (int): Number of parallel workers
+        metrics (RunMetrics, optional): Run metrics receiving the failure counts
+        first_index (int): Position of the first record in the whole input
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
 
     Returns:
         list: List of enriched data dictionaries
     """
-    enriched_data = []
-    failed_count = 0
+    record_count = len(raw_data_list)
 
-    # Prepare data for parallel processing
-    tasks = [(idx, record, config) for idx, record in enumerate(raw_data_list)]
+    def log_failure(idx, raw_record, e):
+        logger.error(f"Failed to enrich record {idx + 1}/{record_count}: {str(e)}", exc_info=e)
+        logger.debug(f"Failed record data: {raw_record}")
+        if on_drop is not None:
+            on_drop(first_index + idx)
 
-    # Process records in parallel using ThreadPoolExecutor
-    with ThreadPoolExecutor(max_workers=parallel_workers) as executor:
-        # Submit all tasks
-        futures = {executor.submit(enrich_single_callqueue_record, task): task[0] for task in tasks}
+    enricher = compile_enricher(CALLQUEUE_SPEC, config, logger)
+    enriched_data, failed_count, timestamp_parse_fail = enricher.rows(raw_data_list, 0, log_failure)
 
-        # Collect results as they complete
-        results = {}
-        completed = 0
-        for future in as_completed(futures):
-            idx, enriched, success, error_msg = future.result()
-            results[idx] = (enriched, success, error_msg)
-
-            completed += 1
-            if completed % 100 == 0:
-                logger.info(f"Progress: Completed {completed}/{len(raw_data_list)} records")
-
-            if not success:
-                failed_count += 1
-                logger.error(f"Failed to enrich record {idx + 1}: {error_msg}")
-
-    # Sort results by index to maintain order
-    for idx in sorted(results.keys()):
-        enriched, success, _ = results[idx]
-        if success:
-            enriched_data.append(enriched)
+    if metrics is not None:
+        metrics.count("timestamp_parse_failures", timestamp_parse_fail)
+        metrics.count("enrichment_failures", failed_count)
 
     # Final summary
-    logger.info(f"Parallel enrichment complete: {len(enriched_data)} successful, {failed_count} failed")
+    timestamp_parse_success = record_count - failed_count - timestamp_parse_fail
+    logger.info(f"Enrichment complete: {len(enriched_data)} successful, {failed_count} failed")
+    logger.info(f"Timestamp parsing: {timestamp_parse_success} successful, {timestamp_parse_fail} failed")
     if enriched_data and logger.isEnabledFor(logging.DEBUG):
         logger.debug(f"Sample enriched record (first): {enriched_data[0]}")
 
     return enriched_data
 
 
-def _enrich_callqueue_data_sequential(raw_data_list, config, logger):
+# ============================================================================
+# COLUMNAR ENRICHMENT (works directly on VAAC ordered arrays)
+# ============================================================================
+
+def enrich_callqueue_columns(data_result, dimensions, measurements, config=None, logger=None, metrics=None,
+                             first_index=0, on_drop=None):
     """
-    Enrich Call Queue data using sequential processing (original implementation).
+    Enrich VAAC Call Queue ordered arrays using whole-column operations.
+
+    Unlike enrich_callqueue_data, this engine never builds an intermediate
+    dictionary per raw row. Each source field is extracted once as a column,
+    derived values are computed once per distinct input value (call results,
+    target types, queue identities and timestamps repeat heavily) and the
+    enriched dictionaries are assembled in a single pass at the end.
+
+    The output is identical to _enrich_callqueue_data_sequential applied to
+    transform_ordered_arrays_to_dicts(data_result, dimensions, measurements).
 
     Args:
-        raw_data_list (list): List of raw data dictionaries
-        config (dict): Enrichment configuration
-        logger (logging.Logger): Logger instance
+        data_result (list): VAAC dataResult ordered arrays
+        dimensions (list): Dimension names (ordered as in API query)
+        measurements (list): Measurement names (ordered as in API query)
+        config (dict): Enrichment configuration (same keys as enrich_callqueue_data)
+        logger (logging.Logger, optional): Logger instance
+        metrics (RunMetrics, optional): Run metrics receiving the failure counts
+        first_index (int): Position of the first row in the whole input
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
 
     Returns:
-        list: List of enriched data dictionaries
+        list: List of enriched data dictionaries with CallQueue[field] structure
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    if config is None:
+        config = {}
+
+    return enrich_columns(CALLQUEUE_SPEC, data_result, dimensions, measurements, config, logger, metrics,
+                          first_index, on_drop)
+
+
+def iter_enrich_callqueue_columns(data_rows, dimensions, measurements, config=None, logger=None, metrics=None,
+                                  rollup=None, on_drop=None):
     """
-    # Extract config
-    timezone_offset = config.get('timezone_offset', 'UTC')
-    language_code = config.get('language_code', 'en-AU')
-    enable_legend_codes = config.get('enable_legend_codes', True)
-    enable_legend_strings = config.get('enable_legend_strings', True)
-    enable_timezone_conversion = config.get('enable_timezone_conversion', True)
+    Enrich an iterable of VAAC Call Queue ordered arrays with the columnar engine.
 
-    enriched_data = []
-    failed_count = 0
-    timestamp_parse_success = 0
-    timestamp_parse_fail = 0
+    Rows are pulled in batches of config['batch_size'] (default DEFAULT_BATCH_SIZE)
+    and each batch is enriched like enrich_callqueue_columns (see
+    field_mapping.iter_enrich_columns), so a streamed response never has to be
+    held in memory as a whole.
 
-    for idx, raw_record in enumerate(raw_data_list):
-        try:
-            enriched = {}
-
-            if idx == 0:
-                logger.debug(f"Sample raw record (first): {raw_record}")
-
-            # ====================================================================
-            # STEP 1: Preserve raw fields with "raw" prefix
-            # ====================================================================
-            logger.debug(f"Step 1/11: Preserving raw fields for record {idx + 1}/{len(raw_data_list)}")
-            enriched['CallQueue[rawUserStartTimeUTC]'] = raw_record.get('UserStartTimeUTC', '')
-            enriched['CallQueue[rawEndTime]'] = raw_record.get('EndTime', '')
-            enriched['CallQueue[rawCallQueueId]'] = raw_record.get('CallQueueId', '')
-            enriched['CallQueue[rawCallQueueIdentity]'] = raw_record.get('CallQueueIdentity', '')
-            enriched['CallQueue[rawCallQueueCallResult]'] = raw_record.get('CallQueueCallResult', '')
-            enriched['CallQueue[rawCallQueueTargetType]'] = raw_record.get('CallQueueTargetType', '')
-            enriched['CallQueue[rawCallQueueDurationSeconds]'] = raw_record.get('CallQueueDurationSeconds', 0)
-            enriched['CallQueue[rawCallQueueAgentCount]'] = raw_record.get('CallQueueAgentCount', 0)
-            enriched['CallQueue[rawCallQueueAgentOptInCount]'] = raw_record.get('CallQueueAgentOptInCount', 0)
-            enriched['CallQueue[rawPSTNConnectivityType]'] = raw_record.get('PSTNConnectivityType', '')
-            enriched['CallQueue[rawPSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
-            enriched['CallQueue[rawTotalCallCount]'] = raw_record.get('TotalCallCount', 1)
-
-            # Pass-through identifiers
-            enriched['CallQueue[DocumentID]'] = raw_record.get('DocumentID', '')
-            enriched['CallQueue[ConferenceID]'] = raw_record.get('ConferenceID', '')
-            enriched['CallQueue[DialogID]'] = raw_record.get('DialogID', '')
-
-            # ====================================================================
-            # STEP 2: Calculate CQTargetType (corrected)
-            # ====================================================================
-            logger.debug(f"Step 2/11: Calculating corrected CQTargetType for record {idx + 1}")
-            raw_call_result = raw_record.get('CallQueueCallResult', '')
-            raw_target_type = raw_record.get('CallQueueTargetType', '')
-            cq_target_type = get_corrected_target_type(raw_call_result, raw_target_type)
-            enriched['CallQueue[CQTargetType]'] = cq_target_type
-            logger.debug(f"CQTargetType: {raw_target_type} → {cq_target_type}")
-
-            # ====================================================================
-            # STEP 3: Parse timestamps to UTC
-            # ====================================================================
-            logger.debug(f"Step 3/11: Parsing timestamps to UTC for record {idx + 1}")
-            call_start_utc = parse_timestamp_to_utc(raw_record.get('UserStartTimeUTC', ''), logger)
-            call_end_utc = parse_timestamp_to_utc(raw_record.get('EndTime', ''), logger)
-
-            if call_start_utc:
-                timestamp_parse_success += 1
-            else:
-                timestamp_parse_fail += 1
-
-            enriched['CallQueue[CallStartTimeUTC]'] = call_start_utc.isoformat() if call_start_utc else ''
-            enriched['CallQueue[CallEndTimeUTC]'] = call_end_utc.isoformat() if call_end_utc else ''
-
-            # ====================================================================
-            # STEP 4: Convert to local timezone
-            # ====================================================================
-            logger.debug(f"Step 4/11: Converting to local timezone for record {idx + 1}")
-            if enable_timezone_conversion and call_start_utc:
-                call_start_local = convert_to_local_timezone(call_start_utc, timezone_offset, logger)
-                call_end_local = convert_to_local_timezone(call_end_utc, timezone_offset, logger) if call_end_utc else None
-            else:
-                call_start_local = call_start_utc
-                call_end_local = call_end_utc
-                if not enable_timezone_conversion:
-                    logger.debug("Timezone conversion disabled, using UTC timestamps")
-
-            enriched['CallQueue[CallStartTimeLocal]'] = call_start_local.isoformat() if call_start_local else ''
-            enriched['CallQueue[CallEndTimeLocal]'] = call_end_local.isoformat() if call_end_local else ''
-
-            # ====================================================================
-            # STEP 5: Derive date fields
-            # ====================================================================
-            logger.debug(f"Step 5/11: Deriving date fields for record {idx + 1}")
-            if call_start_local:
-                # CallStartDateLocal: Date only
-                call_start_date = call_start_local.replace(hour=0, minute=0, second=0, microsecond=0)
-                enriched['CallQueue[CallStartDateLocal]'] = call_start_date.isoformat()
-
-                # Date: Hourly timestamp
-                hourly_timestamp = call_start_local.replace(minute=0, second=0, microsecond=0)
-                enriched['CallQueue[Date]'] = hourly_timestamp.isoformat()
-
-                # CQHour: Hour of day
-                enriched['CallQueue[CQHour]'] = call_start_local.hour
-                logger.debug(f"Date fields: Date={hourly_timestamp.isoformat()}, Hour={call_start_local.hour}")
-            else:
-                enriched['CallQueue[CallStartDateLocal]'] = ''
-                enriched['CallQueue[Date]'] = ''
-                enriched['CallQueue[CQHour]'] = 0
-                logger.debug("No call_start_local available, using empty date fields")
-
-            # ====================================================================
-            # STEP 6: Map connectivity type
-            # ====================================================================
-            logger.debug(f"Step 6/11: Mapping connectivity type for record {idx + 1}")
-            raw_connectivity = raw_record.get('PSTNConnectivityType', '')
-            connectivity_code = CONNECTIVITY_TYPE_CODES.get(raw_connectivity, 8620)
-            enriched['CallQueue[CQConnectivityTypeCode]'] = connectivity_code
-            enriched['CallQueue[CQConnectivityTypeString]'] = CONNECTIVITY_TYPE_STRINGS.get(connectivity_code, "Unknown")
-            enriched['CallQueue[CQConnectivityTypeRaw]'] = raw_connectivity
-            logger.debug(f"Connectivity: {raw_connectivity} → {connectivity_code}")
-
-            # ====================================================================
-            # STEP 7: Calculate legend codes
-            # ====================================================================
-            logger.debug(f"Step 7/11: Calculating legend codes for record {idx + 1}")
-            if enable_legend_codes:
-                call_result_code = get_call_result_legend_code(raw_call_result, cq_target_type)
-                target_type_code = get_target_type_legend_code(raw_call_result, cq_target_type)
-                enriched['CallQueue[CQCallResultLegendCode]'] = call_result_code
-                enriched['CallQueue[CQTargetTypeLegendCode]'] = target_type_code
-                logger.debug(f"Legend codes: CallResult={call_result_code}, TargetType={target_type_code}")
-
-                # Lookup legend strings
-                if enable_legend_strings:
-                    enriched['CallQueue[CQCallResultLegendString]'] = CALL_RESULT_LEGEND_STRINGS.get(call_result_code, "Unknown")
-                    enriched['CallQueue[CQTargetTypeLegendString]'] = TARGET_TYPE_LEGEND_STRINGS.get(target_type_code, "Unknown")
-                else:
-                    enriched['CallQueue[CQCallResultLegendString]'] = ''
-                    enriched['CallQueue[CQTargetTypeLegendString]'] = ''
-            else:
-                logger.debug("Legend codes disabled")
-                enriched['CallQueue[CQCallResultLegendCode]'] = 0
-                enriched['CallQueue[CQTargetTypeLegendCode]'] = 0
-                enriched['CallQueue[CQCallResultLegendString]'] = ''
-                enriched['CallQueue[CQTargetTypeLegendString]'] = ''
-
-            # ====================================================================
-            # STEP 8: Calculate abandoned count
-            # ====================================================================
-            logger.debug(f"Step 8/11: Calculating abandoned count for record {idx + 1}")
-            enriched['CallQueue[CQCallCountAbandoned]'] = calculate_abandoned_count(raw_call_result, cq_target_type)
-
-            # ====================================================================
-            # STEP 9: Extract queue names
-            # ====================================================================
-            logger.debug(f"Step 9/11: Extracting queue names for record {idx + 1}")
-            queue_identity = raw_record.get('CallQueueIdentity', '')
-            ra_name = extract_queue_ra_name(queue_identity)
-            enriched['CallQueue[CQRAName]'] = ra_name
-            enriched['CallQueue[CQSlicer]'] = ra_name  # Simple mode: use RA name
-            enriched['CallQueue[CQName]'] = ''  # No lookup in simple mode
-            logger.debug(f"Queue names: Identity={queue_identity}, RAName={ra_name}")
-
-            # ====================================================================
-            # STEP 10: Create composite key
-            # ====================================================================
-            logger.debug(f"Step 10/11: Creating composite key for record {idx + 1}")
-            enriched['CallQueue[DateTimeCQName]'] = format_datetime_cqname(call_start_local, ra_name)
-
-            # ====================================================================
-            # STEP 11: Copy/rename other fields
-            # ====================================================================
-            logger.debug(f"Step 11/11: Copying/renaming final fields for record {idx + 1}")
-            enriched['CallQueue[CQGUID]'] = raw_record.get('CallQueueId', '')
-            enriched['CallQueue[CQAgentCount]'] = raw_record.get('CallQueueAgentCount', 0)
-            enriched['CallQueue[CQAgentOptInCount]'] = raw_record.get('CallQueueAgentOptInCount', 0)
-            enriched['CallQueue[CQCallDurationSeconds]'] = raw_record.get('CallQueueDurationSeconds', 0)
-            enriched['CallQueue[CQCallCount]'] = raw_record.get('TotalCallCount', 1)
-            enriched['CallQueue[CQCallResultRaw]'] = raw_call_result
-            enriched['CallQueue[PSTNTotalMinutes]'] = raw_record.get('PSTNTotalMinutes', 0)
-            enriched['CallQueue[LanguageCode]'] = language_code
-
-            enriched_data.append(enriched)
-
-            if (idx + 1) % 100 == 0:
-                logger.info(f"Progress: Enriched {idx + 1}/{len(raw_data_list)} records")
-
-        except Exception as e:
-            failed_count += 1
-            logger.error(f"Failed to enrich record {idx + 1}/{len(raw_data_list)}: {str(e)}", exc_info=True)
-            logger.debug(f"Failed record data: {raw_record}")
-            # Continue processing remaining records
+    Args:
+        data_rows (iterable): VAAC dataResult ordered arrays (list or iterator)
+        dimensions (list): Dimension names (ordered as in API query)
+        measurements (list): Measurement names (ordered as in API query)
+        config (dict): Enrichment configuration (same keys as enrich_callqueue_data)
+        logger (logging.Logger, optional): Logger instance
+        metrics (RunMetrics, optional): Run metrics receiving the failure counts
+        rollup (HourlyQueueRollup, optional): Receives the enriched records in output order
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
 
-    # Final summary
-    logger.info(f"Enrichment complete: {len(enriched_data)} successful, {failed_count} failed")
-    logger.info(f"Timestamp parsing: {timestamp_parse_success} successful, {timestamp_parse_fail} failed")
-    if enriched_data and logger.isEnabledFor(logging.DEBUG):
-        logger.debug(f"Sample enriched record (first): {enriched_data[0]}")
+    Yields:
+        dict: Enriched data dictionaries with CallQueue[field] structure, in input order
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
 
-    return enriched_data
+    if config is None:
+        config = {}
+
+    return iter_enrich_columns(CALLQUEUE_SPEC, data_rows, dimensions, measurements, config, logger, metrics,
+                               rollup, on_drop)
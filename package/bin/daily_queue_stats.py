@@ -0,0 +1,207 @@
+"""
+Daily Call Queue Statistics
+
+Hourly rollups written per run are partial whenever a run window ends
+within an hour or a day. DailyQueueStats keeps running aggregates per local
+day and queue of an input in the KV Store and adds the hourly aggregates of
+each run to them as the calls are written, so daily KPIs are available
+without searching the per-call events.
+
+- Day records are stored in the splunk_msteams_queue_stats KV collection
+  ("<input>_<YYYY-MM-DD>", one aggregate per queue, see
+  queue_rollup.aggregate_fields) with a per-input list of open days
+  ("<input>_open_days")
+- The day is the local day of CallQueue[Date] (the input's timezone)
+- Once the input has written every call up to the end of a local day, the
+  day is published as one msteams:vaac:callqueue:daily event per queue and
+  marked complete. Calls added to a complete day later (e.g. by an
+  overlapping query) reopen it, and it is published again with the new
+  totals.
+"""
+
+import logging
+import threading
+from datetime import datetime, timezone
+
+from callqueue_enrichment import convert_to_local_timezone
+from queue_rollup import aggregate_fields, aggregate_from_fields, merge_aggregate, new_aggregate
+
+
+# KV collection of the day records
+QUEUE_STATS_COLLECTION = "splunk_msteams_queue_stats"
+
+# Sourcetype of the published day summaries
+DAILY_SOURCETYPE = "msteams:vaac:callqueue:daily"
+
+# Status of a day still receiving calls
+DAY_OPEN = "open"
+
+# Status of a published day
+DAY_COMPLETE = "complete"
+
+
+class DailyQueueStats:
+    """
+    Per-day, per-queue running aggregates of one input, stored in the KV Store.
+
+    merge() adds the hourly aggregates of written calls to the loaded day
+    records and save() persists the changed days. complete_days() lists the
+    days that are over, day_events() builds their summary events and
+    mark_complete() records them as published. Thread-safe (backfill days of
+    an input share one instance).
+
+    Args:
+        store: KVStoreCheckpointer of the splunk_msteams_queue_stats collection
+        input_name (str): Normalized input name
+        timezone_offset (str): Timezone of the input's local days
+        logger (logging.Logger, optional): Logger instance
+    """
+
+    def __init__(self, store, input_name, timezone_offset, logger=None):
+        self._store = store
+        self._input_name = input_name
+        self._timezone_offset = timezone_offset
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._days = {}
+        self._dirty = set()
+        self._open_days = None
+
+    def _key(self, day):
+        return f"{self._input_name}_{day}"
+
+    def _open_days_key(self):
+        return f"{self._input_name}_open_days"
+
+    def _day(self, day):
+        # Called with the lock held; day record with the queue aggregates rebuilt
+        record = self._days.get(day)
+        if record is None:
+            record = {"status": DAY_OPEN, "queues": {}}
+            try:
+                stored = self._store.get(self._key(day))
+                if stored:
+                    record["status"] = stored.get("status", DAY_OPEN)
+                    record["queues"] = {queue: aggregate_from_fields(fields)
+                                        for queue, fields in (stored.get("queues") or {}).items()}
+            except Exception as e:
+                self.logger.warning(f"Failed to load daily queue statistics of {day}: {str(e)}")
+            self._days[day] = record
+        return record
+
+    def _load_open_days(self):
+        # Called with the lock held
+        if self._open_days is None:
+            try:
+                stored = self._store.get(self._open_days_key()) or {}
+                self._open_days = set(stored.get("days", []))
+            except Exception as e:
+                self.logger.warning(f"Failed to load the open days of the daily queue statistics: {str(e)}")
+                self._open_days = set()
+        return self._open_days
+
+    def merge(self, hourly):
+        """
+        Add hourly aggregates of written calls to their days.
+
+        Args:
+            hourly (dict): (CallQueue[Date], CallQueue[CQRAName]) -> aggregate,
+                see HourlyQueueRollup.take_delta
+        """
+        if not hourly:
+            return
+        with self._lock:
+            for (date, ra_name), aggregate in hourly.items():
+                # CallQueue[Date] is the local hour, so its date part is the local day
+                day = date[:10]
+                record = self._day(day)
+                queue = record["queues"].get(ra_name)
+                if queue is None:
+                    record["queues"][ra_name] = queue = new_aggregate()
+                merge_aggregate(queue, aggregate)
+                record["status"] = DAY_OPEN
+                self._dirty.add(day)
+
+    def save(self):
+        """Persist the changed day records and the list of open days."""
+        with self._lock:
+            try:
+                self._save()
+            except Exception as e:
+                # Not critical: the calls of this run are missing from the day totals
+                self.logger.error(f"Failed to save daily queue statistics: {str(e)}")
+
+    def _save(self):
+        # Called with the lock held
+        if not self._dirty:
+            return
+        open_days = self._load_open_days()
+        updated_at = datetime.now(timezone.utc).isoformat()
+        states = []
+        for day in sorted(self._dirty):
+            record = self._days[day]
+            states.append({"_key": self._key(day), "state": {
+                "input": self._input_name,
+                "day": day,
+                "timezone": self._timezone_offset,
+                "status": record["status"],
+                "queues": {queue: aggregate_fields(aggregate) for queue, aggregate in record["queues"].items()},
+                "updated_at": updated_at,
+            }})
+            if record["status"] == DAY_OPEN:
+                open_days.add(day)
+            else:
+                open_days.discard(day)
+        self._store.batch_update(states)
+        self._store.update(self._open_days_key(), {"days": sorted(open_days)})
+        self._dirty.clear()
+
+    def complete_days(self, through):
+        """
+        List the open days that ended before `through`.
+
+        Args:
+            through (datetime): Aware UTC time up to which every call of the
+                input is written
+
+        Returns:
+            list: Days (YYYY-MM-DD) whose totals are final, in order
+        """
+        local_day = convert_to_local_timezone(through, self._timezone_offset, self.logger).date().isoformat()
+        with self._lock:
+            return sorted(day for day in self._load_open_days() | self._dirty
+                          if day < local_day and self._day(day)["status"] == DAY_OPEN)
+
+    def day_events(self, day, **fields):
+        """
+        Build the summary events of a day, one per queue.
+
+        Args:
+            day (str): Day (YYYY-MM-DD)
+            **fields: Extra fields of every event (e.g. input)
+
+        Returns:
+            list: Events ordered by queue
+        """
+        with self._lock:
+            queues = self._day(day)["queues"]
+            events = []
+            for ra_name in sorted(queues):
+                event = {'day': day, 'CallQueue[CQRAName]': ra_name, 'timezone': self._timezone_offset}
+                event.update(fields)
+                event.update(aggregate_fields(queues[ra_name]))
+                events.append(event)
+            return events
+
+    def mark_complete(self, days):
+        """
+        Mark published days complete and persist them.
+
+        Args:
+            days (list): Published days (YYYY-MM-DD)
+        """
+        with self._lock:
+            for day in days:
+                self._day(day)["status"] = DAY_COMPLETE
+                self._dirty.add(day)
+        self.save()
@@ -0,0 +1,293 @@
+"""
+Persistent Duplicate-Suppression Index
+
+Remembers the calls already written by an input so rows returned again by a
+later query (the `UserStartTimeUTC >= checkpoint` boundary, a window fetched
+again after a failure or restart) are dropped before they are enriched and
+written, instead of being indexed twice.
+
+- Rows are identified by a stable 64-bit hash of DocumentId, ConferenceId,
+  DialogId and UserStartTimeUTC
+- Hashes are partitioned by the UTC day of UserStartTimeUTC; only the
+  partitions of days a run touches are loaded
+- Partitions are stored in the splunk_msteams_checkpoints KV collection
+  ("<input>_dedup_<YYYY-MM-DD>", packed sorted hashes) with a per-input list
+  of partition days ("<input>_dedup_partitions")
+- Partitions older than the retention period are deleted when the index is
+  saved and rows of those days are not checked, so memory and storage stay
+  bounded by retention days x calls per day
+"""
+
+import base64
+import hashlib
+import logging
+import threading
+from array import array
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+
+# Days of call hashes kept per input (0 disables duplicate suppression)
+DEFAULT_DEDUP_RETENTION_DAYS = 7
+
+# Dimensions identifying one call leg, in hash order
+DEDUP_KEY_FIELDS = ("DocumentId", "ConferenceId", "DialogId", "UserStartTimeUTC")
+
+
+def call_hash(values):
+    """
+    Stable 64-bit hash of a row's identifying values.
+
+    Args:
+        values (iterable): DEDUP_KEY_FIELDS values of the row
+
+    Returns:
+        int: Unsigned 64-bit hash (the same in every process)
+    """
+    text = "\x1f".join("" if value is None else str(value) for value in values)
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def _pack_hashes(hashes):
+    return base64.b64encode(array("Q", sorted(hashes)).tobytes()).decode("ascii")
+
+
+def _unpack_hashes(text):
+    hashes = array("Q")
+    hashes.frombytes(base64.b64decode(text))
+    return set(hashes)
+
+
+# Queue entry of a row dropped by enrichment (never written)
+_DROPPED = object()
+
+
+class PendingRows:
+    """
+    Hashes of the rows consumed by the pipeline, in input order, until they are written.
+
+    Enrichment drops the records it fails to enrich, so the n-th written event
+    is not the n-th consumed row. The engines report dropped rows by input
+    position (drop(), their on_drop callback) before any later record is
+    written, and DedupIndex.commit() skips them.
+
+    Attributes:
+        dropped (int): Dropped rows skipped so far
+    """
+
+    def __init__(self):
+        self._entries = deque()
+        # Input position of the oldest queued row
+        self._first = 0
+        self.dropped = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def append(self, entry):
+        """Queue the (day, hash) of the next consumed row (None: not recorded)."""
+        self._entries.append(entry)
+
+    def drop(self, position):
+        """Mark the row at an input position as dropped by enrichment."""
+        offset = position - self._first
+        if 0 <= offset < len(self._entries):
+            self._entries[offset] = _DROPPED
+
+    def take(self, count=None):
+        """
+        Remove the entries of the oldest written rows, skipping dropped rows.
+
+        Args:
+            count (int, optional): Number of written rows, all queued rows if None
+
+        Returns:
+            list: (day, hash) or None per written row
+        """
+        entries = self._entries
+        taken = []
+        while entries and (count is None or len(taken) < count):
+            entry = entries.popleft()
+            self._first += 1
+            if entry is _DROPPED:
+                self.dropped += 1
+            else:
+                taken.append(entry)
+        # Dropped rows right after the last written one
+        while entries and entries[0] is _DROPPED:
+            entries.popleft()
+            self._first += 1
+            self.dropped += 1
+        return taken
+
+
+class DedupIndex:
+    """
+    Day-partitioned set of written call hashes of one input.
+
+    filter_rows() only checks rows (it may run in window fetch threads whose
+    rows are discarded after a failure). record_rows() queues the rows the
+    pipeline actually consumes, in order, in a PendingRows; commit() merges
+    them as they are written (skipping rows enrichment dropped) and save()
+    persists the merged hashes, so a failed run never suppresses rows it did
+    not write.
+
+    Args:
+        checkpoint_helper: KVStoreCheckpointer of the input
+        input_name (str): Normalized input name
+        retention_days (int): Days of partitions to keep
+        logger (logging.Logger, optional): Logger instance
+
+    Attributes:
+        suppressed (int): Duplicate rows dropped
+        recorded (int): New rows recorded
+    """
+
+    def __init__(self, checkpoint_helper, input_name, retention_days=DEFAULT_DEDUP_RETENTION_DAYS, logger=None):
+        self._checkpoint_helper = checkpoint_helper
+        self._input_name = input_name
+        self.retention_days = max(1, int(retention_days))
+        self.logger = logger or logging.getLogger(__name__)
+        # Rows of days before the horizon are neither checked nor recorded
+        horizon = datetime.now(timezone.utc).date() - timedelta(days=self.retention_days - 1)
+        self._horizon = horizon.isoformat()
+        self._lock = threading.Lock()
+        self._partitions = {}
+        self._dirty = set()
+        self._stored_days = None
+        self.suppressed = 0
+        self.recorded = 0
+
+    def _key(self, day):
+        return f"{self._input_name}_dedup_{day}"
+
+    def _manifest_key(self):
+        return f"{self._input_name}_dedup_partitions"
+
+    def _partition(self, day):
+        # Called with the lock held
+        partition = self._partitions.get(day)
+        if partition is None:
+            partition = set()
+            try:
+                record = self._checkpoint_helper.get(self._key(day))
+                if record and record.get("hashes"):
+                    partition = _unpack_hashes(record["hashes"])
+            except Exception as e:
+                self.logger.warning(f"Failed to load duplicate index partition {day}: {str(e)}")
+            self._partitions[day] = partition
+        return partition
+
+    def filter_rows(self, rows, key_positions, time_position):
+        """
+        Yield the rows that were not recorded before.
+
+        Args:
+            rows (iterable): Ordered arrays
+            key_positions (list): Positions of the DEDUP_KEY_FIELDS values in a row
+            time_position (int): Position of UserStartTimeUTC in a row
+
+        Yields:
+            list: Rows not seen before
+        """
+        for row in rows:
+            day = str(row[time_position])[:10]
+            if day >= self._horizon:
+                key = call_hash([row[position] for position in key_positions])
+                with self._lock:
+                    if key in self._partition(day):
+                        self.suppressed += 1
+                        continue
+            yield row
+
+    def record_rows(self, rows, key_positions, time_position, pending):
+        """
+        Queue the hashes of every row passing through (rows about to be enriched and written).
+
+        Args:
+            rows (iterable): Ordered arrays
+            key_positions (list): Positions of the DEDUP_KEY_FIELDS values in a row
+            time_position (int): Position of UserStartTimeUTC in a row
+            pending (PendingRows): Queue of (day, hash) per row (None for rows
+                before the horizon), see commit()
+
+        Yields:
+            list: The same rows
+        """
+        for row in rows:
+            day = str(row[time_position])[:10]
+            if day >= self._horizon:
+                pending.append((day, call_hash([row[position] for position in key_positions])))
+            else:
+                pending.append(None)
+            yield row
+
+    def commit(self, pending, count):
+        """
+        Merge the oldest queued rows once they are written.
+
+        Args:
+            pending (PendingRows): Queue filled by record_rows()
+            count (int): Number of rows written since the last commit
+        """
+        entries = pending.take(count)
+        if len(entries) < count:
+            self.logger.warning(f"{count - len(entries)} written events had no queued row for duplicate suppression")
+        with self._lock:
+            for entry in entries:
+                if entry is None:
+                    continue
+                day, key = entry
+                partition = self._partition(day)
+                if key not in partition:
+                    partition.add(key)
+                    self.recorded += 1
+                    self._dirty.add(day)
+
+    def release(self, pending):
+        """
+        Forget the rows still queued after the last write; they are not recorded.
+
+        Args:
+            pending (PendingRows): Queue filled by record_rows()
+
+        Returns:
+            int: Queued rows without a written event (other than dropped rows)
+        """
+        unwritten = len(pending.take())
+        if pending.dropped:
+            self.logger.info(f"{pending.dropped} rows dropped by enrichment were not recorded as ingested")
+        if unwritten:
+            self.logger.warning(f"{unwritten} queued rows had no matching written event, not recorded as ingested")
+        return unwritten
+
+    def save(self):
+        """Persist changed partitions and delete the expired ones."""
+        with self._lock:
+            try:
+                if self._stored_days is None:
+                    manifest = self._checkpoint_helper.get(self._manifest_key()) or {}
+                    self._stored_days = set(manifest.get("days", []))
+
+                for day in sorted(self._dirty):
+                    partition = self._partitions[day]
+                    self._checkpoint_helper.update(self._key(day), {
+                        "day": day,
+                        "count": len(partition),
+                        "hashes": _pack_hashes(partition),
+                    })
+                    self._stored_days.add(day)
+                self._dirty.clear()
+
+                expired = sorted(day for day in self._stored_days if day < self._horizon)
+                for day in expired:
+                    self._checkpoint_helper.delete(self._key(day))
+                    self._stored_days.discard(day)
+                    self._partitions.pop(day, None)
+
+                self._checkpoint_helper.update(self._manifest_key(), {"days": sorted(self._stored_days)})
+                if expired:
+                    self.logger.info(f"Expired {len(expired)} duplicate index partitions ({expired[0]} to {expired[-1]})")
+            except Exception as e:
+                # Not critical: rows of this run are only not suppressed if queried again
+                self.logger.error(f"Failed to save duplicate index: {str(e)}")
@@ -0,0 +1,619 @@
+"""
+Declarative Enrichment Field Mapping
+
+Every enriched output column of a report type is declared once, as a Field of
+a FieldSpec (see CALLQUEUE_SPEC in callqueue_enrichment and
+AUTOATTENDANT_SPEC in autoattendant_enrichment):
+
+- Field(key, source, default): the raw record's `source` field, `default`
+  when missing (record.get(source, default))
+- Field(key, derived_name, item=N): item N of a Derived value (the whole
+  value if item is None)
+- Field(key, Option(name)): the enrichment config value `name`
+- Field(key, None, value): a constant
+- requires / disabled: the field is the constant `disabled` unless all the
+  listed config flags are on (e.g. enable_legend_codes)
+
+A Derived value (name, inputs, build) is computed once per record from raw
+fields ((field, default) pairs) and earlier derived values (their names).
+build(options, logger) returns the function computing it, specialized for
+the config (e.g. with or without timezone conversion); fixed(func) wraps a
+function that does not depend on the config.
+
+compile_enricher() turns a spec and a config into a CompiledEnricher whose
+row and columnar functions are generated Python code: the output dictionary
+is one dictionary display, disabled fields are constants and raw fields and
+derived values no enabled field uses are never read or computed, so the
+config flags cost nothing per record. Compiled enrichers are cached per
+spec, config and logger.
+
+The batch drivers shared by every report type are also here: the columnar
+engine over streamed ordered arrays (iter_enrich_columns) and the chunked
+process pool (enrich_process_pool). The report modules wrap them with their
+spec and chunk worker.
+"""
+
+import logging
+import multiprocessing
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import chain, islice
+from operator import itemgetter
+
+from async_logging import DEFAULT_DEBUG_SAMPLE_RATE, trace_interval
+
+
+# Output column: see the module docstring
+Field = namedtuple("Field", ["key", "source", "default", "item", "requires", "disabled"],
+                   defaults=('', None, (), None))
+
+# Value computed once per record by the function build(options, logger) returns
+Derived = namedtuple("Derived", ["name", "inputs", "build"])
+
+# Enrichment config value used as a field value
+Option = namedtuple("Option", ["name"])
+
+
+def fixed(func):
+    """Derived build of a function that does not depend on the config."""
+    return lambda options, logger: func
+
+
+class FieldSpec(namedtuple("FieldSpec", ["name", "options", "derived", "fields", "parse_failure"])):
+    """
+    Declarative field mapping of one report type.
+
+    Args:
+        name (str): Report type name (log messages, cache key)
+        options (tuple): (config key, default) pairs the spec depends on
+        derived (tuple): Derived values, in evaluation order
+        fields (tuple): Output Fields, in output order
+        parse_failure (tuple): (derived name, item) whose falsy value counts
+            as a timestamp parse failure
+    """
+
+    __slots__ = ()
+
+    @property
+    def keys(self):
+        """Output keys in order."""
+        return tuple(field.key for field in self.fields)
+
+
+# Default number of records enriched per batch
+DEFAULT_BATCH_SIZE = 5000
+
+# Default number of records sent to a worker process per task
+DEFAULT_PROCESS_CHUNK_SIZE = 5000
+
+# Marker for column cells whose value could not be computed (record is dropped)
+_FAILED = object()
+
+# Upper bound for cached compiled enrichers (configs x loggers)
+MAX_COMPILED_ENRICHERS = 64
+
+_COMPILED = {}
+_COMPILED_LOCK = threading.Lock()
+
+# Types whose repr() is a valid literal in generated code
+_LITERAL_TYPES = (str, int, float, bool, type(None))
+
+
+def _extract_column(rows, position, row_width):
+    """
+    Extract the values at one array position from every ordered array row.
+
+    Rows shorter than the position yield None, as in transform_ordered_arrays_to_dicts.
+
+    Args:
+        rows (list): VAAC dataResult ordered arrays
+        position (int): Array position of the field
+        row_width (int): Minimum row length across all rows
+
+    Returns:
+        list: Column values, one per row
+    """
+    if position < row_width:
+        return list(map(itemgetter(position), rows))
+    return [row[position] if position < len(row) else None for row in rows]
+
+
+def _map_distinct(func, *columns):
+    """
+    Apply func once per distinct value (or value tuple) of the given columns.
+
+    Cells where func raises are returned as _FAILED so the caller can drop the
+    row, matching the per-record try/except of the row engine.
+
+    Args:
+        func (callable): Function applied to each distinct value
+        *columns: One or more equally sized columns
+
+    Returns:
+        list: func results, one per row
+    """
+    cache = {}
+    results = []
+    append = results.append
+    for values in zip(*columns):
+        try:
+            append(cache[values])
+            continue
+        except KeyError:
+            pass
+        except TypeError:
+            # Unhashable cell value, compute without caching
+            try:
+                append(func(*values))
+            except Exception:
+                append(_FAILED)
+            continue
+        try:
+            result = func(*values)
+        except Exception:
+            result = _FAILED
+        cache[values] = result
+        append(result)
+    return results
+
+
+def _failed_inputs(func):
+    """Wrap a derived function so rows with a failed derived input fail too."""
+    def wrapped(*values):
+        if _FAILED in values:
+            raise ValueError("derived input failed")
+        return func(*values)
+    return wrapped
+
+
+class CompiledEnricher:
+    """
+    Enrichment functions of one FieldSpec, specialized for one config.
+
+    Use compile_enricher() rather than creating instances directly.
+
+    Attributes:
+        keys (tuple): Output keys in order
+    """
+
+    def __init__(self, spec, options, logger, trace_every):
+        self.spec = spec
+        self.keys = spec.keys
+        self.logger = logger
+        self._namespace = {'_FAILED': _FAILED}
+        self._literals = {}
+
+        # Resolve every field to an expression over raw locals r<N> and derived locals d_<name>
+        derived_by_name = {derived.name: derived for derived in spec.derived}
+        self._raw = []
+        raw_index = {}
+        used_derived = set()
+
+        def raw_local(source, default):
+            key = (source, default)
+            if key not in raw_index:
+                raw_index[key] = len(self._raw)
+                self._raw.append(key)
+            return f"r{raw_index[key]}"
+
+        def item_expression(name, item):
+            used_derived.add(name)
+            return f"d_{name}" if item is None else f"d_{name}[{item!r}]"
+
+        expressions = []
+        for field in spec.fields:
+            if field.requires and not all(options[flag] for flag in field.requires):
+                expressions.append(self._literal(field.disabled))
+            elif isinstance(field.source, Option):
+                expressions.append(self._literal(options[field.source.name]))
+            elif field.source is None:
+                expressions.append(self._literal(field.default))
+            elif field.source in derived_by_name:
+                expressions.append(item_expression(field.source, field.item))
+            else:
+                expressions.append(raw_local(field.source, field.default))
+        # Raw fields read for the output (columnar: zipped columns)
+        self._output_raw = list(self._raw)
+
+        parse_name, parse_item = spec.parse_failure
+        used_derived.add(parse_name)
+        # Derived values needed by used ones, in evaluation order
+        for derived in reversed(spec.derived):
+            if derived.name in used_derived:
+                used_derived.update(entry for entry in derived.inputs if isinstance(entry, str))
+        self._derived = []
+        for derived in spec.derived:
+            if derived.name not in used_derived:
+                continue
+            inputs = [f"d_{entry}" if isinstance(entry, str) else raw_local(*entry) for entry in derived.inputs]
+            self._namespace[f"f_{derived.name}"] = derived.build(options, logger)
+            self._derived.append((derived, inputs))
+
+        self._expressions = expressions
+        self._parse_failure = (parse_name, parse_item)
+        self.rows = self._compile_rows(trace_every)
+        self._assemble = self._compile_assemble()
+
+    def _literal(self, value):
+        """Return the code expression of a constant value."""
+        # Floats go through the namespace too (repr of nan/inf is not a literal)
+        if isinstance(value, _LITERAL_TYPES) and not isinstance(value, float):
+            return repr(value)
+        name = self._literals.get(id(value))
+        if name is None:
+            name = self._literals[id(value)] = f"c{len(self._literals)}"
+            self._namespace[name] = value
+        return name
+
+    def _display(self):
+        """Dictionary display of the output record."""
+        return "{" + ", ".join(f"{key!r}: {expression}"
+                               for key, expression in zip(self.keys, self._expressions)) + "}"
+
+    def _compile(self, name, lines):
+        code = "\n".join(lines)
+        exec(compile(code, f"<{self.spec.name} enrichment>", "exec"), self._namespace)
+        return self._namespace[name]
+
+    def _compile_rows(self, trace_every):
+        """Generate the row function (see rows())."""
+        parse_name, parse_item = self._parse_failure
+        lines = [
+            "def rows(records, first_index=0, on_failure=None):",
+            "    enriched = []",
+            "    append = enriched.append",
+            "    failed = 0",
+            "    parse_failures = 0",
+            "    for idx, record in enumerate(records, first_index):",
+            "        try:",
+            "            get = record.get",
+        ]
+        lines += [f"            r{index} = get({source!r}, {self._literal(default)})"
+                  for index, (source, default) in enumerate(self._raw)]
+        for derived, inputs in self._derived:
+            lines.append(f"            d_{derived.name} = f_{derived.name}({', '.join(inputs)})")
+            if derived.name == parse_name:
+                lines += [f"            if not d_{parse_name}[{parse_item!r}]:",
+                          "                parse_failures += 1"]
+        lines.append(f"            append({self._display()})")
+        if trace_every:
+            # Debug traces of every Nth record (only compiled while DEBUG is on)
+            lines += [f"            if idx % {trace_every} == 0:",
+                      "                trace(idx, record, enriched[-1])"]
+        lines += [
+            "        except Exception as e:",
+            "            failed += 1",
+            "            if on_failure is not None:",
+            "                on_failure(idx, record, e)",
+            "    return enriched, failed, parse_failures",
+        ]
+        self._namespace['trace'] = self._trace
+        return self._compile("rows", lines)
+
+    def _compile_assemble(self):
+        """Generate the columnar assembly loop (see columns())."""
+        parse_name, parse_item = self._parse_failure
+        names = [f"r{index}" for index in range(len(self._output_raw))]
+        names += [f"d_{derived.name}" for derived, _ in self._derived]
+        lines = [
+            "def assemble(columns):",
+            "    enriched = []",
+            "    append = enriched.append",
+            "    failed = 0",
+            "    parse_failures = 0",
+            f"    for ({', '.join(names)},) in zip(*columns):",
+        ]
+        # Same order as the row function: a failed derived value drops the
+        # record before later values are looked at
+        for derived, _ in self._derived:
+            lines += [f"        if d_{derived.name} is _FAILED:",
+                      "            failed += 1",
+                      "            continue"]
+            if derived.name == parse_name:
+                lines += [f"        if not d_{parse_name}[{parse_item!r}]:",
+                          "            parse_failures += 1"]
+        lines += [
+            f"        append({self._display()})",
+            "    return enriched, failed, parse_failures",
+        ]
+        return self._compile("assemble", lines)
+
+    def _trace(self, idx, record, enriched):
+        self.logger.debug(f"{self.spec.name} record {idx + 1}: {dict(record)} → {enriched}")
+
+    def columns(self, data_result, dimensions, measurements, first_index=0, on_failure=None):
+        """
+        Enrich VAAC ordered arrays using whole-column operations.
+
+        Each raw field is extracted once as a column and each derived value is
+        computed once per distinct input value (call results, target types,
+        identities and timestamps repeat heavily). The output is identical to
+        rows() applied to transform_ordered_arrays_to_dicts(data_result,
+        dimensions, measurements).
+
+        Args:
+            data_result (list): VAAC dataResult ordered arrays
+            dimensions (list): Dimension names (ordered as in API query)
+            measurements (list): Measurement names (ordered as in API query)
+            first_index (int): Position of the first row in the whole input
+            on_failure (callable, optional): Called as on_failure(idx, row, None)
+                for every dropped row, as rows() does (the exception is not kept)
+
+        Returns:
+            tuple: (enriched records, failed count, timestamp parse failure count)
+        """
+        row_count = len(data_result)
+        if row_count == 0:
+            return [], 0, 0
+
+        field_index = {}
+        for idx, field_name in enumerate(list(dimensions) + list(measurements)):
+            # Later duplicates win, as with dictionary assignment
+            field_index[field_name] = idx
+        row_width = min(map(len, data_result))
+
+        raw_columns = []
+        for source, default in self._raw:
+            position = field_index.get(source)
+            if position is None:
+                # Field not part of the query: dict.get() default for every row
+                raw_columns.append([default] * row_count)
+            else:
+                raw_columns.append(_extract_column(data_result, position, row_width))
+
+        derived_columns = {}
+        for derived, inputs in self._derived:
+            func = self._namespace[f"f_{derived.name}"]
+            if any(entry.startswith("d_") for entry in inputs):
+                func = _failed_inputs(func)
+            input_columns = [derived_columns[entry] if entry.startswith("d_") else raw_columns[int(entry[1:])]
+                             for entry in inputs]
+            derived_columns[f"d_{derived.name}"] = _map_distinct(func, *input_columns)
+
+        columns = raw_columns[:len(self._output_raw)]
+        columns += [derived_columns[f"d_{derived.name}"] for derived, _ in self._derived]
+        enriched, failed, parse_failures = self._assemble(columns)
+        if failed and on_failure is not None:
+            # Dropped rows are those with a failed derived value
+            for idx, values in enumerate(zip(*columns[len(self._output_raw):])):
+                if any(value is _FAILED for value in values):
+                    on_failure(first_index + idx, data_result[idx], None)
+        return enriched, failed, parse_failures
+
+
+def compile_enricher(spec, config=None, logger=None):
+    """
+    Return the CompiledEnricher of a spec for a config, compiling it on first use.
+
+    Args:
+        spec (FieldSpec): Field mapping of the report type
+        config (dict, optional): Enrichment configuration (the spec's options,
+            debug_sample_rate)
+        logger (logging.Logger, optional): Logger of the derived functions and
+            sampled debug traces
+
+    Returns:
+        CompiledEnricher: Cached per spec, option values, logger and trace interval
+    """
+    if config is None:
+        config = {}
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    options = {name: config.get(name, default) for name, default in spec.options}
+    # Per-record debug traces for every Nth record only (0: DEBUG off)
+    trace_every = trace_interval(logger, config.get('debug_sample_rate', DEFAULT_DEBUG_SAMPLE_RATE))
+    key = (spec.name, tuple(options.values()), logger, trace_every)
+    try:
+        return _COMPILED[key]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable option value, compile without caching
+        return CompiledEnricher(spec, options, logger, trace_every)
+
+    enricher = CompiledEnricher(spec, options, logger, trace_every)
+    with _COMPILED_LOCK:
+        if len(_COMPILED) >= MAX_COMPILED_ENRICHERS:
+            _COMPILED.clear()
+        _COMPILED[key] = enricher
+    return enricher
+
+
+# ============================================================================
+# BATCH DRIVERS (shared by the report types)
+# ============================================================================
+
+def enrich_columns(spec, data_result, dimensions, measurements, config, logger, metrics=None, first_index=0,
+                   on_drop=None):
+    """
+    Enrich one batch of VAAC ordered arrays with the columnar engine of a spec.
+
+    Args:
+        spec (FieldSpec): Field mapping of the report type
+        data_result (list): VAAC dataResult ordered arrays
+        dimensions (list): Dimension names (ordered as in API query)
+        measurements (list): Measurement names (ordered as in API query)
+        config (dict): Enrichment configuration
+        logger (logging.Logger): Logger instance
+        metrics (RunMetrics, optional): Run metrics receiving the failure counts
+        first_index (int): Position of the first row in the whole input
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
+
+    Returns:
+        list: Enriched data dictionaries
+    """
+    row_count = len(data_result)
+    logger.info(f"Starting columnar {spec.name} enrichment for {row_count} records")
+    enricher = compile_enricher(spec, config, logger)
+    enriched_data, failed_count, timestamp_parse_fail = enricher.columns(
+        data_result, dimensions, measurements, first_index,
+        None if on_drop is None else lambda idx, _row, _e: on_drop(idx)
+    )
+
+    if metrics is not None:
+        metrics.count("timestamp_parse_failures", timestamp_parse_fail)
+        metrics.count("enrichment_failures", failed_count)
+
+    # Final summary
+    timestamp_parse_success = row_count - failed_count - timestamp_parse_fail
+    logger.info(f"{spec.name} enrichment complete: {len(enriched_data)} successful, {failed_count} failed")
+    logger.info(f"Timestamp parsing: {timestamp_parse_success} successful, {timestamp_parse_fail} failed")
+    if enriched_data and logger.isEnabledFor(logging.DEBUG):
+        logger.debug(f"Sample enriched {spec.name} record (first): {enriched_data[0]}")
+
+    return enriched_data
+
+
+def iter_enrich_columns(spec, data_rows, dimensions, measurements, config, logger, metrics=None, rollup=None,
+                        on_drop=None):
+    """
+    Enrich an iterable of VAAC ordered arrays with the columnar engine of a spec.
+
+    Rows are pulled in batches of config['batch_size'] (default DEFAULT_BATCH_SIZE)
+    and each batch is enriched with enrich_columns, so a streamed response never
+    has to be held in memory as a whole.
+
+    Args:
+        spec (FieldSpec): Field mapping of the report type
+        data_rows (iterable): VAAC dataResult ordered arrays (list or iterator)
+        dimensions (list): Dimension names (ordered as in API query)
+        measurements (list): Measurement names (ordered as in API query)
+        config (dict): Enrichment configuration
+        logger (logging.Logger): Logger instance
+        metrics (RunMetrics, optional): Run metrics receiving the failure counts
+        rollup (HourlyQueueRollup, optional): Receives the enriched records in output order
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
+
+    Yields:
+        dict: Enriched data dictionaries, in input order
+    """
+    rows = iter(data_rows)
+    batch_size = max(1, int(config.get('batch_size', DEFAULT_BATCH_SIZE)))
+    total = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            break
+        enriched = enrich_columns(spec, batch, dimensions, measurements, config, logger, metrics, total, on_drop)
+        total += len(batch)
+        if rollup is not None:
+            rollup.record(enriched)
+        yield from enriched
+
+
+def _process_pool_context():
+    """
+    Multiprocessing context for the enrichment process pool.
+
+    Forking is only safe while no other threads run, which is never certain
+    here: window fetch threads prefetch the next query window (inside
+    requests/urllib3/ssl calls) and inputs may run in worker threads, so a
+    forked worker could inherit a lock one of them holds. The pool always uses
+    forkserver, or spawn where forkserver is unavailable (Windows). Workers
+    import the chunk worker's module instead of inheriting the process.
+    """
+    start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(start_method)
+
+
+def enrich_process_pool(spec, chunk_worker, raw_data, config, logger, parallel_workers, chunk_size, metrics=None,
+                        rollup=None, on_drop=None):
+    """
+    Enrich records by sending contiguous chunks to a process pool.
+
+    Enrichment is pure Python and holds the GIL, so threads cannot run it
+    concurrently. Each worker process enriches a whole chunk with chunk_worker
+    and returns it pickled. At most two chunks per worker are in flight and
+    chunks are yielded in submission order, so record order is preserved and
+    the input iterator is consumed lazily.
+
+    If the pool cannot be started or breaks, the remaining chunks are enriched
+    by chunk_worker in the calling process.
+
+    Args:
+        spec (FieldSpec): Field mapping of the report type (log messages)
+        chunk_worker (callable): Module-level function (imported by name in
+            the workers) enriching a (chunk_index, raw_records, config) task and
+            returning (chunk_index, enriched records, positions of the dropped
+            records in the chunk, metric counts)
+        raw_data (iterable): Raw data dictionaries
+        config (dict): Enrichment configuration
+        logger (logging.Logger): Logger instance
+        parallel_workers (int): Number of worker processes
+        chunk_size (int): Number of records per chunk
+        metrics (RunMetrics, optional): Run metrics receiving the workers' failure counts
+        rollup (HourlyQueueRollup, optional): Receives the enriched records in output order
+        on_drop (callable, optional): Called with the input position of every
+            record dropped by a failure, before any later record is yielded
+
+    Yields:
+        dict: Enriched data dictionaries, in input order
+    """
+    records = iter(raw_data)
+    max_in_flight = parallel_workers * 2
+    pending = deque()
+    # Chunk read from records but not queued yet (kept if its submit fails)
+    submitting = []
+    chunk_index = 0
+    completed = 0
+    enriched_count = 0
+    failed_count = 0
+
+    def collect(chunk, result):
+        nonlocal completed, enriched_count, failed_count
+        index, enriched, dropped, chunk_counts = result
+        if metrics is not None:
+            metrics.merge_counts(chunk_counts)
+        if on_drop is not None:
+            for position in dropped:
+                on_drop(completed + position)
+
+        completed += len(chunk)
+        enriched_count += len(enriched)
+        failed_count += len(dropped)
+        if dropped:
+            logger.error(f"Failed to enrich {len(dropped)} {spec.name} records in chunk {index + 1}")
+        logger.info(f"Progress: Completed {completed} {spec.name} records")
+        if enriched and enriched_count == len(enriched) and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Sample enriched {spec.name} record (first): {enriched[0]}")
+        if rollup is not None:
+            rollup.record(enriched)
+        return enriched
+
+    try:
+        with ProcessPoolExecutor(max_workers=parallel_workers, mp_context=_process_pool_context()) as executor:
+            while True:
+                # Keep the pool busy without reading the whole input
+                while len(pending) < max_in_flight:
+                    chunk = list(islice(records, chunk_size))
+                    if not chunk:
+                        break
+                    submitting = chunk
+                    pending.append((chunk, executor.submit(chunk_worker, (chunk_index, chunk, config))))
+                    submitting = []
+                    chunk_index += 1
+                if not pending:
+                    break
+
+                chunk, future = pending[0]
+                result = future.result()
+                pending.popleft()
+                yield from collect(chunk, result)
+    except (OSError, BrokenProcessPool) as e:
+        logger.warning(f"Process pool unavailable ({str(e)}), falling back to sequential processing")
+        # Chunks not collected yet are cut again from the same records, with the same indices
+        chunk_index -= len(pending)
+        remaining = chain(chain.from_iterable(chunk for chunk, _ in pending), submitting, records)
+        while True:
+            chunk = list(islice(remaining, chunk_size))
+            if not chunk:
+                break
+            yield from collect(chunk, chunk_worker((chunk_index, chunk, config)))
+            chunk_index += 1
+
+    # Final summary
+    logger.info(f"{spec.name} process pool enrichment complete: {enriched_count} successful, {failed_count} failed")
@@ -0,0 +1,204 @@
+"""
+Pooled HTTP Session for OAuth and VAAC API Calls
+
+All HTTP requests of the add-on go through one requests.Session per process,
+so connections to login.microsoftonline.com and the VAAC API are kept alive
+and reused instead of doing a new TCP + TLS handshake for every call.
+
+- Per-host connection pools (pool_connections hosts, pool_maxsize connections
+  per host, configurable in the add-on's Advanced settings)
+- Connection setup (TCP connect + TLS handshake) is timed per host, so each
+  run can log how many requests reused a pooled connection and the estimated
+  handshake time saved (see ConnectionStats / handshake_summary)
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+# Number of hosts with a connection pool (OAuth + VAAC, plus headroom)
+DEFAULT_POOL_CONNECTIONS = 4
+
+# Connections kept alive per host (should cover concurrently running inputs)
+DEFAULT_POOL_MAXSIZE = 10
+
+
+class ConnectionStats:
+    """
+    Thread-safe per-host counters of requests and new connections.
+
+    Counters are kept for the whole process and per thread: requests and
+    connection setup run in the calling thread, so the per-thread counters
+    attribute connections to the input running in that thread.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._threads = {}
+
+    def _counters(self, host):
+        thread_hosts = self._threads.setdefault(threading.get_ident(), {})
+        return [
+            hosts.setdefault(host, {"requests": 0, "connections": 0, "connect_seconds": 0.0})
+            for hosts in (self._hosts, thread_hosts)
+        ]
+
+    def record_request(self, host):
+        with self._lock:
+            for counters in self._counters(host):
+                counters["requests"] += 1
+
+    def record_connect(self, host, seconds):
+        with self._lock:
+            for counters in self._counters(host):
+                counters["connections"] += 1
+                counters["connect_seconds"] += seconds
+
+    def snapshot(self, current_thread=False):
+        """
+        Args:
+            current_thread (bool): Only count requests made by the calling thread
+
+        Returns:
+            dict: Copy of the counters, {host: {requests, connections, connect_seconds}}
+        """
+        with self._lock:
+            hosts = self._threads.get(threading.get_ident(), {}) if current_thread else self._hosts
+            return {host: dict(counters) for host, counters in hosts.items()}
+
+
+# Counters of the shared session
+CONNECTION_STATS = ConnectionStats()
+
+
+def handshake_summary(before, after):
+    """
+    Summarize connection reuse between two ConnectionStats snapshots.
+
+    The time saved is estimated per host as the number of requests that reused
+    a pooled connection times the average connection setup time of that host.
+    Hosts without a new connection in the interval use their overall average.
+
+    Args:
+        before (dict): Snapshot taken at the start of the run
+        after (dict): Snapshot taken at the end of the run
+
+    Returns:
+        dict: requests, new_connections, reused, connect_ms, saved_ms
+    """
+    summary = {"requests": 0, "new_connections": 0, "reused": 0, "connect_ms": 0.0, "saved_ms": 0.0}
+    for host, end in after.items():
+        start = before.get(host, {"requests": 0, "connections": 0, "connect_seconds": 0.0})
+        requests_made = end["requests"] - start["requests"]
+        connections = end["connections"] - start["connections"]
+        connect_seconds = end["connect_seconds"] - start["connect_seconds"]
+        reused = max(0, requests_made - connections)
+
+        if connections:
+            average = connect_seconds / connections
+        elif end["connections"]:
+            average = end["connect_seconds"] / end["connections"]
+        else:
+            average = 0.0
+
+        summary["requests"] += requests_made
+        summary["new_connections"] += connections
+        summary["reused"] += reused
+        summary["connect_ms"] += connect_seconds * 1000
+        summary["saved_ms"] += reused * average * 1000
+    return summary
+
+
+class _TimedHTTPConnection(HTTPConnection):
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        CONNECTION_STATS.record_connect(self.host, time.perf_counter() - started)
+
+
+class _TimedHTTPSConnection(HTTPSConnection):
+    def connect(self):
+        # TCP connect + TLS handshake
+        started = time.perf_counter()
+        super().connect()
+        CONNECTION_STATS.record_connect(self.host, time.perf_counter() - started)
+
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+_TIMED_POOL_CLASSES = {"http": _TimedHTTPConnectionPool, "https": _TimedHTTPSConnectionPool}
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose connections record their setup time in CONNECTION_STATS.
+    """
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = dict(_TIMED_POOL_CLASSES)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        manager = super().proxy_manager_for(proxy, **proxy_kwargs)
+        manager.pool_classes_by_scheme = dict(_TIMED_POOL_CLASSES)
+        return manager
+
+    def send(self, request, **kwargs):
+        CONNECTION_STATS.record_request(urlsplit(request.url).hostname)
+        return super().send(request, **kwargs)
+
+
+_SESSION = None
+_SESSION_POOL_SIZES = None
+_SESSION_LOCK = threading.Lock()
+
+
+def get_session(pool_connections=DEFAULT_POOL_CONNECTIONS, pool_maxsize=DEFAULT_POOL_MAXSIZE):
+    """
+    Return the process-wide pooled session.
+
+    The session is created on first use. Asking for different pool sizes
+    replaces it for later callers (requests still running on the previous
+    session are not interrupted).
+
+    Args:
+        pool_connections (int): Number of hosts with a connection pool
+        pool_maxsize (int): Connections kept alive per host
+
+    Returns:
+        requests.Session: Shared session
+    """
+    global _SESSION, _SESSION_POOL_SIZES
+    pool_sizes = (max(1, int(pool_connections)), max(1, int(pool_maxsize)))
+    with _SESSION_LOCK:
+        if _SESSION is None or _SESSION_POOL_SIZES != pool_sizes:
+            session = requests.Session()
+            adapter = PooledHTTPAdapter(pool_connections=pool_sizes[0], pool_maxsize=pool_sizes[1])
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _SESSION = session
+            _SESSION_POOL_SIZES = pool_sizes
+        return _SESSION
+
+
+def close_session():
+    """Close the shared session and its pooled connections."""
+    global _SESSION, _SESSION_POOL_SIZES
+    with _SESSION_LOCK:
+        if _SESSION is not None:
+            _SESSION.close()
+        _SESSION = None
+        _SESSION_POOL_SIZES = None
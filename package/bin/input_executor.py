@@ -0,0 +1,105 @@
+"""
+Concurrent Input Executor
+
+Runs the inputs of one stream_events call concurrently so that the total run
+time approaches that of the slowest input instead of the sum of all VAAC API
+latencies.
+
+- Global cap: at most `max_concurrent` inputs run at the same time
+- Per-group cap: at most `max_per_group` inputs of the same group (tenant) run
+  at the same time, so one tenant's API throttling limits are not exceeded
+- Error isolation: an exception in one input is logged and recorded, the
+  other inputs keep running
+
+Inputs waiting for their tenant's cap do not occupy a global slot: the
+scheduler only starts inputs whose group has capacity left.
+"""
+
+import logging
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+
+# Default number of inputs running at the same time
+DEFAULT_MAX_CONCURRENT_INPUTS = 4
+
+# Default number of inputs of one tenant running at the same time
+DEFAULT_MAX_CONCURRENT_INPUTS_PER_TENANT = 2
+
+
+def run_concurrently(items, worker, max_concurrent=DEFAULT_MAX_CONCURRENT_INPUTS,
+                     max_per_group=DEFAULT_MAX_CONCURRENT_INPUTS_PER_TENANT,
+                     group_of=None, name_of=str, item_label="Input", logger=None):
+    """
+    Run worker(item) for every item with a global and a per-group concurrency cap.
+
+    Items are started in order, skipping items whose group is at its cap until
+    one of that group's items completes. With max_concurrent=1 the items run
+    one after another in the calling thread.
+
+    Args:
+        items (iterable): Work items (e.g. (input_name, input_item) pairs)
+        worker (callable): Function called with one item
+        max_concurrent (int): Maximum number of items running at the same time
+        max_per_group (int): Maximum number of items of one group running at the same time
+        group_of (callable, optional): Returns the group (e.g. tenant ID) of an item
+        name_of (callable): Returns the name of an item for log messages
+        item_label (str): What an item is in log messages (e.g. "Input", "Day")
+        logger (logging.Logger, optional): Logger instance
+
+    Returns:
+        dict: {item name: exception raised by the worker, or None on success}
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    grouped = group_of is not None
+    if group_of is None:
+        group_of = lambda item: None  # noqa: E731
+
+    items = list(items)
+    max_concurrent = max(1, int(max_concurrent))
+    max_per_group = max(1, int(max_per_group))
+    results = {}
+
+    def run(item):
+        try:
+            worker(item)
+            return None
+        except Exception as e:
+            logger.error(f"{item_label} '{name_of(item)}' failed: {str(e)}")
+            return e
+
+    if max_concurrent == 1 or len(items) <= 1:
+        for item in items:
+            results[name_of(item)] = run(item)
+        return results
+
+    logger.info(f"Running {len(items)} {item_label.lower()}s with up to {max_concurrent} at a time"
+                + (f" (up to {max_per_group} per tenant)" if grouped else ""))
+
+    pending = items
+    running = {}
+    running_per_group = Counter()
+    with ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="vaac_input") as executor:
+        while pending or running:
+            # Start every pending item that fits under both caps, in order
+            waiting = []
+            for item in pending:
+                group = group_of(item)
+                if len(running) < max_concurrent and running_per_group[group] < max_per_group:
+                    running[executor.submit(run, item)] = (item, group)
+                    running_per_group[group] += 1
+                else:
+                    waiting.append(item)
+            pending = waiting
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                item, group = running.pop(future)
+                running_per_group[group] -= 1
+                results[name_of(item)] = future.result()
+
+    failed = sum(1 for error in results.values() if error is not None)
+    if failed:
+        logger.warning(f"{failed} of {len(items)} {item_label.lower()}s failed")
+    return results
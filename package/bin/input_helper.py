@@ -1,6 +1,8 @@
 import json
 import logging
+import os
 import gzip
+import threading
 import base64
 import urllib.parse
 import datetime as dt
@@ -8,19 +10,83 @@ import datetime as dt
 
 import import_declare_test
 import requests
-from solnlib import conf_manager, log
+from solnlib import conf_manager, log, utils
 from solnlib.modular_input import checkpointer
 from splunklib import modularinput as smi
 
 # Import dimension configuration
 from dimension_config import get_dimensions_for_report_type, get_measurements_for_report_type
 
+# Import streaming response parser and ordered array transformation
+from vaac_stream import (
+    DataResultStream, DEFAULT_STREAM_CHUNK_SIZE, iter_ordered_arrays_as_dicts, transform_ordered_arrays_to_dicts
+)
+
 # Import enrichment modules
-from callqueue_enrichment import enrich_callqueue_data
-from autoattendant_enrichment import enrich_autoattendant_data
+from callqueue_enrichment import CALLQUEUE_OUTPUT_KEYS, enrich_callqueue_data, iter_enrich_callqueue_columns
+from autoattendant_enrichment import (
+    AUTOATTENDANT_OUTPUT_KEYS, enrich_autoattendant_data, iter_enrich_autoattendant_columns
+)
+
+# Import batched event writer
+from event_batch_writer import BatchedEventWriter, EventSerializer, DEFAULT_EVENT_BATCH_SIZE, orjson
+
+# Import OAuth token cache
+from token_cache import TokenCache
+
+# Import pooled HTTP session
+from http_session import (
+    CONNECTION_STATS, DEFAULT_POOL_CONNECTIONS, DEFAULT_POOL_MAXSIZE, get_session, handshake_summary
+)
+
+# Import query window planner
+from window_planner import (
+    DEFAULT_WINDOW_FETCH_WORKERS, DEFAULT_WINDOW_HOURS, TimeWindow, WindowedRows, WindowSplitStats,
+    iter_untruncated_rows, plan_windows, window_filters
+)
+
+# Import historical backfill helpers
+from backfill import (
+    DEFAULT_BACKFILL_CONCURRENT_DAYS, DEFAULT_BACKFILL_REQUESTS_PER_MINUTE, RateLimiter, backfill_days,
+    day_range, mark_day_complete, mark_day_progress, pending_backfill_days
+)
+
+# Import duplicate-suppression index
+from dedup_index import DEDUP_KEY_FIELDS, DEFAULT_DEDUP_RETENTION_DAYS, DedupIndex, PendingRows
+
+# Import hourly per-queue rollups
+from queue_rollup import ROLLUP_SOURCETYPE, HourlyQueueRollup
+
+# Import daily queue statistics
+from daily_queue_stats import DAILY_SOURCETYPE, QUEUE_STATS_COLLECTION, DailyQueueStats
+
+# Import per-run stage metrics
+from run_metrics import PERF_SOURCETYPE, RunMetrics, TimedCheckpointer
+
+# Import asynchronous logging and debug trace sampling
+from async_logging import DEFAULT_DEBUG_SAMPLE_RATE, enable_async_logging, stop_async_logging
+
+# Import concurrent input executor
+from input_executor import (
+    DEFAULT_MAX_CONCURRENT_INPUTS, DEFAULT_MAX_CONCURRENT_INPUTS_PER_TENANT, run_concurrently
+)
 
 
 ADDON_NAME = "splunk_msteams_aa_callqueue_reporting_addon"
+VAAC_SCOPE = "https://api.interfaces.records.teams.microsoft.com/.default"
+
+# Endpoints, overridable through splunkd's environment for load testing against a local
+# stand-in (benchmarks/vaac_standin_server.py)
+OAUTH_AUTHORITY = os.environ.get("MSTEAMS_VAAC_OAUTH_AUTHORITY", "https://login.microsoftonline.com").rstrip("/")
+VAAC_API_ENDPOINT = os.environ.get(
+    "MSTEAMS_VAAC_API_ENDPOINT",
+    "https://api.interfaces.records.teams.microsoft.com/Teams.VoiceAnalytics/getanalytics"
+)
+TOKEN_CACHE_REALM = f"{ADDON_NAME}_oauth_token_cache"
+
+# Shared by all inputs of this process (see get_token_cache)
+_TOKEN_CACHE = None
+_TOKEN_CACHE_LOCK = threading.Lock()
 
 def logger_for_input(input_name: str) -> logging.Logger:
     return log.Logs().get_logger(f"{ADDON_NAME.lower()}_{input_name}")
@@ -41,55 +107,103 @@ def get_account_credentials(session_key: str, account_name: str):
     }
 
 
-def transform_ordered_arrays_to_dicts(array_data, dimensions, measurements):
+def get_advanced_settings(logger: logging.Logger, session_key: str) -> dict:
     """
-    Transform VAAC API ordered array responses to dictionary format.
-
-    The VAAC API returns data as ordered arrays where each element's position
-    corresponds to a field in the combined dimensions + measurements list.
+    Read the add-on's Advanced settings (HTTP connection pool sizes, input
+    concurrency caps and logging mode).
 
-    Args:
-        array_data (list): List of arrays from VAAC dataResult
-        dimensions (list): List of dimension names (ordered as in API query)
-        measurements (list): List of measurement names (ordered as in API query)
+    Missing or unreadable settings fall back to the defaults.
+    """
+    settings = {
+        "http_pool_connections": DEFAULT_POOL_CONNECTIONS,
+        "http_pool_maxsize": DEFAULT_POOL_MAXSIZE,
+        "max_concurrent_inputs": DEFAULT_MAX_CONCURRENT_INPUTS,
+        "max_concurrent_inputs_per_tenant": DEFAULT_MAX_CONCURRENT_INPUTS_PER_TENANT,
+        "debug_sample_rate": DEFAULT_DEBUG_SAMPLE_RATE,
+        "async_logging": False,
+    }
+    try:
+        cfm = conf_manager.ConfManager(
+            session_key,
+            ADDON_NAME,
+            realm=f"__REST_CREDENTIAL__#{ADDON_NAME}#configs/conf-splunk_msteams_aa_callqueue_reporting_addon_settings",
+        )
+        advanced = cfm.get_conf("splunk_msteams_aa_callqueue_reporting_addon_settings").get("advanced")
+        for field in settings:
+            if field == "async_logging":
+                settings[field] = utils.is_true(advanced.get(field))
+            elif advanced.get(field):
+                settings[field] = int(advanced.get(field))
+    except Exception as e:
+        logger.debug(f"Using default advanced settings: {str(e)}")
+    return settings
 
-    Returns:
-        list: List of dictionaries with field names as keys
 
-    Example:
-        dimensions = ["UserStartTimeUTC", "CallQueueIdentity"]
-        measurements = ["TotalCallCount"]
-        array_data = [["2025-12-15T23:59:41", "CQ@example.com", 1]]
+def parse_parallel_workers(value) -> int:
+    """
+    Resolve the parallel_workers input setting to a worker count.
 
-        Returns: [{"UserStartTimeUTC": "2025-12-15T23:59:41",
-                   "CallQueueIdentity": "CQ@example.com",
-                   "TotalCallCount": 1}]
+    "auto" uses one worker per CPU core of the forwarder.
     """
-    field_names = dimensions + measurements
-    transformed = []
+    if str(value).strip().lower() == "auto":
+        return os.cpu_count() or 1
+    return max(1, int(value))
 
-    for row in array_data:
-        record = {}
-        for idx, field_name in enumerate(field_names):
-            # Use None for missing values if array is shorter than expected
-            record[field_name] = row[idx] if idx < len(row) else None
-        transformed.append(record)
 
-    return transformed
+def get_token_cache(session_key: str) -> TokenCache:
+    """
+    Return the process-wide OAuth token cache, persisted in the credential store.
+    """
+    global _TOKEN_CACHE
+    with _TOKEN_CACHE_LOCK:
+        if _TOKEN_CACHE is None:
+            _TOKEN_CACHE = TokenCache(session_key, ADDON_NAME, realm=TOKEN_CACHE_REALM,
+                                      logger=logging.getLogger(f"{ADDON_NAME.lower()}_token_cache"))
+        return _TOKEN_CACHE
 
 
-def get_oauth_token(logger: logging.Logger, email: str, password: str, tenant_id: str):
+def get_oauth_token(logger: logging.Logger, email: str, password: str, tenant_id: str,
+                    token_cache: TokenCache = None, session: requests.Session = None):
     """
     Authenticate using OAuth password grant flow and return access token.
+
+    When a token cache is given, a cached token for (tenant_id, email, scope)
+    is returned while it is still valid, and new tokens are cached with their
+    expires_in lifetime. Concurrently running inputs of the same account wait
+    for one refresh instead of each authenticating. Requests go through the
+    given session (default: the shared pooled session).
+    """
+    if token_cache is None:
+        access_token, _ = _request_oauth_token(logger, email, password, tenant_id, session)
+        return access_token
+
+    with token_cache.refresh_lock(tenant_id, email, VAAC_SCOPE):
+        access_token = token_cache.get(tenant_id, email, VAAC_SCOPE)
+        if access_token:
+            logger.info(f"Using cached OAuth access token for tenant: {tenant_id}")
+            return access_token
+
+        access_token, expires_in = _request_oauth_token(logger, email, password, tenant_id, session)
+        token_cache.put(tenant_id, email, VAAC_SCOPE, access_token, expires_in)
+        return access_token
+
+
+def _request_oauth_token(logger: logging.Logger, email: str, password: str, tenant_id: str,
+                         session: requests.Session = None):
+    """
+    Request a new access token with the password grant flow.
+
+    Returns:
+        tuple: (access_token, expires_in)
     """
     logger.info(f"Authenticating with OAuth for tenant: {tenant_id}")
 
-    oauth_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+    oauth_url = f"{OAUTH_AUTHORITY}/{tenant_id}/oauth2/v2.0/token"
     client_id = "a672d62c-fc7b-4e81-a576-e60dc46e951d"
 
     payload = {
         "client_id": client_id,
-        "scope": "https://api.interfaces.records.teams.microsoft.com/.default",
+        "scope": VAAC_SCOPE,
         "userName": email,
         "password": password,
         "grant_type": "password"
@@ -100,7 +214,8 @@ def get_oauth_token(logger: logging.Logger, email: str, password: str, tenant_id
     }
 
     try:
-        response = requests.post(oauth_url, headers=headers, data=payload, timeout=30)
+        session = session or get_session()
+        response = session.post(oauth_url, headers=headers, data=payload, timeout=30)
         response.raise_for_status()
         token_data = response.json()
         access_token = token_data.get("access_token")
@@ -109,16 +224,16 @@ def get_oauth_token(logger: logging.Logger, email: str, password: str, tenant_id
             raise Exception("No access token in OAuth response")
 
         logger.info("Successfully obtained OAuth access token")
-        return access_token
+        return access_token, token_data.get("expires_in")
     except requests.exceptions.RequestException as e:
         logger.error(f"OAuth authentication failed: {str(e)}")
         raise
 
 
-def prepare_vaac_query(logger: logging.Logger, json_query: str):
+def prepare_vaac_query(logger: logging.Logger, json_query):
     """
     Prepare the query for VAAC API:
-    1. GZIP compress the JSON query
+    1. GZIP compress the JSON query (a JSON string, or a dict serialized compactly)
     2. Base64 encode
     3. URL encode
     Returns: encoded query string
@@ -126,8 +241,8 @@ def prepare_vaac_query(logger: logging.Logger, json_query: str):
     logger.info("Preparing VAAC query")
 
     try:
-        #temporary
-        json_query = json.dumps(json_query, separators=(",", ":"), ensure_ascii=False)
+        if not isinstance(json_query, str):
+            json_query = json.dumps(json_query, separators=(",", ":"), ensure_ascii=False)
         # GZIP compress
         compressed = gzip.compress(json_query.encode('utf-8'))
         logger.debug(f"Compressed query size: {len(compressed)} bytes")
@@ -144,41 +259,11 @@ def prepare_vaac_query(logger: logging.Logger, json_query: str):
         logger.error(f"Failed to prepare VAAC query: {str(e)}")
         raise
 
- 
-def build_query_payload():
-    """
-    Build the VAAC query payload to return only calls started in the last 1 hour.
-    Uses `UserStartTimeUTC >= <now-1h>` for precise time filtering.
-    """
-    # Compute "now minus 1 hour" in UTC and format as ISO 8601 ending with Z
-    from_utc = (dt.datetime.now(dt.timezone.utc) - dt.timedelta(hours=1)).strftime("%Y-%m-%dT%H:%M:%SZ")
- 
-    json_object = {
-        "Filters": [
-            {"DataModelName": "UserStartTimeUTC", "Value": "2025-12-15T23:58:30", "Operand": 5},  # Greater Than or Equal To
-            {"DataModelName": "Date", "Value": "2025-12-15", "Operand": 0}, # equal
-            {"DataModelName": "Date", "Value": "2025-12-16", "Operand": 6}  # equal
-            # equals True
-        ],
-        "Dimensions": [
-            {"DataModelName": "UserStartTimeUTC"},
-            {"DataModelName": "HasCQ"},
-            {"DataModelName": "CallQueueCallResult"},
-            {"DataModelName": "CallQueueIdentity"},
-        ],
-        "Measurements": [
-            {"DataModelName": "TotalCallCount"},
-            {"DataModelName": "AvgCallDuration"},
-            {"DataModelName": "TotalAudioStreamDuration"},
-        ],
-        "Parameters": {"UserAgent": "Power BI Desktop V3.1.8"},
-        "LimitResultRowsCount": 90000,
-    }
-    return json_object
- 
- 
+
 def get_vaac_analytics(logger: logging.Logger, credentials: dict, json_query: str,
-                        dimensions: list, measurements: list):
+                        dimensions: list, measurements: list, transform: bool = True,
+                        stream: bool = False, token_cache: TokenCache = None,
+                        session: requests.Session = None, metrics: RunMetrics = None):
     """
     Call VAAC API with OAuth authentication and return analytics data.
 
@@ -188,28 +273,42 @@ def get_vaac_analytics(logger: logging.Logger, credentials: dict, json_query: st
         json_query: VAAC query JSON string
         dimensions: Ordered list of dimension names for array transformation
         measurements: Ordered list of measurement names for array transformation
+        transform: If False, return the raw dataResult ordered arrays (for the
+            columnar enrichment engine) instead of dictionaries
+        stream: If True, download the body incrementally and return an iterator
+            that yields rows as they arrive (see vaac_stream.DataResultStream).
+            HTTP errors are still raised before this function returns.
+        token_cache: Optional OAuth token cache. A cached token rejected by the
+            API (HTTP 401) is dropped and the call is retried once with a new token.
+        session: requests Session used for the OAuth and VAAC calls
+            (default: the shared pooled session, see http_session.get_session)
+        metrics: Run metrics receiving the OAuth, request, download, decode and
+            transform times and the request, byte and row counts
 
     Returns:
-        list: List of dictionaries with field names as keys
+        list: RowView mappings with field names as keys (or ordered arrays),
+            or an iterator over them in streaming mode
     """
     logger.info("Fetching VAAC analytics data")
+    session = session or get_session()
+    metrics = metrics or RunMetrics()
 
     # Get OAuth token
-    access_token = get_oauth_token(
-        logger,
-        credentials["email"],
-        credentials["password"],
-        credentials["tenant_id"]
-    )
+    with metrics.stage("oauth"):
+        access_token = get_oauth_token(
+            logger,
+            credentials["email"],
+            credentials["password"],
+            credentials["tenant_id"],
+            token_cache=token_cache,
+            session=session
+        )
 
     # Prepare the query
-    #temproary
-    payload = build_query_payload()
-    encoded_query = prepare_vaac_query(logger, payload)
+    encoded_query = prepare_vaac_query(logger, json_query)
 
     # Construct API URL
-    api_endpoint = "https://api.interfaces.records.teams.microsoft.com/Teams.VoiceAnalytics/getanalytics"
-    api_url = f"{api_endpoint}?query={encoded_query}"
+    api_url = f"{VAAC_API_ENDPOINT}?query={encoded_query}"
     # Set headers
     headers = {
         "Authorization": f"Bearer {access_token}",
@@ -219,20 +318,51 @@ def get_vaac_analytics(logger: logging.Logger, credentials: dict, json_query: st
     try:
         # Make API request
         logger.info("Calling VAAC API")
-        response = requests.get(api_url, headers=headers, timeout=60)
+        metrics.count("vaac_requests")
+        with metrics.stage("vaac_request"):
+            response = session.get(api_url, headers=headers, timeout=60, stream=stream)
+        if response.status_code == 401 and token_cache is not None:
+            # Cached token revoked or password changed, authenticate again
+            logger.warning("VAAC API rejected the OAuth access token, requesting a new one")
+            response.close()
+            token_cache.invalidate(credentials["tenant_id"], credentials["email"], VAAC_SCOPE)
+            with metrics.stage("oauth"):
+                access_token = get_oauth_token(
+                    logger,
+                    credentials["email"],
+                    credentials["password"],
+                    credentials["tenant_id"],
+                    token_cache=token_cache,
+                    session=session
+                )
+            headers["Authorization"] = f"Bearer {access_token}"
+            metrics.count("vaac_requests")
+            with metrics.stage("vaac_request"):
+                response = session.get(api_url, headers=headers, timeout=60, stream=stream)
         response.raise_for_status()
 
-        data = response.json()
+        if stream:
+            logger.info("Streaming VAAC API response")
+            return _iter_vaac_response_rows(logger, response, dimensions, measurements, transform, metrics)
+
+        metrics.count("vaac_bytes", len(response.content))
+        with metrics.stage("decode"):
+            data = response.json()
 
         # Extract dataResult if it exists
         if "dataResult" in data:
             result_data = data["dataResult"]
             logger.info(f"Successfully retrieved {len(result_data) if isinstance(result_data, list) else 1} array records from VAAC API")
+            metrics.count("rows", len(result_data) if isinstance(result_data, list) else 0)
+
+            if not transform:
+                return result_data if isinstance(result_data, list) else []
 
             # Transform ordered arrays to dictionaries
             if isinstance(result_data, list) and len(result_data) > 0:
                 logger.info(f"Transforming {len(result_data)} ordered array records to dictionary format")
-                transformed_data = transform_ordered_arrays_to_dicts(result_data, dimensions, measurements)
+                with metrics.stage("transform"):
+                    transformed_data = transform_ordered_arrays_to_dicts(result_data, dimensions, measurements)
                 logger.info(f"Successfully transformed {len(transformed_data)} records")
                 return transformed_data
             else:
@@ -245,9 +375,48 @@ def get_vaac_analytics(logger: logging.Logger, credentials: dict, json_query: st
         raise
 
 
-def construct_vaac_query(logger: logging.Logger, input_item: dict, checkpoint_helper=None, input_name=None):
+def _iter_vaac_response_rows(logger: logging.Logger, response, dimensions: list,
+                             measurements: list, transform: bool, metrics: RunMetrics):
+    """
+    Yield dataResult rows from a streamed VAAC response while it downloads.
+
+    Args:
+        logger: Logger instance
+        response: requests Response opened with stream=True
+        dimensions: Ordered list of dimension names for array transformation
+        measurements: Ordered list of measurement names for array transformation
+        transform: If False, yield the raw ordered arrays instead of dictionaries
+        metrics: Run metrics (download and decode times, row and byte counts)
+
+    Yields:
+        dict or list: One row per dataResult element
+    """
+    chunks = metrics.timed(response.iter_content(chunk_size=DEFAULT_STREAM_CHUNK_SIZE), "vaac_download")
+    data_stream = DataResultStream(chunks)
+    rows = metrics.timed(data_stream, "decode")
+    try:
+        if transform:
+            yield from metrics.timed(iter_ordered_arrays_as_dicts(rows, dimensions, measurements), "transform")
+        else:
+            yield from rows
+    except requests.exceptions.RequestException as e:
+        logger.error(f"VAAC API call failed while streaming: {str(e)}")
+        raise
+    finally:
+        response.close()
+        metrics.count("rows", data_stream.row_count)
+        metrics.count("vaac_bytes", data_stream.bytes_read)
+
+    if not data_stream.has_data_result:
+        logger.warning("No dataResult in VAAC API response")
+    logger.info(f"Successfully streamed {data_stream.row_count} array records "
+                f"({data_stream.bytes_read} bytes) from VAAC API")
+
+
+def get_query_time_range(logger: logging.Logger, input_item: dict, checkpoint_helper=None, input_name=None):
     """
-    Construct VAAC JSON query from structured input fields.
+    Determine the time range to collect: from the checkpoint (or the interval
+    lookback on the first run) to now.
 
     Args:
         logger: Logger instance
@@ -256,33 +425,12 @@ def construct_vaac_query(logger: logging.Logger, input_item: dict, checkpoint_he
         input_name: Normalized input name for checkpoint key
 
     Returns:
-        tuple: (query_json, end_date_iso, dimensions_list, measurements_list)
-            - query_json: JSON string ready for VAAC API
-            - end_date_iso: ISO datetime for checkpoint storage
-            - dimensions_list: Ordered list of dimension names (for array transformation)
-            - measurements_list: Ordered list of measurement names (for array transformation)
+        tuple: (start_dt, end_dt) timezone-aware UTC datetimes
     """
     from datetime import datetime, timedelta, timezone
 
-    query = {}
-
-    # Get report type (auto_attendant or call_queue)
-    report_type = input_item.get("report_type", "call_queue")
-    logger.info(f"Constructing VAAC query for report type: {report_type}")
-
-    # Get hardcoded dimensions for the selected report type
-    dimensions_list = get_dimensions_for_report_type(report_type, logger=logger)
-    query["Dimensions"] = [{"DataModelName": dim} for dim in dimensions_list]
-
-    # Get hardcoded measurements for the selected report type
-    measurements_list = get_measurements_for_report_type(report_type, include_optional=False, logger=logger)
-    query["Measurements"] = [{"DataModelName": m} for m in measurements_list]
-
-    # Handle Date and Time Filters with checkpoint support
     # Get current time (UTC, timezone-aware)
     end_date_dt = datetime.now(timezone.utc)
-    end_date = end_date_dt.strftime("%Y-%m-%d")
-    end_date_iso = end_date_dt.isoformat()  # For checkpoint storage
 
     # Check for existing checkpoint
     checkpoint_key = f"{input_name}_last_processed" if input_name else None
@@ -297,42 +445,46 @@ def construct_vaac_query(logger: logging.Logger, input_item: dict, checkpoint_he
         except Exception as e:
             logger.warning(f"Failed to retrieve checkpoint for '{input_name}': {str(e)}")
 
-    # Determine start_date and start_datetime
+    # Determine start datetime
     if last_checkpoint:
         # Use checkpoint as start date (incremental mode)
         start_date_dt = datetime.fromisoformat(last_checkpoint)
-        start_date = start_date_dt.strftime("%Y-%m-%d")
-        start_datetime_iso = last_checkpoint  # ISO format for UserStartTimeUTC filter
-        logger.info(f"Using checkpoint start datetime: {start_datetime_iso} (incremental mode)")
+        if start_date_dt.tzinfo is None:
+            start_date_dt = start_date_dt.replace(tzinfo=timezone.utc)
+        logger.info(f"Using checkpoint start datetime: {start_date_dt.isoformat()} (incremental mode)")
     else:
         # Fallback to interval-based (first run or checkpoint failure)
         interval_seconds = int(input_item.get("interval", 3600))
         start_date_dt = end_date_dt - timedelta(seconds=interval_seconds)
-        start_date = start_date_dt.strftime("%Y-%m-%d")
-        start_datetime_iso = start_date_dt.isoformat()  # ISO format for UserStartTimeUTC filter
-        logger.info(f"No checkpoint found for '{input_name}', using interval-based start datetime: {start_datetime_iso} (lookback: {interval_seconds}s)")
-
-    logger.info(f"Query date range: {start_date} to {end_date}")
-    logger.info(f"Query datetime range: {start_datetime_iso} to {end_date_iso}")
-
-    # Build filters with both UserStartTimeUTC (for precise time filtering) and Date (for day boundaries)
-    query["Filters"] = [
-        {
-            "DataModelName": "UserStartTimeUTC",
-            "Value": start_datetime_iso,
-            "Operand": 4  # Greater than or equal (>=)
-        },
-        {
-            "DataModelName": "Date",
-            "Value": start_date,
-            "Operand": 4  # Greater than or equal (>=)
-        },
-        {
-            "DataModelName": "Date",
-            "Value": end_date,
-            "Operand": 6  # Less than or equal (<=)
-        }
-    ]
+        logger.info(f"No checkpoint found for '{input_name}', using interval-based start datetime: {start_date_dt.isoformat()} (lookback: {interval_seconds}s)")
+
+    logger.info(f"Query datetime range: {start_date_dt.isoformat()} to {end_date_dt.isoformat()}")
+    return start_date_dt, end_date_dt
+
+
+def construct_vaac_query(logger: logging.Logger, input_item: dict, window: TimeWindow,
+                         dimensions_list: list, measurements_list: list):
+    """
+    Construct the VAAC JSON query for one sub-window of the collection range.
+
+    Args:
+        logger: Logger instance
+        input_item: Dictionary containing input configuration
+        window: Sub-window within one UTC day (see window_planner.plan_windows)
+        dimensions_list: Ordered list of dimension names
+        measurements_list: Ordered list of measurement names
+
+    Returns:
+        str: JSON query ready for VAAC API
+    """
+    query = {}
+
+    query["Dimensions"] = [{"DataModelName": dim} for dim in dimensions_list]
+    query["Measurements"] = [{"DataModelName": m} for m in measurements_list]
+
+    # UserStartTimeUTC bounds (precise time filtering) and Date (day boundary) of the window
+    query["Filters"] = window_filters(window)
+    logger.debug(f"Query window: {window.start.isoformat()} to {window.end.isoformat()}")
 
     # Handle LimitResultRowsCount
     limit = input_item.get("limit_result_rows", "200000")
@@ -343,8 +495,7 @@ def construct_vaac_query(logger: logging.Logger, input_item: dict, checkpoint_he
         "UserAgent": "Splunk Add-on for MS Teams AA/CQ Reporting"
     }
 
-    # Return query JSON, checkpoint datetime, and dimension/measurement lists for array transformation
-    return json.dumps(query), end_date_iso, dimensions_list, measurements_list
+    return json.dumps(query)
 
 
 def validate_input(definition: smi.ValidationDefinition):
@@ -364,112 +515,559 @@ def stream_events(inputs: smi.InputDefinition, event_writer: smi.EventWriter):
     #     "python.version": "python3",
     #   }
     # }
+    session_key = inputs.metadata["session_key"]
+    executor_logger = logger_for_input("executor")
+    advanced_settings = get_advanced_settings(executor_logger, session_key)
+
+    # Inputs are grouped by the tenant of their account for the per-tenant cap
+    tenants = {}
+    account_tenants = {}
     for input_name, input_item in inputs.inputs.items():
-        normalized_input_name = input_name.split("/")[-1]
-        logger = logger_for_input(normalized_input_name)
-        try:
-            session_key = inputs.metadata["session_key"]
-            log_level = conf_manager.get_log_level(
-                logger=logger,
-                session_key=session_key,
-                app_name=ADDON_NAME,
-                conf_name="splunk_msteams_aa_callqueue_reporting_addon_settings",
+        account = input_item.get("account")
+        if account not in account_tenants:
+            try:
+                account_tenants[account] = get_account_credentials(session_key, account)["tenant_id"]
+            except Exception as e:
+                # The input reports the error itself when it runs
+                executor_logger.debug(f"Failed to resolve tenant of account '{account}': {str(e)}")
+                account_tenants[account] = None
+        tenants[input_name] = account_tenants[account] or account
+
+    try:
+        run_concurrently(
+            inputs.inputs.items(),
+            lambda item: _ingest_input(inputs, item[0], item[1], event_writer, advanced_settings),
+            max_concurrent=advanced_settings["max_concurrent_inputs"],
+            max_per_group=advanced_settings["max_concurrent_inputs_per_tenant"],
+            group_of=lambda item: tenants[item[0]],
+            name_of=lambda item: item[0],
+            logger=executor_logger,
+        )
+    finally:
+        # Write the log records still queued by asynchronous logging
+        stop_async_logging()
+
+
+def _ingest_input(inputs: smi.InputDefinition, input_name: str, input_item: dict,
+                  event_writer: smi.EventWriter, advanced_settings: dict):
+    """
+    Fetch, enrich and write the events of one input and update its checkpoint.
+
+    Errors are logged to the input's own log and do not affect other inputs.
+    """
+    normalized_input_name = input_name.split("/")[-1]
+    logger = logger_for_input(normalized_input_name)
+    metrics = RunMetrics()
+    run_fields = {"input": normalized_input_name, "status": "error"}
+    try:
+        session_key = inputs.metadata["session_key"]
+        log_level = conf_manager.get_log_level(
+            logger=logger,
+            session_key=session_key,
+            app_name=ADDON_NAME,
+            conf_name="splunk_msteams_aa_callqueue_reporting_addon_settings",
+        )
+        logger.setLevel(log_level)
+        if advanced_settings["async_logging"]:
+            enable_async_logging(logger)
+        log.modular_input_start(logger, normalized_input_name)
+
+        # Initialize checkpoint helper for this input
+        checkpoint_helper = TimedCheckpointer(checkpointer.KVStoreCheckpointer(
+            collection_name="splunk_msteams_checkpoints",
+            session_key=session_key,
+            app=ADDON_NAME
+        ), metrics)
+        logger.debug(f"Initialized checkpoint helper for input: {normalized_input_name}")
+
+        # Get account credentials
+        credentials = get_account_credentials(session_key, input_item.get("account"))
+
+        # Shared pooled HTTP session (connection reuse is logged at the end of the run)
+        http_session = get_session(advanced_settings["http_pool_connections"],
+                                   advanced_settings["http_pool_maxsize"])
+        http_summary = handshake_summary({}, {})
+        http_summary_lock = threading.Lock()
+
+        # Get report type and enrichment engine
+        report_type = input_item.get("report_type", "call_queue")
+        enrichment_engine = input_item.get("enrichment_engine", "row")
+        use_columnar = enrichment_engine == "columnar" and report_type in ("call_queue", "auto_attendant")
+        stream_response = utils.is_true(input_item.get("stream_response", "1"))
+        run_fields["report_type"] = report_type
+
+        # Hardcoded dimensions and measurements for the selected report type
+        logger.info(f"Constructing VAAC queries for report type: {report_type}")
+        dimensions_list = get_dimensions_for_report_type(report_type, logger=logger)
+        measurements_list = get_measurements_for_report_type(report_type, include_optional=False, logger=logger)
+        logger.debug(f"Dimensions ({len(dimensions_list)}): {', '.join(dimensions_list[:5])}...")
+        logger.debug(f"Measurements ({len(measurements_list)}): {', '.join(measurements_list)}")
+
+        collection_mode = input_item.get("collection_mode", "incremental")
+        run_fields["collection_mode"] = collection_mode
+        window_seconds = int(input_item.get("window_hours", DEFAULT_WINDOW_HOURS)) * 3600
+        window_fetch_workers = int(input_item.get("window_fetch_workers", DEFAULT_WINDOW_FETCH_WORKERS))
+        limit_result_rows = int(input_item.get("limit_result_rows", "200000"))
+        split_stats = WindowSplitStats()
+
+        # Backfill days share one cap on the VAAC request rate
+        rate_limiter = None
+        if collection_mode == "backfill":
+            rate_limiter = RateLimiter(
+                int(input_item.get("backfill_requests_per_minute", DEFAULT_BACKFILL_REQUESTS_PER_MINUTE))
             )
-            logger.setLevel(log_level)
-            log.modular_input_start(logger, normalized_input_name)
 
-            # Initialize checkpoint helper for this input
-            checkpoint_helper = checkpointer.KVStoreCheckpointer(
-                collection_name="splunk_msteams_checkpoints",
+        def query_window(window):
+            if rate_limiter is not None:
+                with metrics.stage("rate_limit"):
+                    rate_limiter.acquire()
+            # Requests of a window run in the calling thread (input, day or window fetch thread)
+            stats_start = CONNECTION_STATS.snapshot(current_thread=True)
+            try:
+                json_query = construct_vaac_query(logger, input_item, window, dimensions_list, measurements_list)
+                logger.debug(f"Constructed query: {json_query}")
+                return get_vaac_analytics(
+                    logger, credentials, json_query, dimensions_list, measurements_list,
+                    transform=False, stream=stream_response,
+                    token_cache=get_token_cache(session_key),
+                    session=http_session,
+                    metrics=metrics
+                )
+            finally:
+                window_summary = handshake_summary(stats_start, CONNECTION_STATS.snapshot(current_thread=True))
+                with http_summary_lock:
+                    for key in http_summary:
+                        http_summary[key] += window_summary[key]
+
+        # Calls written by earlier runs are dropped before enrichment
+        dedup_index = None
+        dedup_retention_days = int(input_item.get("dedup_retention_days", DEFAULT_DEDUP_RETENTION_DAYS))
+        if dedup_retention_days > 0:
+            if all(field in dimensions_list for field in DEDUP_KEY_FIELDS):
+                dedup_index = DedupIndex(checkpoint_helper, normalized_input_name, dedup_retention_days, logger=logger)
+                dedup_positions = [dimensions_list.index(field) for field in DEDUP_KEY_FIELDS]
+                dedup_time_position = dimensions_list.index("UserStartTimeUTC")
+            else:
+                logger.warning(f"Duplicate suppression disabled: {report_type} rows lack {', '.join(DEDUP_KEY_FIELDS)}")
+
+        def fetch_window(window):
+            # Windows cut off at LimitResultRowsCount are bisected until every piece fits
+            rows = iter_untruncated_rows(window, query_window, limit_result_rows, len(dimensions_list),
+                                         stats=split_stats, logger=logger)
+            if dedup_index is not None:
+                rows = dedup_index.filter_rows(rows, dedup_positions, dedup_time_position)
+            return rows
+
+        # Prepare enrichment configuration
+        enrichment_config = {
+            'timezone_offset': input_item.get('timezone_offset', 'UTC'),
+            'language_code': input_item.get('language_code', 'en-AU'),
+            'parallel_workers': parse_parallel_workers(input_item.get('parallel_workers', 4)),
+            'enrichment_engine': enrichment_engine,
+            'process_chunk_size': int(input_item.get('process_chunk_size', 5000)),
+            'batch_size': int(input_item.get('batch_size', 5000)),
+            'debug_sample_rate': advanced_settings["debug_sample_rate"],
+            'enable_legend_codes': True,
+            'enable_legend_strings': True,
+            'enable_timezone_conversion': True
+        }
+        logger.debug(f"Enrichment config: engine={enrichment_engine}, "
+                    f"parallel_workers={enrichment_config['parallel_workers']}, "
+                    f"timezone={enrichment_config['timezone_offset']}")
+
+        if report_type == "call_queue":
+            sourcetype = "msteams:vaac:callqueue"
+        elif report_type == "auto_attendant":
+            sourcetype = "msteams:vaac:autoattendant"
+        else:
+            logger.warning(f"Unknown report type '{report_type}', skipping enrichment")
+            sourcetype = "msteams:vaac:analytics"
+
+        # Hourly per-queue summary events, aggregated while Call Queue records are enriched
+        hourly_rollups = sourcetype == "msteams:vaac:callqueue" and utils.is_true(input_item.get("hourly_rollups", "1"))
+
+        # Per-day, per-queue running totals in the KV Store, fed by the same rollups
+        daily_stats = None
+        if sourcetype == "msteams:vaac:callqueue" and utils.is_true(input_item.get("daily_queue_stats", "1")):
+            daily_stats = DailyQueueStats(TimedCheckpointer(checkpointer.KVStoreCheckpointer(
+                collection_name=QUEUE_STATS_COLLECTION,
                 session_key=session_key,
                 app=ADDON_NAME
+            ), metrics), normalized_input_name, enrichment_config['timezone_offset'], logger=logger)
+
+        use_orjson = input_item.get("event_serializer", "standard") == "orjson"
+        if use_orjson and orjson is None:
+            logger.warning("orjson is not installed, using the standard event serializer")
+        serializer = EventSerializer(key_layouts=(CALLQUEUE_OUTPUT_KEYS, AUTOATTENDANT_OUTPUT_KEYS),
+                                     use_orjson=use_orjson)
+
+        def ingest_windows(windows, commit_progress=None):
+            """
+            Fetch, enrich and write the rows of consecutive windows; returns (WindowedRows, written count).
+
+            commit_progress(window_end, written_count) is called whenever every row up to a
+            later window end has been written to Splunk.
+            """
+            # Fetch VAAC Analytics data (ordered arrays are kept as-is for the columnar engine).
+            # This is a lazy iterator over the windows in time order: rows are transformed,
+            # enriched and written batch by batch while the responses are still downloading.
+            raw_data = WindowedRows(windows, fetch_window, max_workers=window_fetch_workers, logger=logger)
+            rows = raw_data
+            dedup_pending = PendingRows()
+            rollup = HourlyQueueRollup() if hourly_rollups or daily_stats is not None else None
+            # Rows dropped by enrichment are skipped when written events are committed
+            on_drop = None
+            if dedup_index is not None:
+                rows = dedup_index.record_rows(rows, dedup_positions, dedup_time_position, dedup_pending)
+                on_drop = dedup_pending.drop
+            rows = metrics.timed(rows, "fetch_wait")
+            if not use_columnar:
+                rows = metrics.timed(iter_ordered_arrays_as_dicts(rows, dimensions_list, measurements_list),
+                                     "transform")
+
+            # Apply enrichment based on report type (lazy: nothing runs until events are written)
+            if use_columnar and report_type == "auto_attendant":
+                enriched_data = iter_enrich_autoattendant_columns(
+                    rows, dimensions_list, measurements_list, enrichment_config, logger=logger, metrics=metrics,
+                    on_drop=on_drop
+                )
+            elif use_columnar:
+                enriched_data = iter_enrich_callqueue_columns(
+                    rows, dimensions_list, measurements_list, enrichment_config, logger=logger, metrics=metrics,
+                    rollup=rollup, on_drop=on_drop
+                )
+            elif report_type == "call_queue":
+                enriched_data = enrich_callqueue_data(rows, enrichment_config, logger=logger, metrics=metrics,
+                                                      rollup=rollup, on_drop=on_drop)
+            elif report_type == "auto_attendant":
+                enriched_data = enrich_autoattendant_data(rows, enrichment_config, logger=logger, metrics=metrics,
+                                                          on_drop=on_drop)
+            else:
+                # Fallback: no enrichment, rows are written as they are
+                enriched_data = map(dict, rows)
+            enriched_data = metrics.timed(enriched_data, "enrichment")
+
+            # Enrichment keeps the row order but drops the records it fails to enrich:
+            # written events map back to consumed rows once the dropped rows are skipped
+            # (dedup_pending), and windows are complete once as many events as rows were
+            # written (late after drops, never early)
+            committed = {"through": None, "rows": 0}
+
+            def save_daily_stats():
+                daily_stats.merge(rollup.take_delta())
+                daily_stats.save()
+
+            def on_flush(written_count):
+                if rollup is not None:
+                    rollup.commit(written_count - committed["rows"])
+                if dedup_index is not None:
+                    dedup_index.commit(dedup_pending, written_count - committed["rows"])
+                committed["rows"] = written_count
+                through = raw_data.written_through(written_count)
+                if through is not None and through != committed["through"]:
+                    committed["through"] = through
+                    if dedup_index is not None:
+                        dedup_index.save()
+                    if daily_stats is not None:
+                        save_daily_stats()
+                    if commit_progress is not None:
+                        commit_progress(through, written_count)
+
+            # Write enriched events to Splunk as they come out of the pipeline
+            track_writes = commit_progress is not None or dedup_index is not None or rollup is not None
+            try:
+                with BatchedEventWriter(
+                    event_writer,
+                    sourcetype,
+                    index=input_item.get("index"),
+                    serializer=serializer,
+                    batch_size=int(input_item.get("event_batch_size", DEFAULT_EVENT_BATCH_SIZE)),
+                    logger=logger,
+                    on_flush=on_flush if track_writes else None,
+                    metrics=metrics,
+                ) as batch_writer:
+                    batch_writer.write_all(enriched_data)
+            except Exception:
+                # Keep the hashes of the rows written before the failure
+                if dedup_index is not None:
+                    dedup_index.save()
+                raise
+            finally:
+                # Aggregates of the calls written (also before a failure)
+                if daily_stats is not None:
+                    save_daily_stats()
+                if hourly_rollups:
+                    write_rollup_events(logger, event_writer, input_item.get("index"), rollup, normalized_input_name)
+
+            # Every written event was committed by the last flush; rows still queued
+            # were dropped by enrichment and are not recorded
+            if dedup_index is not None:
+                dedup_index.release(dedup_pending)
+                dedup_index.save()
+            metrics.count("windows", raw_data.completed)
+            return raw_data, batch_writer.written_count
+
+        logger.info(f"Processing VAAC Analytics input ({collection_mode}), applying {report_type} enrichment")
+        if collection_mode == "backfill":
+            error, written_count, complete_through = _run_backfill(
+                logger, input_item, normalized_input_name, checkpoint_helper, report_type,
+                window_seconds, ingest_windows
+            )
+        else:
+            error, written_count, complete_through = _run_incremental(
+                logger, input_item, normalized_input_name, checkpoint_helper, report_type,
+                window_seconds, window_fetch_workers, ingest_windows
             )
-            logger.debug(f"Initialized checkpoint helper for input: {normalized_input_name}")
 
-            # Get account credentials
-            credentials = get_account_credentials(session_key, input_item.get("account"))
+        log.events_ingested(
+            logger,
+            input_name,
+            sourcetype,
+            written_count,
+            input_item.get("index"),
+            account=input_item.get("account"),
+        )
+
+        # Days the input has collected completely are published once
+        if daily_stats is not None and complete_through is not None:
+            publish_daily_stats(logger, event_writer, input_item.get("index"), daily_stats, complete_through,
+                                normalized_input_name)
+
+        logger.info(f"action=window_bisection input={normalized_input_name} splits={split_stats.splits} "
+                    f"truncated_responses={split_stats.truncated} unsplittable={split_stats.unsplittable} "
+                    f"max_depth={split_stats.max_depth}")
+        if dedup_index is not None:
+            logger.info(f"action=dedup input={normalized_input_name} suppressed={dedup_index.suppressed} "
+                        f"recorded={dedup_index.recorded} retention_days={dedup_retention_days}")
+        logger.info(f"HTTP connections: {http_summary['requests']} requests, "
+                    f"{http_summary['new_connections']} new connections "
+                    f"({http_summary['connect_ms']:.0f} ms connect/TLS handshake), "
+                    f"{http_summary['reused']} reused keep-alive connections "
+                    f"(~{http_summary['saved_ms']:.0f} ms handshake time saved)")
+        run_fields["window_splits"] = split_stats.splits
+        run_fields["truncated_responses"] = split_stats.truncated
+        run_fields["duplicates_suppressed"] = dedup_index.suppressed if dedup_index is not None else 0
+        run_fields["http_requests"] = http_summary["requests"]
+        run_fields["http_new_connections"] = http_summary["new_connections"]
+        run_fields["http_reused_connections"] = http_summary["reused"]
+
+        # Windows (or days) after a failed one are fetched again on the next run
+        if error is not None:
+            raise error
+
+        run_fields["status"] = "success"
+        log.modular_input_end(logger, normalized_input_name)
+    except Exception as e:
+        run_fields["error"] = str(e)
+        log.log_exception(logger, e, "vaac_analytics_error", msg_before=f"Exception raised while ingesting VAAC analytics data for {normalized_input_name}: ")
+    finally:
+        if utils.is_true(input_item.get("perf_summary", "1")):
+            write_run_summary(logger, event_writer, input_item.get("index"), metrics.summary(**run_fields))
 
-            # Construct JSON query from structured fields with checkpoint support
-            logger.info("Constructing VAAC query from input fields")
-            json_query, end_date_iso, dimensions_list, measurements_list = construct_vaac_query(
-                logger, input_item, checkpoint_helper, normalized_input_name
-            )
-            logger.debug(f"Constructed query: {json_query}")
-            logger.debug(f"Query end date (for checkpoint): {end_date_iso}")
-            logger.debug(f"Dimensions ({len(dimensions_list)}): {', '.join(dimensions_list[:5])}...")
-            logger.debug(f"Measurements ({len(measurements_list)}): {', '.join(measurements_list)}")
-
-            # Fetch VAAC Analytics data
-            logger.info("Processing VAAC Analytics input")
-            raw_data = get_vaac_analytics(
-                logger, credentials, json_query, dimensions_list, measurements_list
-            )
 
-            # Get report type for enrichment
-            report_type = input_item.get("report_type", "call_queue")
-
-            # Prepare enrichment configuration
-            enrichment_config = {
-                'timezone_offset': input_item.get('timezone_offset', 'UTC'),
-                'language_code': input_item.get('language_code', 'en-AU'),
-                'parallel_workers': int(input_item.get('parallel_workers', 4)),
-                'enable_legend_codes': True,
-                'enable_legend_strings': True,
-                'enable_timezone_conversion': True
-            }
-            logger.debug(f"Enrichment config: parallel_workers={enrichment_config['parallel_workers']}, "
-                        f"timezone={enrichment_config['timezone_offset']}")
-
-            # Apply enrichment based on report type
-            logger.info(f"Applying {report_type} enrichment to {len(raw_data)} records")
-            if report_type == "call_queue":
-                enriched_data = enrich_callqueue_data(raw_data, enrichment_config, logger=logger)
-                sourcetype = "msteams:vaac:callqueue"
-            elif report_type == "auto_attendant":
-                enriched_data = enrich_autoattendant_data(raw_data, enrichment_config, logger=logger)
-                sourcetype = "msteams:vaac:autoattendant"
-            else:
-                # Fallback: no enrichment
-                logger.warning(f"Unknown report type '{report_type}', skipping enrichment")
-                enriched_data = raw_data
-                sourcetype = "msteams:vaac:analytics"
-
-            # Write enriched events to Splunk
-            logger.info(f"Writing {len(enriched_data)} enriched events to Splunk")
-            for line in enriched_data:
-                event_writer.write_event(
-                    smi.Event(
-                        data=json.dumps(line, ensure_ascii=False, default=str),
-                        index=input_item.get("index"),
-                        sourcetype=sourcetype,
-                    )
-                )
+def write_run_summary(logger: logging.Logger, event_writer: smi.EventWriter, index: str, summary: dict):
+    """
+    Write the run-summary event of an input run (sourcetype msteams:vaac:perf).
 
-            log.events_ingested(
-                logger,
-                input_name,
-                sourcetype,
-                len(enriched_data),
-                input_item.get("index"),
-                account=input_item.get("account"),
-            )
+    Args:
+        logger: Logger instance
+        event_writer: Splunk event writer
+        index: Index of the input
+        summary: Summary event, see RunMetrics.summary
+    """
+    logger.info(f"action=run_summary input={summary.get('input')} status={summary.get('status')} "
+                f"duration_seconds={summary['duration_seconds']} events={summary['counts']['events']} "
+                f"events_per_second={summary['events_per_second']}")
+    try:
+        with BatchedEventWriter(event_writer, PERF_SOURCETYPE, index=index, logger=logger) as batch_writer:
+            batch_writer.write(summary)
+    except Exception as e:
+        # The run itself is done, a missing summary is not worth failing it
+        logger.warning(f"Failed to write the run summary event: {str(e)}")
+
+
+def write_rollup_events(logger: logging.Logger, event_writer: smi.EventWriter, index: str,
+                        rollup: HourlyQueueRollup, input_name: str):
+    """
+    Write the hourly per-queue summary events of a run (sourcetype msteams:vaac:callqueue:summary).
 
-            # Update checkpoint after successful data ingestion
-            if checkpoint_helper and normalized_input_name:
-                try:
-                    from datetime import datetime, timezone
-                    checkpoint_key = f"{normalized_input_name}_last_processed"
-                    checkpoint_helper.update(checkpoint_key, {
-                        "last_datetime": end_date_iso,
-                        "processed_records": len(enriched_data),
-                        "updated_at": datetime.now(timezone.utc).isoformat(),
-                        "report_type": report_type
-                    })
-                    logger.info(f"Checkpoint updated for '{normalized_input_name}': last_datetime={end_date_iso}, records={len(enriched_data)}")
-                except Exception as e:
-                    logger.error(f"Failed to update checkpoint for '{normalized_input_name}': {str(e)}")
-                    # Don't fail the input - checkpoint update failure is not critical
-
-            log.modular_input_end(logger, normalized_input_name)
+    Args:
+        logger: Logger instance
+        event_writer: Splunk event writer
+        index: Index of the input
+        rollup: Rollup of the written Call Queue records
+        input_name: Normalized input name
+    """
+    events = rollup.events(input=input_name)
+    logger.info(f"action=hourly_rollup input={input_name} events={len(events)} "
+                f"calls={sum(event['calls'] for event in events)} undated={rollup.undated}")
+    if not events:
+        return
+    try:
+        with BatchedEventWriter(event_writer, ROLLUP_SOURCETYPE, index=index, logger=logger) as batch_writer:
+            batch_writer.write_all(events)
+    except Exception as e:
+        # The per-call events are written, summaries can be rebuilt from them
+        logger.warning(f"Failed to write the hourly rollup events: {str(e)}")
+
+
+def publish_daily_stats(logger: logging.Logger, event_writer: smi.EventWriter, index: str,
+                        daily_stats: DailyQueueStats, through: dt.datetime, input_name: str):
+    """
+    Write the day summaries of the days that are over (sourcetype msteams:vaac:callqueue:daily).
+
+    Args:
+        logger: Logger instance
+        event_writer: Splunk event writer
+        index: Index of the input
+        daily_stats: Daily queue statistics of the input
+        through: UTC time up to which every call of the input is written
+        input_name: Normalized input name
+    """
+    days = daily_stats.complete_days(through)
+    if not days:
+        return
+    try:
+        with BatchedEventWriter(event_writer, DAILY_SOURCETYPE, index=index, logger=logger) as batch_writer:
+            for day in days:
+                batch_writer.write_all(daily_stats.day_events(day, input=input_name))
+    except Exception as e:
+        # The days stay open and are published by the next run
+        logger.warning(f"Failed to write the daily queue statistics events: {str(e)}")
+        return
+    daily_stats.mark_complete(days)
+    logger.info(f"action=daily_queue_stats input={input_name} published_days={len(days)} "
+                f"first={days[0]} last={days[-1]}")
+
+
+def _run_incremental(logger: logging.Logger, input_item: dict, input_name: str, checkpoint_helper,
+                     report_type: str, window_seconds: int, window_fetch_workers: int, ingest_windows):
+    """
+    Collect the range from the checkpoint to now and advance the checkpoint.
+
+    Args:
+        logger: Logger instance
+        input_item: Input configuration
+        input_name: Normalized input name
+        checkpoint_helper: KVStoreCheckpointer of the input
+        report_type: Report type of the input
+        window_seconds: Maximum query window length
+        window_fetch_workers: Windows fetched at the same time
+        ingest_windows: Fetches, enriches and writes windows, returns (WindowedRows, written count)
+
+    Returns:
+        tuple: (error of the first failed window or None, events written,
+            UTC time up to which every row is written or None)
+    """
+    # Split the range from the checkpoint to now into sub-windows (one UTC day at most)
+    start_dt, end_dt = get_query_time_range(logger, input_item, checkpoint_helper, input_name)
+    windows = plan_windows(start_dt, end_dt, window_seconds)
+    logger.info(f"Fetching {len(windows)} query windows with up to {window_fetch_workers} at a time")
+
+    def update_checkpoint(last_datetime, records):
+        if not (checkpoint_helper and input_name):
+            return False
+        try:
+            checkpoint_key = f"{input_name}_last_processed"
+            checkpoint_helper.update(checkpoint_key, {
+                "last_datetime": last_datetime.isoformat(),
+                "processed_records": records,
+                "updated_at": dt.datetime.now(dt.timezone.utc).isoformat(),
+                "report_type": report_type
+            })
+            return True
         except Exception as e:
-            log.log_exception(logger, e, "vaac_analytics_error", msg_before=f"Exception raised while ingesting VAAC analytics data for {normalized_input_name}: ")
+            logger.error(f"Failed to update checkpoint for '{input_name}': {str(e)}")
+            # Don't fail the input - checkpoint update failure is not critical
+            return False
+
+    def commit_progress(window_end, records):
+        # A restart resumes after the last window whose events are all written
+        if update_checkpoint(window_end, records):
+            logger.debug(f"Checkpoint progress for '{input_name}': last_datetime={window_end.isoformat()}, "
+                         f"records={records}")
+
+    raw_data, written_count = ingest_windows(windows, commit_progress=commit_progress)
+    logger.info(f"Wrote {written_count} enriched events to Splunk")
+
+    # Advance the checkpoint through the last contiguous completed window
+    if raw_data.completed_through and update_checkpoint(raw_data.completed_through, written_count):
+        logger.info(f"Checkpoint updated for '{input_name}': last_datetime={raw_data.completed_through.isoformat()}, "
+                    f"records={written_count}, windows={raw_data.completed}/{len(windows)}")
+
+    return raw_data.error, written_count, raw_data.completed_through
+
+
+def _run_backfill(logger: logging.Logger, input_item: dict, input_name: str, checkpoint_helper,
+                  report_type: str, window_seconds: int, ingest_windows):
+    """
+    Collect the days of the backfill range that have no completion record yet.
+
+    Days run concurrently (backfill_concurrent_days); each day's progress is
+    recorded in the checkpoint collection as its query windows are written,
+    so a restarted input resumes after the last written window of the days
+    that were not finished.
+
+    Args:
+        logger: Logger instance
+        input_item: Input configuration
+        input_name: Normalized input name
+        checkpoint_helper: KVStoreCheckpointer of the input
+        report_type: Report type of the input
+        window_seconds: Maximum query window length
+        ingest_windows: Fetches, enriches and writes windows, returns (WindowedRows, written count)
+
+    Returns:
+        tuple: (error of the first failed day or None, events written,
+            end of the range once every day of it is complete, else None)
+    """
+    days = backfill_days(input_item.get("backfill_start_date"), input_item.get("backfill_end_date"))
+    pending = pending_backfill_days(checkpoint_helper, input_name, days, logger=logger)
+    concurrent_days = int(input_item.get("backfill_concurrent_days", DEFAULT_BACKFILL_CONCURRENT_DAYS))
+    range_end = day_range(days[-1])[1] if days else None
+    if not pending:
+        logger.info(f"Backfill complete: all {len(days)} days collected")
+        return None, 0, range_end
+    logger.info(f"Backfilling {len(pending)} of {len(days)} days ({pending[0].day.isoformat()} to "
+                f"{pending[-1].day.isoformat()}) with up to {concurrent_days} days at a time")
+
+    written = []
+    written_lock = threading.Lock()
+
+    def ingest_day(pending_day):
+        day = pending_day.day
+        day_start, day_end = day_range(day)
+        if pending_day.resume_from is not None:
+            logger.info(f"Resuming backfill day {day.isoformat()} from {pending_day.resume_from.isoformat()}")
+            day_start = pending_day.resume_from
+        windows = plan_windows(day_start, day_end, window_seconds)
+
+        def commit_progress(window_end, records):
+            # An interrupted day resumes after its last fully written window
+            try:
+                mark_day_progress(checkpoint_helper, input_name, day, window_end,
+                                  pending_day.processed_records + records, report_type)
+            except Exception as e:
+                logger.error(f"Failed to update backfill checkpoint of {day.isoformat()}: {str(e)}")
+
+        raw_data, written_count = ingest_windows(windows, commit_progress=commit_progress)
+        with written_lock:
+            written.append(written_count)
+        if raw_data.error is not None:
+            raise raw_data.error
+        total_records = pending_day.processed_records + written_count
+        mark_day_complete(checkpoint_helper, input_name, day, total_records, len(windows), report_type)
+        logger.info(f"Backfill day {day.isoformat()} complete: records={total_records}, windows={len(windows)}")
+
+    results = run_concurrently(
+        pending, ingest_day,
+        max_concurrent=concurrent_days, max_per_group=concurrent_days,
+        name_of=lambda pending_day: pending_day.day.isoformat(), item_label="Day", logger=logger,
+    )
+    written_count = sum(written)
+    errors = [error for error in results.values() if error is not None]
+    logger.info(f"Backfill run finished: {len(pending) - len(errors)} of {len(pending)} pending days completed, "
+                f"records={written_count}")
+    if errors:
+        return errors[0], written_count, None
+    return None, written_count, range_end
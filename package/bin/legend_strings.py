@@ -0,0 +1,228 @@
+"""
+Localized Legend Strings
+
+The legend and connectivity type strings of the Call Queue events
+(CQCallResultLegendString, CQTargetTypeLegendString,
+CQConnectivityTypeString) follow the input's language_code:
+
+- English strings are built in (the tables below)
+- Other languages are string packs in legend_packs/<language>.json, loaded on
+  first use only: importing the add-on reads no pack, and languages no input
+  uses are never read
+- A language_code is resolved to the pack of the full code (e.g. "de-CH.json"),
+  else of its language ("de.json"), else English. Strings missing from a pack
+  are English.
+- Each pack is compiled once per process into tuples of strings in code
+  order (indexed through the shared code -> slot maps) and shared by every
+  input using the same language_code
+
+Pack file format (codes as strings, every section optional):
+    {"unknown": "...", "call_result": {"4001": "..."},
+     "target_type": {"4010": "..."}, "connectivity_type": {"8600": "..."}}
+"""
+
+import json
+import logging
+import os
+import threading
+
+
+# ============================================================================
+# ENGLISH STRINGS (built in)
+# ============================================================================
+
+# Call Result Legend Codes (High-level categories)
+# Source: PowerQuery lines 476-497
+# Maps (CallResult, TargetType) -> LegendCode
+CALL_RESULT_LEGEND_STRINGS = {
+    4001: "Agent Answered",
+    4002: "Overflowed",
+    4003: "Timed Out",
+    4004: "No Agents",
+    4005: "Other",
+    4999: "Not Authorized"
+}
+
+# Target Type Legend Codes (Detailed disposition)
+# Source: PowerQuery lines 499-550
+TARGET_TYPE_LEGEND_STRINGS = {
+    0: "Not Authorized",
+    4005: "Other",
+    4010: "Agent Answered (Call)",
+    4011: "Agent Answered (Callback)",
+    4012: "Abandoned",
+    4013: "Overflowed (Application)",
+    4014: "Overflowed (Voicemail)",
+    4015: "Overflowed (Disconnect)",
+    4016: "Overflowed (External)",
+    4017: "Overflowed (User)",
+    4020: "Timed Out (Application)",
+    4021: "Timed Out (Voicemail)",
+    4022: "Timed Out (Disconnect)",
+    4023: "Timed Out (External)",
+    4024: "Timed Out (User)",
+    4025: "Timed Out (Callback)",
+    4030: "No Agents (Application)",
+    4031: "No Agents (Voicemail)",
+    4032: "No Agents (Disconnect)",
+    4033: "No Agents (External)",
+    4034: "No Agents (User)"
+}
+
+# Connectivity Type Strings (English)
+CONNECTIVITY_TYPE_STRINGS = {
+    8600: "Calling Plan",
+    8601: "Direct Routing",
+    8602: "Operator Connect",
+    8610: "ACS Call",
+    8620: "Unknown"
+}
+
+# String of codes without a legend entry
+UNKNOWN_STRING = "Unknown"
+
+# Language of the built-in strings
+DEFAULT_LANGUAGE = "en"
+
+# Directory of the <language>.json string packs
+LEGEND_PACKS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "legend_packs")
+
+# (pack section, English strings) of every string table, in LegendPack order
+_SECTIONS = (
+    ("call_result", CALL_RESULT_LEGEND_STRINGS),
+    ("target_type", TARGET_TYPE_LEGEND_STRINGS),
+    ("connectivity_type", CONNECTIVITY_TYPE_STRINGS),
+)
+
+# Code -> tuple position, shared by the packs of all languages
+CALL_RESULT_SLOTS, TARGET_TYPE_SLOTS, CONNECTIVITY_TYPE_SLOTS = (
+    {code: slot for slot, code in enumerate(sorted(strings))} for _, strings in _SECTIONS
+)
+
+
+class LegendPack:
+    """
+    Legend strings of one language, compiled into code-indexed tuples.
+
+    Use get_legend_pack() rather than creating instances directly.
+
+    Attributes:
+        language (str): Language of the pack file ("en" for the built-in strings)
+    """
+
+    __slots__ = ("language", "_call_result", "_target_type", "_connectivity_type", "_unknown")
+
+    def __init__(self, language, call_result, target_type, connectivity_type, unknown):
+        self.language = language
+        self._call_result = call_result
+        self._target_type = target_type
+        self._connectivity_type = connectivity_type
+        self._unknown = unknown
+
+    def call_result_string(self, code):
+        """String of a call result legend code (4001-4005, 4999)."""
+        slot = CALL_RESULT_SLOTS.get(code)
+        return self._unknown if slot is None else self._call_result[slot]
+
+    def target_type_string(self, code):
+        """String of a target type legend code (0, 4005, 4010-4034)."""
+        slot = TARGET_TYPE_SLOTS.get(code)
+        return self._unknown if slot is None else self._target_type[slot]
+
+    def connectivity_type_string(self, code):
+        """String of a connectivity type code (8600-8620)."""
+        slot = CONNECTIVITY_TYPE_SLOTS.get(code)
+        return self._unknown if slot is None else self._connectivity_type[slot]
+
+
+def _compile_pack(language, strings):
+    """
+    Compile the sections of a pack file into a LegendPack.
+
+    Args:
+        language (str): Language of the pack
+        strings (dict): Pack file content (empty for English)
+
+    Returns:
+        LegendPack: Pack with English strings for missing entries
+    """
+    tables = []
+    for section, english in _SECTIONS:
+        localized = {}
+        for code, string in (strings.get(section) or {}).items():
+            localized[int(code)] = str(string)
+        tables.append(tuple(localized.get(code, english[code]) for code in sorted(english)))
+    return LegendPack(language, *tables, str(strings.get("unknown", UNKNOWN_STRING)))
+
+
+# language_code setting -> LegendPack (English for languages without a pack)
+_PACKS = {}
+# Pack file language ("en" for the built-in strings) -> LegendPack
+_LOADED_PACKS = {}
+_PACKS_LOCK = threading.Lock()
+
+
+def _pack_candidates(language_code):
+    """Pack languages to try for a language_code setting, most specific first."""
+    code = str(language_code or "").strip().replace("_", "-")
+    candidates = []
+    if code:
+        candidates.append(code)
+        language = code.split("-")[0].lower()
+        if language != code:
+            candidates.append(language)
+    return candidates
+
+
+def _load_pack(language_code, logger):
+    # Called with the lock held
+    for language in _pack_candidates(language_code):
+        if language.lower() == DEFAULT_LANGUAGE:
+            break
+        # Settings resolving to the same file (de-DE, de-AT -> de) share its pack
+        pack = _LOADED_PACKS.get(language)
+        if pack is not None:
+            return pack
+        path = os.path.join(LEGEND_PACKS_DIR, f"{language}.json")
+        if not os.path.isfile(path):
+            continue
+        try:
+            with open(path, encoding="utf-8") as pack_file:
+                pack = _compile_pack(language, json.load(pack_file))
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.error(f"Failed to load legend strings '{path}', using English: {str(e)}")
+            break
+        _LOADED_PACKS[language] = pack
+        return pack
+    else:
+        logger.warning(f"No legend strings for language '{language_code}', using English")
+
+    english = _LOADED_PACKS.get(DEFAULT_LANGUAGE)
+    if english is None:
+        english = _LOADED_PACKS[DEFAULT_LANGUAGE] = _compile_pack(DEFAULT_LANGUAGE, {})
+    return english
+
+
+def get_legend_pack(language_code, logger=None):
+    """
+    Return the legend strings of a language, loading its pack on first use.
+
+    Args:
+        language_code (str): Input language_code setting (e.g. "de-DE")
+        logger (logging.Logger, optional): Logger instance
+
+    Returns:
+        LegendPack: Cached process-wide
+    """
+    language_code = str(language_code or "")
+    pack = _PACKS.get(language_code)
+    if pack is not None:
+        return pack
+
+    if logger is None:
+        logger = logging.getLogger(__name__)
+    with _PACKS_LOCK:
+        pack = _PACKS.get(language_code)
+        if pack is None:
+            pack = _PACKS[language_code] = _load_pack(language_code, logger)
+    return pack
@@ -0,0 +1,221 @@
+"""
+Hourly Call Queue Rollups
+
+Queue dashboards aggregate the per-call msteams:vaac:callqueue events by
+CallQueue[Date] (local hour) and CallQueue[CQRAName]. HourlyQueueRollup
+computes those aggregates while the records are enriched and writes one
+summary event per (hour, queue) and run (sourcetype
+msteams:vaac:callqueue:summary), so dashboards read a few hundred summary
+events instead of every call.
+
+Per (hour, queue):
+- calls: enriched call records
+- calls_by_legend_code: calls per CQCallResultLegendCode
+- abandoned: sum of CQCallCountAbandoned
+- duration_seconds_sum / duration_count: sum and number of numeric
+  rawCallQueueDurationSeconds values, avg_duration_seconds their quotient
+- duration_seconds_min / duration_seconds_max: shortest and longest duration
+
+All values are counts, sums and extremes, so the summary events written for
+the same hour by different runs (a run window ending within an hour) merge;
+compute averages from the sums, not by averaging avg_duration_seconds. The
+same aggregates are merged into per-day statistics by daily_queue_stats.
+"""
+
+from collections import deque
+
+
+# Sourcetype of the hourly per-queue summary events
+ROLLUP_SOURCETYPE = "msteams:vaac:callqueue:summary"
+
+# Aggregate list positions
+_CALLS, _ABANDONED, _DURATION_SUM, _DURATION_COUNT, _DURATION_MIN, _DURATION_MAX, _BY_LEGEND = range(7)
+
+
+def new_aggregate():
+    """Return an empty aggregate (see aggregate_fields for its values)."""
+    return [0, 0, 0.0, 0, None, None, {}]
+
+
+def merge_aggregate(into, other):
+    """
+    Merge aggregate `other` into aggregate `into`.
+
+    Args:
+        into (list): Aggregate updated in place
+        other (list): Aggregate to add
+    """
+    into[_CALLS] += other[_CALLS]
+    into[_ABANDONED] += other[_ABANDONED]
+    into[_DURATION_SUM] += other[_DURATION_SUM]
+    into[_DURATION_COUNT] += other[_DURATION_COUNT]
+    if other[_DURATION_MIN] is not None and (into[_DURATION_MIN] is None or other[_DURATION_MIN] < into[_DURATION_MIN]):
+        into[_DURATION_MIN] = other[_DURATION_MIN]
+    if other[_DURATION_MAX] is not None and (into[_DURATION_MAX] is None or other[_DURATION_MAX] > into[_DURATION_MAX]):
+        into[_DURATION_MAX] = other[_DURATION_MAX]
+    by_legend = into[_BY_LEGEND]
+    for code, calls in other[_BY_LEGEND].items():
+        by_legend[code] = by_legend.get(code, 0) + calls
+
+
+def aggregate_fields(aggregate):
+    """
+    Convert an aggregate to event (and KV Store) fields.
+
+    Args:
+        aggregate (list): Aggregate
+
+    Returns:
+        dict: calls, calls_by_legend_code, abandoned, duration_seconds_sum,
+            duration_count, avg_duration_seconds, duration_seconds_min, duration_seconds_max
+    """
+    calls, abandoned, duration_sum, duration_count, duration_min, duration_max, by_legend = aggregate
+    return {
+        'calls': calls,
+        'calls_by_legend_code': {str(code): by_legend[code] for code in sorted(by_legend, key=str)},
+        'abandoned': abandoned,
+        'duration_seconds_sum': round(duration_sum, 3),
+        'duration_count': duration_count,
+        'avg_duration_seconds': round(duration_sum / duration_count, 3) if duration_count else 0.0,
+        'duration_seconds_min': duration_min,
+        'duration_seconds_max': duration_max,
+    }
+
+
+def aggregate_from_fields(fields):
+    """
+    Rebuild an aggregate from the fields written by aggregate_fields.
+
+    Args:
+        fields (dict): Aggregate fields
+
+    Returns:
+        list: Aggregate
+    """
+    by_legend = {}
+    for code, calls in (fields.get('calls_by_legend_code') or {}).items():
+        # JSON object keys are strings, legend codes are integers
+        try:
+            code = int(code)
+        except ValueError:
+            pass
+        by_legend[code] = by_legend.get(code, 0) + int(calls)
+    return [
+        int(fields.get('calls', 0)),
+        int(fields.get('abandoned', 0)),
+        float(fields.get('duration_seconds_sum', 0.0)),
+        int(fields.get('duration_count', 0)),
+        fields.get('duration_seconds_min'),
+        fields.get('duration_seconds_max'),
+        by_legend,
+    ]
+
+
+class HourlyQueueRollup:
+    """
+    Hourly per-queue aggregates of the enriched Call Queue records of a run.
+
+    record() queues the values of records as they are enriched (in output
+    order) and commit() adds them to the aggregates once their events are
+    written, so the summary events of a failed run only cover the calls it
+    wrote. Not thread-safe: use one rollup per pipeline.
+
+    Attributes:
+        undated (int): Committed records without CallQueue[Date] (no parsable
+            start time), not part of any rollup
+    """
+
+    def __init__(self):
+        self._pending = deque()
+        # (Date, CQRAName) -> aggregate, committed since the last take_delta()
+        self._delta = {}
+        # (Date, CQRAName) -> aggregate of the earlier deltas
+        self._buckets = {}
+        self.undated = 0
+
+    def record(self, records):
+        """
+        Queue the rollup values of enriched records.
+
+        Args:
+            records (list): Enriched records with CallQueue[field] structure
+        """
+        self._pending.extend([(
+            record['CallQueue[Date]'],
+            record['CallQueue[CQRAName]'],
+            record['CallQueue[CQCallResultLegendCode]'],
+            record['CallQueue[CQCallCountAbandoned]'],
+            record['CallQueue[rawCallQueueDurationSeconds]'],
+        ) for record in records])
+
+    def commit(self, count=None):
+        """
+        Add the oldest `count` queued records (default: all) to the aggregates.
+
+        Args:
+            count (int, optional): Number of records written since the last commit
+        """
+        pending = self._pending
+        if count is None:
+            count = len(pending)
+        delta = self._delta
+        for _ in range(min(count, len(pending))):
+            date, ra_name, legend_code, abandoned, duration = pending.popleft()
+            if not date:
+                self.undated += 1
+                continue
+            bucket = delta.get((date, ra_name))
+            if bucket is None:
+                bucket = delta[(date, ra_name)] = new_aggregate()
+            bucket[_CALLS] += 1
+            bucket[_ABANDONED] += abandoned
+            by_legend = bucket[_BY_LEGEND]
+            by_legend[legend_code] = by_legend.get(legend_code, 0) + 1
+            if not isinstance(duration, (int, float)):
+                try:
+                    duration = float(duration)
+                except (TypeError, ValueError):
+                    continue
+            bucket[_DURATION_SUM] += duration
+            bucket[_DURATION_COUNT] += 1
+            if bucket[_DURATION_MIN] is None or duration < bucket[_DURATION_MIN]:
+                bucket[_DURATION_MIN] = duration
+            if bucket[_DURATION_MAX] is None or duration > bucket[_DURATION_MAX]:
+                bucket[_DURATION_MAX] = duration
+
+    def take_delta(self):
+        """
+        Return the aggregates committed since the last call (e.g. for DailyQueueStats.merge).
+
+        Returns:
+            dict: (CallQueue[Date], CallQueue[CQRAName]) -> aggregate
+        """
+        delta, self._delta = self._delta, {}
+        buckets = self._buckets
+        for key, aggregate in delta.items():
+            bucket = buckets.get(key)
+            if bucket is None:
+                bucket = buckets[key] = new_aggregate()
+            merge_aggregate(bucket, aggregate)
+        return delta
+
+    def events(self, **fields):
+        """
+        Build the summary events of the committed records, ordered by hour and queue.
+
+        Aggregates not taken by take_delta() yet are included (and taken).
+
+        Args:
+            **fields: Extra fields of every event (e.g. input)
+
+        Returns:
+            list: One event per (CallQueue[Date], CallQueue[CQRAName])
+        """
+        self.take_delta()
+        events = []
+        for (date, ra_name), aggregate in sorted(self._buckets.items()):
+            event = {'CallQueue[Date]': date, 'CallQueue[CQRAName]': ra_name}
+            event.update(fields)
+            event.update(aggregate_fields(aggregate))
+            events.append(event)
+        return events
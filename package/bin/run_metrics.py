@@ -0,0 +1,197 @@
+"""
+Per-Run Stage Metrics
+
+Times where an input run spends its time and counts what went through it, so
+a slow run can be traced to a stage. The totals are written as one
+run-summary event per input run (sourcetype msteams:vaac:perf).
+
+Stages:
+- oauth: access token lookup and requests
+- rate_limit: waiting for the backfill request rate limit
+- vaac_request: VAAC API calls until the response headers arrive (API latency)
+- vaac_download: reading streamed response bodies from the network (without
+  Stream API Response the body is read within vaac_request)
+- decode: parsing response bodies into ordered arrays
+- fetch_wait: getting rows out of the window fetches, outside the stages
+  above (waiting for concurrently fetched windows, truncation checks,
+  duplicate suppression)
+- transform: ordered arrays to dictionaries
+- enrichment: enrichment engines
+- serialization: enriched records to JSON
+- event_writer: writing event batches to Splunk
+- checkpoint: KV Store reads and writes (checkpoints, backfill days,
+  duplicate index)
+
+The pipeline is lazy, each stage pulls rows from the one before it. Stage
+times are exclusive: time spent in a nested stage (e.g. the body download
+while a streamed response is decoded) only counts for the nested stage.
+Stages running in window fetch, backfill day and enrichment threads are
+summed over the threads, so the total can exceed the run's duration.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Sourcetype of the run-summary events
+PERF_SOURCETYPE = "msteams:vaac:perf"
+
+STAGES = (
+    "oauth", "rate_limit", "vaac_request", "vaac_download", "decode", "fetch_wait",
+    "transform", "enrichment", "serialization", "event_writer", "checkpoint",
+)
+
+COUNTERS = (
+    "vaac_requests", "vaac_bytes", "rows", "windows", "events", "event_bytes",
+    "timestamp_parse_failures", "enrichment_failures",
+)
+
+
+class RunMetrics:
+    """
+    Thread-safe stage timers and counters of one input run.
+
+    Stage times are accumulated per thread without locking (the timers run
+    once per row) and added up by seconds() and summary().
+
+    Attributes:
+        counts (dict): Counter values
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._thread_seconds = []
+        self._started = time.perf_counter()
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    def _state(self):
+        # Per thread: (open stages as [stage, start, seconds spent in nested stages], seconds per stage)
+        state = getattr(self._local, "state", None)
+        if state is None:
+            state = self._local.state = ([], dict.fromkeys(STAGES, 0.0))
+            with self._lock:
+                self._thread_seconds.append(state[1])
+        return state
+
+    @contextmanager
+    def stage(self, name):
+        """Time the enclosed block as stage `name`."""
+        stack, seconds = self._state()
+        entry = [name, time.perf_counter(), 0.0]
+        stack.append(entry)
+        try:
+            yield
+        finally:
+            stack.pop()
+            elapsed = time.perf_counter() - entry[1]
+            if stack:
+                stack[-1][2] += elapsed
+            seconds[name] = seconds.get(name, 0.0) + elapsed - entry[2]
+
+    def timed(self, iterable, name):
+        """
+        Iterate over a (lazy) iterable, timing the production of each item as stage `name`.
+
+        Args:
+            iterable (iterable): Items of the stage
+            name (str): Stage name
+
+        Yields:
+            The items of iterable
+        """
+        iterator = iter(iterable)
+        clock = time.perf_counter
+        while True:
+            # Looked up per item: lazy iterables may be consumed by another thread than created them
+            stack, seconds = self._state()
+            entry = [name, clock(), 0.0]
+            stack.append(entry)
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                stack.pop()
+                elapsed = clock() - entry[1]
+                if stack:
+                    stack[-1][2] += elapsed
+                seconds[name] = seconds.get(name, 0.0) + elapsed - entry[2]
+            yield item
+
+    def seconds(self):
+        """Return the exclusive seconds per stage, summed over the threads."""
+        with self._lock:
+            thread_seconds = list(self._thread_seconds)
+        totals = dict.fromkeys(STAGES, 0.0)
+        for per_thread in thread_seconds:
+            for name, value in list(per_thread.items()):
+                totals[name] = totals.get(name, 0.0) + value
+        return totals
+
+    def count(self, name, value=1):
+        """Increase counter `name`."""
+        if value:
+            with self._lock:
+                self.counts[name] = self.counts.get(name, 0) + value
+
+    def merge_counts(self, counts):
+        """Add counters collected elsewhere (e.g. in an enrichment worker process)."""
+        with self._lock:
+            for name, value in counts.items():
+                self.counts[name] = self.counts.get(name, 0) + value
+
+    def summary(self, **fields):
+        """
+        Build the run-summary event.
+
+        Args:
+            **fields: Extra fields (input, report type, status, ...)
+
+        Returns:
+            dict: Event with duration_seconds, stage_seconds, counts and rates
+        """
+        duration = time.perf_counter() - self._started
+        seconds = {name: round(value, 4) for name, value in self.seconds().items()}
+        with self._lock:
+            counts = dict(self.counts)
+        event = dict(fields)
+        event["duration_seconds"] = round(duration, 3)
+        event["stage_seconds"] = seconds
+        event["counts"] = counts
+        event["events_per_second"] = round(counts["events"] / duration, 1) if duration > 0 else 0.0
+        event["vaac_mb_per_second"] = (
+            round(counts["vaac_bytes"] / 2**20 / seconds["vaac_download"], 2) if seconds["vaac_download"] > 0 else 0.0
+        )
+        return event
+
+
+class TimedCheckpointer:
+    """
+    KVStoreCheckpointer wrapper timing every call as the checkpoint stage.
+
+    Args:
+        checkpointer: KVStoreCheckpointer to wrap
+        metrics (RunMetrics): Metrics of the run
+    """
+
+    def __init__(self, checkpointer, metrics):
+        self._checkpointer = checkpointer
+        self._metrics = metrics
+
+    def get(self, key):
+        with self._metrics.stage("checkpoint"):
+            return self._checkpointer.get(key)
+
+    def update(self, key, state):
+        with self._metrics.stage("checkpoint"):
+            return self._checkpointer.update(key, state)
+
+    def batch_update(self, states):
+        with self._metrics.stage("checkpoint"):
+            return self._checkpointer.batch_update(states)
+
+    def delete(self, key):
+        with self._metrics.stage("checkpoint"):
+            return self._checkpointer.delete(key)
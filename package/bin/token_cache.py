@@ -0,0 +1,186 @@
+"""
+OAuth Access Token Cache
+
+Keeps Microsoft Entra ID access tokens between VAAC API calls so that runs of
+inputs sharing an account, and consecutive runs of the same input, skip the
+password-grant round trip while the previous token is still valid.
+
+Tokens are cached per (tenant_id, email, scope):
+- in memory, shared by all inputs of the modular input process
+- in Splunk's encrypted credential store (storage/passwords) when a session
+  key is available, shared across modular input invocations
+
+A cached token is used until `refresh_margin` seconds before it expires, after
+which it is treated as missing and a new token is requested.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from solnlib import credentials
+
+
+# Refresh tokens this many seconds before they expire
+DEFAULT_REFRESH_MARGIN_SECONDS = 300
+
+# Lifetime assumed when the token response has no expires_in
+DEFAULT_TOKEN_LIFETIME_SECONDS = 3599
+
+
+def token_cache_key(tenant_id, email, scope):
+    """
+    Build the cache key of a token.
+
+    The key is a hash so that the account email never appears in the
+    credential store stanza name.
+
+    Args:
+        tenant_id (str): Entra ID tenant ID
+        email (str): Account user name
+        scope (str): OAuth scope
+
+    Returns:
+        str: Cache key
+    """
+    identity = "\n".join([str(tenant_id).lower(), str(email).lower(), str(scope)])
+    return "token_" + hashlib.sha256(identity.encode("utf-8")).hexdigest()
+
+
+class TokenCache:
+    """
+    In-memory access token cache backed by Splunk's credential store.
+
+    Args:
+        session_key (str, optional): Splunk session key. Without it tokens are
+            only cached in memory.
+        app (str, optional): App owning the credential store entries
+        realm (str, optional): Credential store realm for the cached tokens
+        refresh_margin (int): Seconds before expiry at which a token is refreshed
+        logger (logging.Logger, optional): Logger instance
+    """
+
+    def __init__(self, session_key=None, app=None, realm=None,
+                 refresh_margin=DEFAULT_REFRESH_MARGIN_SECONDS, logger=None):
+        self.refresh_margin = refresh_margin
+        self.logger = logger or logging.getLogger(__name__)
+        self._tokens = {}
+        self._lock = threading.Lock()
+        self._refresh_locks = {}
+        self._store = None
+        if session_key and app:
+            self._store = credentials.CredentialManager(session_key, app, realm=realm)
+
+    def refresh_lock(self, tenant_id, email, scope):
+        """
+        Lock held while checking and refreshing one token, so that concurrently
+        running inputs of the same account authenticate only once.
+
+        Returns:
+            threading.Lock: Lock of the (tenant_id, email, scope) token
+        """
+        key = token_cache_key(tenant_id, email, scope)
+        with self._lock:
+            return self._refresh_locks.setdefault(key, threading.Lock())
+
+    def get(self, tenant_id, email, scope):
+        """
+        Return a cached access token that is not about to expire.
+
+        Args:
+            tenant_id (str): Entra ID tenant ID
+            email (str): Account user name
+            scope (str): OAuth scope
+
+        Returns:
+            str or None: Access token, None if missing or due for refresh
+        """
+        key = token_cache_key(tenant_id, email, scope)
+        with self._lock:
+            entry = self._tokens.get(key)
+            if entry is None or self._is_due(entry):
+                # Another input process may have refreshed the token already
+                stored = self._load(key)
+                if stored is not None and (entry is None or stored["expires_at"] > entry["expires_at"]):
+                    entry = self._tokens[key] = stored
+
+        if entry is None:
+            return None
+
+        remaining = entry["expires_at"] - time.time()
+        if remaining <= self.refresh_margin:
+            self.logger.debug(f"Cached OAuth token expires in {int(remaining)}s, refreshing")
+            return None
+
+        self.logger.debug(f"Using cached OAuth token (expires in {int(remaining)}s)")
+        return entry["access_token"]
+
+    def put(self, tenant_id, email, scope, access_token, expires_in=None):
+        """
+        Cache an access token.
+
+        Args:
+            tenant_id (str): Entra ID tenant ID
+            email (str): Account user name
+            scope (str): OAuth scope
+            access_token (str): Access token
+            expires_in (int, optional): Token lifetime in seconds from the token response
+        """
+        try:
+            lifetime = int(expires_in)
+        except (TypeError, ValueError):
+            lifetime = DEFAULT_TOKEN_LIFETIME_SECONDS
+
+        key = token_cache_key(tenant_id, email, scope)
+        entry = {"access_token": access_token, "expires_at": time.time() + lifetime}
+        with self._lock:
+            self._tokens[key] = entry
+            self._save(key, entry)
+
+    def invalidate(self, tenant_id, email, scope):
+        """
+        Drop a cached token (e.g. after the API rejected it).
+
+        Args:
+            tenant_id (str): Entra ID tenant ID
+            email (str): Account user name
+            scope (str): OAuth scope
+        """
+        key = token_cache_key(tenant_id, email, scope)
+        with self._lock:
+            self._tokens.pop(key, None)
+            if self._store is None:
+                return
+            try:
+                self._store.delete_password(key)
+            except credentials.CredentialNotExistException:
+                pass
+            except Exception as e:
+                self.logger.warning(f"Failed to remove cached OAuth token from credential store: {str(e)}")
+
+    def _is_due(self, entry):
+        return entry["expires_at"] - time.time() <= self.refresh_margin
+
+    def _load(self, key):
+        if self._store is None:
+            return None
+        try:
+            entry = json.loads(self._store.get_password(key))
+            return {"access_token": str(entry["access_token"]), "expires_at": float(entry["expires_at"])}
+        except credentials.CredentialNotExistException:
+            return None
+        except Exception as e:
+            # Unreadable entries are treated as missing, the next put() replaces them
+            self.logger.warning(f"Failed to read cached OAuth token from credential store: {str(e)}")
+            return None
+
+    def _save(self, key, entry):
+        if self._store is None:
+            return
+        try:
+            self._store.set_password(key, json.dumps(entry))
+        except Exception as e:
+            # Not critical: the token is still cached in memory for this process
+            self.logger.warning(f"Failed to persist OAuth token to credential store: {str(e)}")
@@ -0,0 +1,296 @@
+"""
+Microsoft Teams VAAC Streaming Response Parser
+
+This module parses the body of a VAAC getanalytics response incrementally and
+yields the `dataResult` ordered arrays one by one while the body downloads.
+
+Only one row (plus the undecoded tail of the current network chunk) is held in
+memory at a time, so peak memory does not grow with LimitResultRowsCount.
+
+Response shape:
+    {"dataResult": [[...row 1...], [...row 2...], ...], "<other key>": ...}
+
+Other top-level keys are decoded and kept in DataResultStream.metadata.
+
+transform_ordered_arrays_to_dicts / iter_ordered_arrays_as_dicts map the
+ordered arrays to read-only RowView mappings keyed by dimension and
+measurement names. A view wraps the row list as-is and shares one
+field-name-to-position table with the other rows of the query, so no
+dictionary is built per row.
+"""
+
+import codecs
+import json
+import re
+from collections.abc import Mapping
+
+
+# Default size of the network chunks read from the response body
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_DECODER = json.JSONDecoder()
+
+
+class _TextBuffer:
+    """
+    Sliding window over a UTF-8 byte chunk iterator.
+
+    Consumed text is dropped whenever a new chunk is appended, so the buffer
+    never holds more than the current partial value plus one chunk.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self.text = ''
+        self.pos = 0
+        self.eof = False
+        self.bytes_read = 0
+
+    def fill(self):
+        """
+        Append the next chunk of the body to the buffer.
+
+        Returns:
+            bool: False once the body is exhausted
+        """
+        if self.eof:
+            return False
+
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self.bytes_read += len(chunk)
+            self.text = self.text[self.pos:] + self._decoder.decode(chunk)
+            self.pos = 0
+            return True
+
+        self.text = self.text[self.pos:] + self._decoder.decode(b'', final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self):
+        """
+        Skip whitespace and return the next character ('' at end of body).
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def expect(self, allowed):
+        """
+        Consume the next non-whitespace character, which must be one of allowed.
+
+        Raises:
+            ValueError: If the body does not match the expected structure
+        """
+        char = self.peek()
+        if not char or char not in allowed:
+            found = repr(char) if char else "end of response"
+            raise ValueError(f"Malformed VAAC response: expected one of {allowed!r}, found {found} "
+                             f"after {self.bytes_read} bytes")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """
+        Decode the next complete JSON value.
+
+        Raises:
+            ValueError: If the body ends in the middle of a value
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A number at the end of the buffer may continue in the next chunk
+            if end == len(self.text) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+class DataResultStream:
+    """
+    Iterate over the dataResult rows of a VAAC getanalytics response body.
+
+    Args:
+        chunks (iterable): Byte chunks of the response body
+            (e.g. requests Response.iter_content(chunk_size))
+
+    Attributes:
+        has_data_result (bool): True once a dataResult array was found
+        row_count (int): Number of rows yielded so far
+        bytes_read (int): Number of body bytes consumed so far
+        metadata (dict): Other top-level keys of the response
+
+    Example:
+        stream = DataResultStream(response.iter_content(DEFAULT_STREAM_CHUNK_SIZE))
+        for row in stream:
+            ...
+    """
+
+    def __init__(self, chunks):
+        self._buffer = _TextBuffer(chunks)
+        self.has_data_result = False
+        self.row_count = 0
+        self.metadata = {}
+
+    @property
+    def bytes_read(self):
+        return self._buffer.bytes_read
+
+    def __iter__(self):
+        buffer = self._buffer
+        buffer.expect('{')
+        if buffer.peek() == '}':
+            return
+
+        while True:
+            key = buffer.value()
+            buffer.expect(':')
+
+            if key == 'dataResult' and buffer.peek() == '[':
+                self.has_data_result = True
+                buffer.pos += 1
+                if buffer.peek() == ']':
+                    buffer.pos += 1
+                else:
+                    while True:
+                        row = buffer.value()
+                        self.row_count += 1
+                        yield row
+                        if buffer.expect(',]') == ']':
+                            break
+            else:
+                self.metadata[key] = buffer.value()
+
+            if buffer.expect(',}') == '}':
+                break
+
+
+class RowView(Mapping):
+    """
+    Read-only mapping of field names to the values of one VAAC ordered array.
+
+    Positions past the end of a short row read as None, like missing fields of
+    a transformed dictionary. Use dict(view) where a real dictionary is needed
+    (e.g. json.dumps).
+
+    Args:
+        row (list): Ordered array from dataResult (not copied)
+        positions (dict): Field name to position table shared by the rows of a query
+    """
+
+    __slots__ = ("_row", "_positions")
+
+    def __init__(self, row, positions):
+        self._row = row
+        self._positions = positions
+
+    def __getitem__(self, field_name):
+        position = self._positions[field_name]
+        try:
+            return self._row[position]
+        except IndexError:
+            return None
+
+    def get(self, field_name, default=None):
+        position = self._positions.get(field_name)
+        if position is None:
+            return default
+        try:
+            return self._row[position]
+        except IndexError:
+            return None
+
+    def __contains__(self, field_name):
+        return field_name in self._positions
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+    def __reduce__(self):
+        # Pickled (e.g. for process pool workers) as a plain dictionary
+        return (dict, (dict(self),))
+
+
+def field_positions(dimensions, measurements):
+    """
+    Build the field name to position table of a query's ordered arrays.
+
+    Args:
+        dimensions (list): List of dimension names (ordered as in API query)
+        measurements (list): List of measurement names (ordered as in API query)
+
+    Returns:
+        dict: Field name to array position (the last position of a repeated name,
+            as when the row was copied into a dictionary field by field)
+    """
+    positions = {}
+    for position, field_name in enumerate(dimensions + measurements):
+        positions[field_name] = position
+    return positions
+
+
+def transform_ordered_arrays_to_dicts(array_data, dimensions, measurements):
+    """
+    Transform VAAC API ordered array responses to mappings keyed by field name.
+
+    The VAAC API returns data as ordered arrays where each element's position
+    corresponds to a field in the combined dimensions + measurements list.
+
+    Args:
+        array_data (list): List of arrays from VAAC dataResult
+        dimensions (list): List of dimension names (ordered as in API query)
+        measurements (list): List of measurement names (ordered as in API query)
+
+    Returns:
+        list: RowView mappings with field names as keys (dict(view) for a dictionary)
+
+    Example:
+        dimensions = ["UserStartTimeUTC", "CallQueueIdentity"]
+        measurements = ["TotalCallCount"]
+        array_data = [["2025-12-15T23:59:41", "CQ@example.com", 1]]
+
+        Returns: [{"UserStartTimeUTC": "2025-12-15T23:59:41",
+                   "CallQueueIdentity": "CQ@example.com",
+                   "TotalCallCount": 1}]
+    """
+    return list(iter_ordered_arrays_as_dicts(array_data, dimensions, measurements))
+
+
+def iter_ordered_arrays_as_dicts(array_data, dimensions, measurements):
+    """
+    Lazily transform VAAC ordered arrays to mappings, one row at a time.
+
+    Same mapping as transform_ordered_arrays_to_dicts, but accepts any iterable
+    of rows (e.g. a DataResultStream) and never holds more than one row.
+
+    Args:
+        array_data (iterable): Arrays from VAAC dataResult
+        dimensions (list): List of dimension names (ordered as in API query)
+        measurements (list): List of measurement names (ordered as in API query)
+
+    Yields:
+        RowView: Row with field names as keys
+    """
+    positions = field_positions(dimensions, measurements)
+
+    for row in array_data:
+        yield RowView(row, positions)
@@ -0,0 +1,417 @@
+"""
+VAAC Query Window Planner
+
+Splits the collection range of an input (checkpoint to now) into sub-windows
+that are fetched as separate VAAC queries, concurrently, and merged back in
+time order.
+
+- plan_windows: cuts [start, end) at UTC day boundaries (so every sub-window
+  has a single `Date` filter day) and at a maximum window size
+- window_filters: VAAC filters selecting exactly one sub-window
+- WindowedRows: fetches sub-windows with a bounded number of concurrent
+  requests (each buffering a bounded number of row batches ahead of the
+  consumer) and yields their rows in window order, stopping at the first
+  failed window so the checkpoint can advance through the last contiguous
+  completed sub-window, and maps written event counts back to the last
+  sub-window whose rows are all written (for incremental checkpoints)
+- iter_untruncated_rows: detects responses cut off at LimitResultRowsCount
+  and bisects the window until every piece fits under the limit
+
+Windows are half-open [start, end) on whole seconds (the resolution of
+UserStartTimeUTC), so consecutive windows neither overlap nor leave gaps.
+"""
+
+import logging
+import queue
+import threading
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+
+# Default maximum length of one sub-window
+DEFAULT_WINDOW_HOURS = 6
+
+# Default number of sub-windows fetched at the same time
+DEFAULT_WINDOW_FETCH_WORKERS = 2
+
+# Rows per batch handed from a window fetch thread to the consumer
+WINDOW_BATCH_ROWS = 1000
+
+# Batches a window fetch thread buffers ahead of the consumer before it waits
+WINDOW_QUEUE_BATCHES = 4
+
+# Seconds between checks for a stopped iteration while a fetch thread waits
+_PUT_POLL_SECONDS = 0.1
+
+# Queue item marking the end of a window's rows
+_WINDOW_END = object()
+
+# Format of UserStartTimeUTC filter values (same as the API returns)
+VAAC_DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+TimeWindow = namedtuple('TimeWindow', ['start', 'end'])
+TimeWindow.__doc__ = """Half-open UTC time range [start, end) of one VAAC query."""
+
+
+def _to_utc_second(value):
+    """Return an aware UTC datetime truncated to whole seconds."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def plan_windows(start, end, max_window_seconds=DEFAULT_WINDOW_HOURS * 3600):
+    """
+    Split [start, end) into sub-windows.
+
+    Every sub-window lies within one UTC day and is at most
+    max_window_seconds long. Naive datetimes are treated as UTC and both
+    bounds are truncated to whole seconds.
+
+    Args:
+        start (datetime): Start of the range (inclusive)
+        end (datetime): End of the range (exclusive)
+        max_window_seconds (int): Maximum sub-window length
+
+    Returns:
+        list: TimeWindow tuples in time order (empty if start >= end)
+    """
+    start = _to_utc_second(start)
+    end = _to_utc_second(end)
+    max_window = timedelta(seconds=max(1, int(max_window_seconds)))
+
+    windows = []
+    window_start = start
+    while window_start < end:
+        next_day = datetime.combine(window_start.date() + timedelta(days=1), datetime.min.time(), timezone.utc)
+        window_end = min(window_start + max_window, next_day, end)
+        windows.append(TimeWindow(window_start, window_end))
+        window_start = window_end
+    return windows
+
+
+def window_filters(window):
+    """
+    Build the VAAC filters selecting the calls that started in a sub-window.
+
+    Args:
+        window (TimeWindow): Sub-window within one UTC day
+
+    Returns:
+        list: Filters for the query's "Filters" key
+    """
+    day = window.start.strftime("%Y-%m-%d")
+    # Inclusive upper bound: last whole second before the window end
+    last_second = window.end - timedelta(seconds=1)
+    return [
+        {
+            "DataModelName": "UserStartTimeUTC",
+            "Value": window.start.strftime(VAAC_DATETIME_FORMAT),
+            "Operand": 4  # Greater than or equal (>=)
+        },
+        {
+            "DataModelName": "UserStartTimeUTC",
+            "Value": last_second.strftime(VAAC_DATETIME_FORMAT),
+            "Operand": 6  # Less than or equal (<=)
+        },
+        {
+            "DataModelName": "Date",
+            "Value": day,
+            "Operand": 4  # Greater than or equal (>=)
+        },
+        {
+            "DataModelName": "Date",
+            "Value": day,
+            "Operand": 6  # Less than or equal (<=)
+        }
+    ]
+
+
+def split_window(window):
+    """
+    Bisect a window at its middle second.
+
+    Args:
+        window (TimeWindow): Window to split
+
+    Returns:
+        tuple: (first half, second half), or None if the window is shorter than 2 seconds
+    """
+    seconds = int((window.end - window.start).total_seconds())
+    if seconds < 2:
+        return None
+    middle = window.start + timedelta(seconds=seconds // 2)
+    return TimeWindow(window.start, middle), TimeWindow(middle, window.end)
+
+
+def row_key(row, width):
+    """
+    Identity of a dataResult row: the hash of its dimension values.
+
+    VAAC groups rows by the requested dimensions, so the dimension values of
+    a row are unique within a query.
+
+    Args:
+        row (list): Ordered array
+        width (int): Number of leading dimension values
+
+    Returns:
+        int: Row key
+    """
+    values = tuple(row[:width])
+    try:
+        return hash(values)
+    except TypeError:
+        return hash(repr(values))
+
+
+class WindowSplitStats:
+    """
+    Thread-safe counters of truncated responses and window bisections.
+
+    Attributes:
+        truncated (int): Responses that returned LimitResultRowsCount rows
+        splits (int): Windows bisected because of truncation
+        unsplittable (int): Truncated windows too short to bisect (possibly incomplete)
+        max_depth (int): Deepest bisection level reached
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.truncated = 0
+        self.splits = 0
+        self.unsplittable = 0
+        self.max_depth = 0
+
+    def record(self, split, depth):
+        with self._lock:
+            self.truncated += 1
+            if split:
+                self.splits += 1
+                self.max_depth = max(self.max_depth, depth + 1)
+            else:
+                self.unsplittable += 1
+
+
+def iter_untruncated_rows(window, fetch, limit, key_width, stats=None, logger=None, _seen=(), _depth=0):
+    """
+    Yield every row of a window, bisecting it while responses are truncated.
+
+    A response with `limit` rows (LimitResultRowsCount) may have been cut
+    off. Its rows are already yielded while they stream, so the window is then
+    split in two and each half is fetched again recursively, skipping rows
+    that an enclosing (truncated) response already yielded. Only the keys of
+    the rows are kept for that, not the rows.
+
+    Args:
+        window (TimeWindow): Window to fetch
+        fetch (callable): Returns an iterable of ordered arrays for one window
+        limit (int): LimitResultRowsCount of the queries
+        key_width (int): Number of dimension values identifying a row (see row_key)
+        stats (WindowSplitStats, optional): Counters to update
+        logger (logging.Logger, optional): Logger instance
+
+    Yields:
+        list: Ordered arrays, each row once
+    """
+    if logger is None:
+        logger = logging.getLogger(__name__)
+
+    count = 0
+    keys = set()
+    for row in fetch(window):
+        count += 1
+        key = row_key(row, key_width)
+        keys.add(key)
+        if any(key in seen for seen in _seen):
+            continue
+        yield row
+
+    if count < limit:
+        return
+
+    halves = split_window(window)
+    if stats is not None:
+        stats.record(halves is not None, _depth)
+    if halves is None:
+        logger.warning(f"Window {window.start.isoformat()} - {window.end.isoformat()} returned {count} rows "
+                       f"(LimitResultRowsCount) and cannot be split further, results may be incomplete")
+        return
+
+    logger.info(f"Window {window.start.isoformat()} - {window.end.isoformat()} returned {count} rows "
+                f"(LimitResultRowsCount), splitting at {halves[1].start.isoformat()}")
+    seen = _seen + (keys,)
+    for half in halves:
+        yield from iter_untruncated_rows(half, fetch, limit, key_width, stats, logger, seen, _depth + 1)
+
+
+class WindowedRows:
+    """
+    Iterate over the rows of several sub-windows in time order.
+
+    With one worker, each window is fetched lazily when the previous one is
+    exhausted (streamed responses stay streamed). With more workers, up to
+    `max_workers` windows are fetched concurrently. Each fetch thread hands
+    its rows to the consumer through a bounded queue of row batches and waits
+    while the queue is full, so the rows fetched ahead are capped at
+    WINDOW_QUEUE_BATCHES x WINDOW_BATCH_ROWS per window whatever the window
+    size, and responses still stream.
+
+    A failed window ends the iteration instead of raising, so every row of
+    the preceding windows still reaches the consumer (and its pending
+    batches are flushed). Check `error` after consuming the rows.
+
+    Rows inside one response are not ordered by UserStartTimeUTC, so progress
+    can only be checkpointed at window ends. written_through() tells which
+    window end is safe once a number of rows went through an order-preserving
+    pipeline (rows it drops only make the answer more conservative).
+
+    Args:
+        windows (list): TimeWindow tuples in time order
+        fetch (callable): Returns an iterable of rows for one window
+        max_workers (int): Number of windows fetched at the same time
+        logger (logging.Logger, optional): Logger instance
+
+    Attributes:
+        completed (int): Number of windows whose rows were all yielded
+        completed_through (datetime or None): End of the last contiguous completed window
+        rows_yielded (int): Number of rows yielded so far
+        error (Exception or None): Error of the first failed window
+        failed_window (TimeWindow or None): First failed window
+    """
+
+    def __init__(self, windows, fetch, max_workers=DEFAULT_WINDOW_FETCH_WORKERS, logger=None):
+        self.windows = list(windows)
+        self._fetch = fetch
+        self.max_workers = max(1, int(max_workers))
+        self.logger = logger or logging.getLogger(__name__)
+        self.completed = 0
+        self.completed_through = None
+        self.error = None
+        self.failed_window = None
+        self.rows_yielded = 0
+        # (rows yielded through the end of a completed window, window end), oldest first
+        self._boundaries = deque()
+        self._written_through = None
+
+    def __iter__(self):
+        if self.max_workers == 1 or len(self.windows) <= 1:
+            yield from self._iter_sequential()
+        else:
+            yield from self._iter_concurrent()
+
+    def written_through(self, written_count):
+        """
+        Return the end of the last completed window whose rows are all written.
+
+        Args:
+            written_count (int): Rows (events) consumed and written so far, in order
+
+        Returns:
+            datetime or None: Window end, None while no window is fully written
+        """
+        while self._boundaries and self._boundaries[0][0] <= written_count:
+            self._written_through = self._boundaries.popleft()[1]
+        return self._written_through
+
+    def _complete(self, window, row_count):
+        self.completed += 1
+        self.completed_through = window.end
+        self._boundaries.append((self.rows_yielded, window.end))
+        self.logger.debug(f"Window {window.start.isoformat()} - {window.end.isoformat()}: {row_count} rows")
+
+    def _fail(self, window, error):
+        self.error = error
+        self.failed_window = window
+        self.logger.error(f"Failed to fetch window {window.start.isoformat()} - {window.end.isoformat()}: "
+                          f"{str(error)}. Stopping after {self.completed} of {len(self.windows)} windows")
+
+    def _iter_sequential(self):
+        for window in self.windows:
+            row_count = 0
+            try:
+                for row in self._fetch(window):
+                    row_count += 1
+                    self.rows_yielded += 1
+                    yield row
+            except Exception as e:
+                self._fail(window, e)
+                return
+            self._complete(window, row_count)
+
+    def _fetch_into(self, window, rows_queue, stopped):
+        """
+        Fetch thread: put the rows of a window into rows_queue in batches.
+
+        Ends with _WINDOW_END, or with the exception of a failed fetch. Gives up
+        (closing the response) once the iteration is stopped.
+        """
+        def put(item):
+            while not stopped.is_set():
+                try:
+                    rows_queue.put(item, timeout=_PUT_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        rows = ()
+        try:
+            rows = self._fetch(window)
+            batch = []
+            for row in rows:
+                batch.append(row)
+                if len(batch) == WINDOW_BATCH_ROWS:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_WINDOW_END)
+        except Exception as e:
+            put(e)
+        finally:
+            close = getattr(rows, "close", None)
+            if close is not None:
+                close()
+
+    def _iter_concurrent(self):
+        windows = iter(self.windows)
+        pending = deque()
+        stopped = threading.Event()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="vaac_window")
+        try:
+            while True:
+                # Fetch ahead without fetching more than max_workers windows
+                while len(pending) < self.max_workers:
+                    window = next(windows, None)
+                    if window is None:
+                        break
+                    rows_queue = queue.Queue(maxsize=WINDOW_QUEUE_BATCHES)
+                    future = executor.submit(self._fetch_into, window, rows_queue, stopped)
+                    pending.append((window, rows_queue, future))
+                if not pending:
+                    return
+
+                window, rows_queue, _ = pending.popleft()
+                row_count = 0
+                while True:
+                    batch = rows_queue.get()
+                    if batch is _WINDOW_END:
+                        break
+                    if isinstance(batch, Exception):
+                        self._fail(window, batch)
+                        return
+                    for row in batch:
+                        row_count += 1
+                        self.rows_yielded += 1
+                        yield row
+                self._complete(window, row_count)
+        finally:
+            # Windows after a failure are discarded and fetched again next run
+            stopped.set()
+            for _, _, future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)